@@ -1,7 +1,9 @@
 import streamlit as st
 from utils.metrics import format_korean_count
+from utils.profiler import profiled
 
-def render_channel_card(channel_id: str, meta: dict, stats: dict):
+@profiled()
+def render_channel_card(channel_id: str, meta: dict, stats: dict, as_of=None):
     """
     채널 카드 UI 컴포넌트
 
@@ -16,6 +18,8 @@ def render_channel_card(channel_id: str, meta: dict, stats: dict):
         subs_diff: 구독자 증가량 (int)
         avg_views: 평균 조회수 (int)
         short_ratio: Shorts 비율 (0~1)
+    as_of : Timestamp
+        기준 시점 (있으면 상세 페이지 링크에도 전달)
     """
     # 6열 레이아웃: 썸네일, 채널명, 카테고리, 구독자 수, 구독자 증가량, 평균 조회수 & Shorts 비율
     cols = st.columns([2, 4, 2, 2, 2, 3])
@@ -32,6 +36,8 @@ def render_channel_card(channel_id: str, meta: dict, stats: dict):
     with cols[1]:
         channel_name = meta.get("channel_title", "Unknown Channel")
         channel_url = f"/ChannelDetail?channel_id={channel_id}"
+        if as_of is not None:
+            channel_url += f"&as_of={as_of:%Y-%m-%dT%H:%M:%S}"
         st.markdown(f"### [{channel_name}]({channel_url})")
 
     # 3열: 카테고리 (badge 스타일)
@@ -1,11 +1,22 @@
-import base64
-import requests
+import streamlit as st
 import streamlit.components.v1 as components
+from utils.profiler import profiled
 
+@st.cache_data(show_spinner=False)
 def img_url_to_base64(url):
-    response = requests.get(url)
+    # rerun마다 이미지를 다시 받지 않도록 캐싱, 받지 못하면 None
+    # (requests는 이미지를 실제로 받을 때만 import)
+    import base64
+    import requests
+
+    try:
+        response = requests.get(url, timeout=5)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
     return base64.b64encode(response.content).decode()
 
+@profiled()
 def render_name_card(channel_meta: dict, channel_id: str, ch_df):
     """
     유튜브 채널 프로필과 채널 정보를 렌더링하는 Streamlit HTML 컴포넌트.
@@ -16,11 +27,12 @@ def render_name_card(channel_meta: dict, channel_id: str, ch_df):
     # 1) 프로필 이미지 URL → base64
     profile_url = channel_meta[channel_id]["profile_image"]
     img_base64 = img_url_to_base64(profile_url)
+    img_src = f"data:image/jpeg;base64,{img_base64}" if img_base64 else profile_url
 
     # 2) HTML 템플릿
     html = f"""
     <div class="yt-profile">
-        <img class="channel-img" src="data:image/jpeg;base64,{img_base64}" alt="채널 이미지">
+        <img class="channel-img" src="{img_src}" alt="채널 이미지">
         <div class="channel-info">
             <div class=Name-tag>
                 <h2 class="channel-name">{channel_meta[channel_id]["channel_title"]}</h2>
@@ -1,8 +1,7 @@
 # components/charts.py
+# matplotlib/plotly는 import 비용이 커서 실제로 차트를 그리는 함수 안에서만 불러옴
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
 
 def draw_pie_chart(
     df: pd.DataFrame,
@@ -41,6 +40,8 @@ def draw_pie_chart(
         return
 
     # 4) 차트 그리기
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(4, 4))
     ax.pie(values, labels=labels, autopct='%1.1f%%')
     ax.set_title(title)
@@ -72,6 +73,8 @@ def render_avg_views_table(df_metrics):  # 일차별 평균조회수 테이블
     st.dataframe(df_metrics)
 
 def render_avg_views_line_chart(df_metrics, title: str = ""):
+    import plotly.express as px
+
     # 전체 30일치 데이터
     fig = px.line(
         df_metrics,
@@ -102,4 +105,66 @@ def render_avg_views_line_chart(df_metrics, title: str = ""):
         margin=dict(l=40, r=20, t=20, b=40)
     )
 
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_upload_timing_heatmap(values: pd.DataFrame, counts: pd.DataFrame, value_label: str = "조회수"):
+    """
+    요일 × 공개 시각 히트맵 (upload_timing_grid 결과를 그대로 받음, 스냅샷은 읽지 않음)
+    values : index=0..6(월~일), columns=0..23(시), 영상이 없는 칸은 NaN
+    counts : 같은 모양의 칸별 영상 수 (hover에 표시)
+    """
+    import plotly.graph_objects as go
+    from utils.upload_timing import WEEKDAY_LABELS
+
+    if counts.to_numpy().sum() == 0:
+        st.info("표시할 영상이 없습니다.")
+        return
+
+    fig = go.Figure(go.Heatmap(
+        z=values.to_numpy(),
+        x=[f"{h}시" for h in values.columns],
+        y=[WEEKDAY_LABELS[d] for d in values.index],
+        customdata=counts.to_numpy(),
+        colorscale="Greens",
+        hoverongaps=False,
+        hovertemplate="%{y}요일 %{x}<br>" + value_label + ": %{z:,.0f}<br>영상 수: %{customdata}<extra></extra>",
+    ))
+    fig.update_layout(
+        yaxis=dict(autorange="reversed", title=None),   # 월요일이 위로
+        xaxis=dict(title=None, dtick=1),
+        margin=dict(l=40, r=20, t=20, b=40),
+        height=320,
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_curve_overlay(curves: pd.DataFrame, labels: dict, title: str = ""):
+    """
+    여러 채널의 공개 후 평균 조회수 곡선을 한 차트에 겹쳐 그림
+    curves : index=channel_id, columns=1..max_days (avg_view_curves_by_channel의 한 유형)
+    labels : channel_id → 범례에 쓸 채널명
+    """
+    import plotly.express as px
+
+    if title:
+        st.markdown(title)
+    if curves.empty:
+        st.info("표시할 데이터가 없습니다.")
+        return
+
+    long_df = (
+        curves.rename(index=labels)
+              .rename_axis(index='channel', columns='day')
+              .stack()
+              .rename('avg_view_count')
+              .reset_index()
+    )
+    fig = px.line(long_df, x='day', y='avg_view_count', color='channel', markers=True)
+    fig.update_layout(
+        xaxis=dict(tickmode='linear', dtick=1, ticksuffix="일", title=None),
+        yaxis=dict(tickformat=',.0f', title=None),
+        legend=dict(title=None, orientation='h', y=-0.2),
+        margin=dict(l=40, r=20, t=20, b=40)
+    )
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,45 @@
+import streamlit as st
+import pandas as pd
+from utils.profiler import is_profiling, is_fragment_rerun, get_profile_records, export_trace, end_profiling
+
+def render_profiler_panel(page: str = "", fragment: bool = False):
+    """
+    ?profile=1 로 접속했을 때만 보이는 hot-path 프로파일 패널
+    - 함수/구간별 호출 수, 총 시간(ms), 처리 행 수, 메모리 할당량(KB, 프로세스 전체)
+    - VPI_TRACE_PATH 환경변수가 있으면 이번 rerun 기록을 JSONL로 추가 저장
+    - fragment=True: fragment 본문 끝에서 호출, fragment만 다시 돌았을 때만 그 자리에 표시
+      (페이지 전체 실행이면 페이지 끝의 패널이 한꺼번에 보여줌)
+    """
+    if not is_profiling() or (fragment and not is_fragment_rerun()):
+        return
+
+    records = get_profile_records()
+    end_profiling()
+    export_trace(page=f"{page}#fragment" if fragment else page)
+
+    title = "⏱️ 프로파일 (이번 fragment rerun)" if fragment else "⏱️ 프로파일 (이번 rerun)"
+    with st.expander(title, expanded=True):
+        if not records:
+            st.caption("기록된 구간이 없습니다.")
+            return
+
+        df = pd.DataFrame(records)
+        summary = (
+            df.groupby("name", sort=False)
+              .agg(calls=("ms", "size"), total_ms=("ms", "sum"),
+                   rows=("rows", "sum"), alloc_kb=("alloc_kb", "sum"))
+              .sort_values("total_ms", ascending=False)
+        )
+        # 최상위 구간 합계 = rerun 중 계측된 전체 시간
+        total_ms = df.loc[df["depth"] == 0, "ms"].sum()
+        st.metric("계측된 시간", f"{total_ms:,.1f} ms")
+        st.dataframe(
+            summary,
+            use_container_width=True,
+            column_config={
+                "alloc_kb": st.column_config.NumberColumn(
+                    "alloc_kb (프로세스 전체)",
+                    help="tracemalloc은 프로세스 단위라 동시에 도는 다른 세션의 할당량도 섞여 있음",
+                ),
+            },
+        )
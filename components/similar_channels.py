@@ -0,0 +1,31 @@
+# components/similar_channels.py
+
+import streamlit as st
+import pandas as pd
+from utils.profiler import profiled
+
+@profiled()
+def render_similar_channels(neighbors: pd.DataFrame, channel_meta, as_of=None):
+    """
+    성과 프로필이 비슷한 채널 목록 (nearest_channels 결과)
+
+    - neighbors    : ['channel_id', 'distance'] (가까운 순)
+    - channel_meta : channel_id → 메타 dict
+    - as_of        : 기준 시점 (있으면 상세 페이지 링크에도 전달)
+    """
+    st.subheader("비슷한 채널🔎")
+    if neighbors.empty:
+        st.caption("비교할 채널이 없습니다.")
+        return
+
+    cols = st.columns(len(neighbors))
+    for col, (cid, distance) in zip(cols, neighbors.itertuples(index=False)):
+        meta = channel_meta.get(cid, {})
+        url = f"/ChannelDetail?channel_id={cid}"
+        if as_of is not None:
+            url += f"&as_of={as_of:%Y-%m-%dT%H:%M:%S}"
+        with col:
+            if meta.get("profile_image"):
+                st.image(meta["profile_image"], width=60)
+            st.markdown(f"**[{meta.get('channel_title', cid)}]({url})**")
+            st.caption(f"{meta.get('category', 'N/A')} · 거리 {distance:.2f}")
@@ -0,0 +1,47 @@
+# components/trending_panel.py
+
+import streamlit as st
+import pandas as pd
+from utils.profiler import profiled
+
+@profiled()
+def render_trending_panel(trending: pd.DataFrame, video_meta, channel_meta):
+    """
+    "지금 뜨는 영상" 패널 (merge_trending_tops 결과, score 순)
+
+    - trending     : index=video_id, ['channel_id', 'velocity', 'accel', 'score', 'last_views', ...]
+    - video_meta   : video_id → 메타 dict (제목, 썸네일)
+    - channel_meta : channel_id → 메타 dict (채널명)
+    """
+    with st.expander("🔥 지금 뜨는 영상", expanded=False):
+        if trending.empty:
+            st.caption("아직 속도를 계산할 스냅샷이 없습니다.")
+            return
+
+        videos = video_meta.get_many(trending.index)
+        channels = channel_meta.get_many(trending['channel_id'].unique())
+        table = pd.DataFrame({
+            "thumbnail": [videos.get(vid, {}).get("thumbnail_url", "") for vid in trending.index],
+            "title":     [videos.get(vid, {}).get("title", vid) for vid in trending.index],
+            "channel":   [channels.get(cid, {}).get("channel_title", cid) for cid in trending['channel_id']],
+            "velocity":  trending['velocity'].to_numpy(),
+            "score":     trending['score'].to_numpy(),
+            "accel":     trending['accel'].to_numpy(),
+            "views":     trending['last_views'].to_numpy(),
+            "link":      "https://www.youtube.com/watch?v=" + trending.index.to_series(),
+        })
+        st.dataframe(
+            table,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "thumbnail": st.column_config.ImageColumn("썸네일", width="small"),
+                "title":     st.column_config.TextColumn("제목", width="large"),
+                "channel":   st.column_config.TextColumn("채널"),
+                "velocity":  st.column_config.NumberColumn("시간당 조회수", format="%.0f"),
+                "score":     st.column_config.NumberColumn("평소 대비", format="%.1f배"),
+                "accel":     st.column_config.NumberColumn("가속도", format="%+.1f", help="시간당 조회수의 시간당 변화량"),
+                "views":     st.column_config.NumberColumn("조회수", format="localized"),
+                "link":      st.column_config.LinkColumn("영상", display_text="보러가기"),
+            },
+        )
@@ -0,0 +1,43 @@
+# components/upload_timing_panel.py
+
+import streamlit as st
+from utils.profiler import begin_profiling, profile_section
+from components.profiler_panel import render_profiler_panel
+from utils.upload_timing import upload_timing_grid
+from components.charts import render_upload_timing_heatmap
+
+DAY_OPTIONS = [1, 3, 7, 14, 30]
+
+
+# 경과일·통계 선택을 바꾸면 히트맵만 다시 그림 (큐브에서 격자만 다시 뽑음)
+@st.fragment
+def render_upload_timing_panel(cube, scope: str, keys, is_short=None, key: str = "upload_timing"):
+    """
+    "언제 올리면 좋을까" 패널: 공개 요일 × 시각별 N일차 조회수 (업로드 타이밍 큐브에서)
+
+    - cube     : load_timing_cube 결과
+    - scope    : "channel" 또는 "category"
+    - keys     : 채널 id / 카테고리명 (여러 개면 합쳐서)
+    - is_short : None이면 유형 선택 라디오를 보여줌, True/False면 고정
+    - key      : 위젯 key 접두어 (한 페이지에 여러 번 쓸 때)
+    """
+    begin_profiling(fragment=True)  # fragment만 다시 돌 때는 여기서부터 새로 기록
+    st.subheader("업로드 타이밍⏰")
+    days = [d for d in DAY_OPTIONS if d <= int(cube['day'].max())] if len(cube) else DAY_OPTIONS[:1]
+    c1, c2, c3 = st.columns([2, 2, 2])
+    day = c1.selectbox("공개 후 경과일", days, index=min(2, len(days) - 1),
+                       format_func=lambda d: f"{d}일차", key=f"{key}-day")
+    stat = c2.radio("통계", ["median", "mean"], horizontal=True, key=f"{key}-stat",
+                    format_func={"median": "중앙값", "mean": "평균"}.get)
+    if is_short is None:
+        video_type = c3.radio("영상 유형", ["전체", "롱폼", "쇼츠"], horizontal=True, key=f"{key}-type")
+        is_short = {"전체": None, "롱폼": False, "쇼츠": True}[video_type]
+
+    with profile_section("upload_timing_grid"):
+        values, counts = upload_timing_grid(cube, scope, keys, day, is_short, stat)
+    label = f"{day}일차 조회수 " + ("중앙값" if stat == "median" else "평균")
+    render_upload_timing_heatmap(values, counts, label)
+    if len(cube):
+        st.caption(f"공개 후 {day}일이 지난 영상만 집계 · 기준 {cube['closed_until'].iloc[0]:%Y-%m-%d %H:%M} · "
+                   "시각은 한국 시간(Asia/Seoul)")
+    render_profiler_panel(page=f"upload_timing:{scope}", fragment=True)
@@ -3,7 +3,10 @@
 import streamlit as st
 import pandas as pd
 import streamlit.components.v1 as components
+from utils.profiler import profiled
+from utils.metrics import format_korean_count
 
+@profiled()
 def render_video_card(
     row: pd.Series,
     snapshot_df: pd.DataFrame,
@@ -82,8 +85,16 @@ def render_video_card(
             st.metric("Retain Index", f"{retain:.2f}" if isinstance(retain, (int, float)) else "-")        
         with index1:
             st.markdown(":blue-badge[기본이 지표]")
+            if row.get('forecast_views'):
+                st.metric("D+30 예측", format_korean_count(int(row['forecast_views'])))
             
         with index2:
             st.markdown(":blue-badge[다중이 지표]")
+            # 같은 카테고리·유형 영상 중 이 값 이하인 비율 (백분위 배열이 없으면 표시 안 함)
+            for label, key in (("Gain 백분위", "gain_pct"), ("Retain 백분위", "retain_pct")):
+                pct = row.get(key)
+                if pct is not None:
+                    st.metric(label, f"{pct:.0f}" if pd.notna(pct) else "-",
+                              help="같은 카테고리·유형 영상 중 이 값 이하인 비율(%)")
 
     st.write("---")
@@ -0,0 +1,90 @@
+# components/video_table.py
+
+import streamlit as st
+import pandas as pd
+from utils.profiler import profiled
+
+# 기대 대비 추이 열의 y축 상한 (이보다 큰 비율은 상한으로 자름)
+TREND_RATIO_CAP = 3.0
+
+
+def _ratio_to_expected(trajectory: list, expected: list) -> list:
+    # 일별 실제 조회수 ÷ 같은 날 기대 조회수 (기대값이 없는 날은 None)
+    return [
+        min(actual / exp, TREND_RATIO_CAP) if exp and exp > 0 else None
+        for actual, exp in zip(trajectory, expected)
+    ]
+
+
+@profiled()
+def render_video_table(
+    update_video: pd.DataFrame,
+    trajectories: pd.Series,
+    expected_L: list,
+    expected_S: list,
+    tab_name: str
+):
+    """
+    탭의 영상 전체를 st.dataframe 하나로 렌더링하는 "컴팩트 보기"
+    (영상마다 columns/metric/popover를 만드는 render_video_card 대신 요소 1개)
+
+    - update_video : 탭에 보여줄 영상별 최신 row (expected_views, gain_score 포함, 정렬 완료)
+    - trajectories : video_id → 일별 조회수 list (build_video_trajectories 결과)
+    - expected_L/S : 롱폼/쇼츠 채널 평균 곡선 (1일차부터의 list)
+    """
+    table = pd.DataFrame({
+        "thumbnail": update_video["thumbnail_url"],
+        "title":     update_video["video_title"],
+        "type":      update_video["is_short"].map({True: "Shorts", False: "Long-form"}),
+        "published": update_video["published_at_dt"].dt.strftime("%Y-%m-%d"),
+        "day":       update_video["day_since_pub"],
+        "views":     update_video["view_count"],
+        "expected":  update_video["expected_views"],
+        "forecast":  update_video["forecast_views"],
+    })
+    table["gain"] = update_video["gain_score"]
+    table["retain"] = (
+        update_video["view_count"] / update_video["expected_views"].where(update_video["expected_views"] > 0)
+    )
+
+    # 스파크라인: 실제 궤적, 그리고 같은 날의 기대 곡선 대비 비율 (1 = 채널 평균)
+    # 비율 열은 모든 행이 0 ~ TREND_RATIO_CAP 같은 축이라 행끼리도, 기대값과도 바로 비교됨
+    actual = update_video["video_id"].map(trajectories)
+    actual = actual.apply(lambda x: x if isinstance(x, list) else [])
+    table["trend"] = actual
+    table["trend_ratio"] = [
+        _ratio_to_expected(traj, expected_S if is_short else expected_L)
+        for is_short, traj in zip(update_video["is_short"], actual)
+    ]
+    # 카테고리 내 백분위 (ranks가 있을 때만 계산되어 들어옴)
+    for col in ("gain_pct", "retain_pct"):
+        if col in update_video.columns:
+            table[col] = update_video[col]
+    table["link"] = "https://www.youtube.com/watch?v=" + update_video["video_id"]
+
+    st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        key=f"video-table-{tab_name}",
+        column_config={
+            "thumbnail":      st.column_config.ImageColumn("썸네일", width="small"),
+            "title":          st.column_config.TextColumn("제목", width="large"),
+            "type":           st.column_config.TextColumn("유형"),
+            "published":      st.column_config.TextColumn("공개일"),
+            "day":            st.column_config.NumberColumn("D+", format="%d일"),
+            "views":          st.column_config.NumberColumn("조회수", format="localized"),
+            "expected":       st.column_config.NumberColumn("기대 조회수", format="localized"),
+            "forecast":       st.column_config.NumberColumn("D+30 예측", format="localized"),
+            "gain":           st.column_config.NumberColumn("Gain Index", format="%.2f"),
+            "retain":         st.column_config.NumberColumn("Retain Index", format="%.2f"),
+            "gain_pct":       st.column_config.ProgressColumn("Gain 백분위", format="%.0f", min_value=0, max_value=100),
+            "retain_pct":     st.column_config.ProgressColumn("Retain 백분위", format="%.0f", min_value=0, max_value=100),
+            "trend":          st.column_config.LineChartColumn("조회수 추이"),
+            "trend_ratio":    st.column_config.LineChartColumn(
+                "기대 대비 추이", y_min=0, y_max=TREND_RATIO_CAP,
+                help=f"일별 조회수 ÷ 채널 평균 곡선 (1 = 평균, {TREND_RATIO_CAP:g}배 이상은 {TREND_RATIO_CAP:g}로 표시)",
+            ),
+            "link":           st.column_config.LinkColumn("영상", display_text="보러가기"),
+        },
+    )
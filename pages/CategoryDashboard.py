@@ -0,0 +1,114 @@
+import os
+import streamlit as st
+import pandas as pd
+from utils.rollup import (
+    load_category_cube, load_day_n_histogram, load_category_subs, day_n_median, cube_version,
+    CUBE_PATH, CUBE_HIST_PATH, CUBE_SUBS_PATH
+)
+from utils.metrics import format_korean_count
+from utils.upload_timing import load_timing_cube, timing_cube_version, TIMING_CUBE_PATH
+from components.upload_timing_panel import render_upload_timing_panel
+
+st.set_page_config(
+    page_title="VPI · 카테고리",
+    page_icon="📺",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+# 스냅샷 로그는 읽지 않고, 적재 시점에 만든 카테고리 큐브만 사용
+if not os.path.exists(CUBE_PATH):
+    st.warning(f"카테고리 큐브가 없습니다. `python -m utils.rollup` 으로 {CUBE_PATH}를 먼저 만들어 주세요.")
+    st.stop()
+
+# 파일 버전을 캐시 키에 넣어 큐브를 다시 만들면 앱을 재시작하지 않아도 새로 읽음
+cube = load_category_cube(CUBE_PATH, cube_version(CUBE_PATH))
+# D+N 조회수 히스토그램 (예전 큐브만 있으면 중앙값 칸은 비워 둠)
+day_n_hist = load_day_n_histogram(CUBE_HIST_PATH, cube_version(CUBE_HIST_PATH)) if os.path.exists(CUBE_HIST_PATH) else pd.DataFrame(
+    columns=['category', 'date', 'is_short', 'bin', 'count']
+)
+# 채널 단위 구독자 증가량 (is_short 차원 없음, 예전 큐브만 있으면 비워 둠)
+subs_table = load_category_subs(CUBE_SUBS_PATH, cube_version(CUBE_SUBS_PATH)) if os.path.exists(CUBE_SUBS_PATH) else pd.DataFrame(
+    columns=['category', 'date', 'subs_gained']
+)
+day_n = int(cube['day_n'].iloc[0]) if len(cube) else 7
+
+st.metric(value="📊 카테고리 대시보드", label="Video Performance Indicator")
+
+# — 필터: 카테고리 · 기간 · 영상 유형 —
+c1, c2, c3 = st.columns([3, 2, 1])
+categories = sorted(cube['category'].dropna().unique())
+selected = c1.multiselect("카테고리", categories, default=categories)
+min_date, max_date = cube['date'].min().date(), cube['date'].max().date()
+date_range = c2.date_input("기간", value=(min_date, max_date), min_value=min_date, max_value=max_date)
+video_type = c3.radio("영상 유형", ["전체", "롱폼", "쇼츠"], horizontal=True)
+
+if not selected:
+    st.info("카테고리를 하나 이상 선택해 주세요.")
+    st.stop()
+
+start, end = (date_range if len(date_range) == 2 else (date_range[0], date_range[0]))
+
+
+def select_cells(table: pd.DataFrame) -> pd.DataFrame:
+    # 큐브/히스토그램에서 선택한 카테고리·기간·영상 유형의 칸만 (is_short가 없는 표는 유형 필터 없음)
+    rows = table[
+        table['category'].isin(selected)
+        & (table['date'] >= pd.Timestamp(start))
+        & (table['date'] <= pd.Timestamp(end))
+    ]
+    if 'is_short' not in rows.columns:
+        return rows
+    if video_type == "롱폼":
+        rows = rows[~rows['is_short']]
+    elif video_type == "쇼츠":
+        rows = rows[rows['is_short']]
+    return rows
+
+
+view = select_cells(cube)
+
+# 구독자 증가량은 채널 단위 값이라 영상 유형과 상관없이 (카테고리, 날짜)별 표에서
+subs_daily = select_cells(subs_table).pivot_table(
+    index='date', columns='category', values='subs_gained', aggfunc='sum'
+)
+views_daily = view.pivot_table(index='date', columns='category', values='views_gained', aggfunc='sum')
+
+# — 카테고리 비교 표 —
+# 평균·중앙값은 칸별 평균/중앙값을 다시 평균 내지 않고, 합·개수와 히스토그램을 더한 뒤 계산
+gain_totals = view.groupby('category')[['gain_sum', 'gain_count']].sum()
+summary = pd.DataFrame({
+    "조회수 증가": view.groupby('category')['views_gained'].sum(),
+    "구독자 증가": subs_daily.sum(),
+    "업로드 수": view.groupby('category')['upload_count'].sum(),
+    f"D+{day_n} 조회수(중앙값)": day_n_median(select_cells(day_n_hist), ['category']),
+    "평균 Gain Score": gain_totals['gain_sum'] / gain_totals['gain_count'].where(gain_totals['gain_count'] > 0),
+}).reindex(selected).fillna({"조회수 증가": 0, "구독자 증가": 0, "업로드 수": 0})
+
+cols = st.columns(len(selected[:4]))
+for col, cat in zip(cols, selected[:4]):
+    col.metric(cat, f"{format_korean_count(int(summary.loc[cat, '조회수 증가']))}회",
+               f"구독자 {int(summary.loc[cat, '구독자 증가']):+,}")
+
+st.dataframe(summary, use_container_width=True)
+
+left, right = st.columns(2)
+with left:
+    st.subheader("일별 조회수 증가")
+    st.line_chart(views_daily, use_container_width=True)
+with right:
+    st.subheader("일별 구독자 증가")
+    st.line_chart(subs_daily, use_container_width=True)
+
+st.subheader("일별 업로드 수")
+st.bar_chart(view.pivot_table(index='date', columns='category', values='upload_count', aggfunc='sum'),
+             use_container_width=True)
+
+# 선택한 카테고리의 업로드 타이밍 (카테고리별 히스토그램을 더해서 합침)
+if os.path.exists(TIMING_CUBE_PATH):
+    render_upload_timing_panel(
+        load_timing_cube(TIMING_CUBE_PATH, timing_cube_version()), "category", selected,
+        is_short={"전체": None, "롱폼": False, "쇼츠": True}[video_type], key="timing-category"
+    )
+else:
+    st.caption(f"업로드 타이밍 큐브가 없습니다. `python -m utils.upload_timing` 으로 {TIMING_CUBE_PATH}를 만들 수 있습니다.")
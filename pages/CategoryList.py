@@ -1,7 +1,16 @@
 import streamlit as st
 import pandas as pd
-from utils.data_loader import load_processed_data, load_channel_meta
+from utils.data_loader import (
+    load_processed_data, load_channel_meta, load_video_meta, parse_as_of, slice_as_of, get_data_version
+)
 from components.channel_card import render_channel_card
+from components.trending_panel import render_trending_panel
+from components.profiler_panel import render_profiler_panel
+from utils.profiler import begin_profiling, profile_section
+from utils.surge import load_surge_state, rank_surging_channels
+from utils.trending import load_trending_top, merge_trending_tops
+from utils.chunked import PARTITION_DIR, SUMMARY_FILE, load_channel_summary, partition_file_version
+from utils.metrics import channel_view_stats
 
 st.set_page_config(
     page_title="VPI",
@@ -10,27 +19,61 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+begin_profiling()
+# 데이터를 읽기 전에 자리표시자부터 보내 첫 화면이 바로 뜨도록
+skeleton = st.empty()
+skeleton.info("⏳ 채널 목록을 불러오는 중입니다...")
+
 # 1) 데이터 불러오기 & 통계 계산
-df = load_processed_data()
+# ?as_of=2025-06-20 처럼 주면 그 시점까지의 스냅샷만으로 계산 (이진 탐색으로 앞부분만 자름)
+as_of = parse_as_of(st.query_params.get("as_of"))
 channel_meta = load_channel_meta()
+video_meta = load_video_meta()
 
-latest = df.groupby('channel_id').last()
-earliest = df.groupby('channel_id').first()
-
-# 카테고리 리스트
-categories = ["전체"] + sorted({meta["category"]
-                               for meta in channel_meta.values()
-                               if "category" in meta and meta["category"]})
+# 카테고리 리스트 (메타 저장소 인덱스에서 바로, 채널 레코드는 파싱하지 않음)
+categories = ["전체"] + sorted(channel_meta.categories())
 
 # 정렬 기준 맵
-subs_diff    = latest['subscriber_count'] - earliest['subscriber_count']
-avg_views    = df.groupby('channel_id')['view_count'].mean()
-short_ratio  = df.groupby('channel_id')['is_short'].mean()
-subscriber_count = latest['subscriber_count']
+if PARTITION_DIR:
+    # 청크 모드: 로그 전체 대신 미리 합쳐 둔 채널 요약만 읽음 (최신 기준, as_of 미지원)
+    summary = load_channel_summary(PARTITION_DIR, partition_file_version(PARTITION_DIR, SUMMARY_FILE))
+    subs_diff    = summary['subs_diff']
+    avg_views    = summary['avg_views']
+    short_ratio  = summary['short_ratio']
+    subscriber_count = summary['subscriber_count']
+    surge_state  = summary[['gain', 'score']].dropna().to_dict('index')
+    trending_tops = {}  # 지금 뜨는 영상은 전체 로그 replay가 필요해서 청크 모드에서는 생략
+    as_of = None
+else:
+    data_version = get_data_version()
+    df = slice_as_of(load_processed_data(data_version=data_version), as_of)
+
+    with profile_section("channel_stats", rows=len(df)):
+        latest = df.groupby('channel_id').last()
+        earliest = df.groupby('channel_id').first()
+
+    with profile_section("sort_columns", rows=len(df)):
+        subs_diff    = latest['subscriber_count'] - earliest['subscriber_count']
+        view_stats   = channel_view_stats(df)
+        avg_views    = view_stats['avg_views']
+        short_ratio  = view_stats['short_ratio']
+        subscriber_count = latest['subscriber_count']
+    surge_state = load_surge_state(as_of=as_of, data_version=data_version)
+    # 지금 뜨는 영상: 카테고리별 top K만 캐시 (영상 속도 ÷ 채널 기대 곡선 기울기)
+    trending_tops = load_trending_top(data_version=data_version, as_of=as_of, _category_map=channel_meta)
+
+# 지금 급상승: 채널별 일일 구독자 증가량 EWMA 대비 최근 증가량의 변화점 점수
+surging = rank_surging_channels(surge_state)
+surge_score = (
+    pd.Series({cid: s['score'] for cid, s in surge_state.items()}, dtype=float)
+      .reindex(subscriber_count.index)
+      .fillna(0.0)
+)
 
 sort_column_map = {
-    "구독자순": latest['subscriber_count'],
+    "구독자순": subscriber_count,
     "구독자 급상승": subs_diff,
+    "지금 급상승": surge_score,
     "평균 조회수": avg_views,
     "Shorts 비율": short_ratio
 }
@@ -58,12 +101,17 @@ def on_cats_change():
     st.session_state.prev_selected_cats = new
 
 # ———— Page 렌더링 ————
-non1, main, non2 = st.columns([0.5, 10, 0.5])
-with main:
+# 검색어 입력·카테고리 선택·정렬 변경은 이 fragment만 다시 실행 (위의 통계 계산은 건너뜀)
+@st.fragment
+def render_channel_list(channel_meta, video_meta, categories, sort_column_map, channel_stats, surging, trending_tops, as_of):
+    begin_profiling(fragment=True)  # fragment만 다시 돌 때는 여기서부터 새로 기록
+    subs_diff, avg_views, short_ratio, subscriber_count = channel_stats
     s1, s2 = st.columns(2)
     with s1:
         st.metric(value="📺VPI", label="Video Performance Indicator")
         st.caption("가장 강력한 유튜브 분석 도구")
+        if as_of is not None:
+            st.caption(f"🕒 기준 시점: {as_of:%Y-%m-%d %H:%M}")
     
     with s2:
         search_query = st.text_input(
@@ -82,28 +130,39 @@ with main:
         help="여러 카테고리 선택 가능"
     )
 
-    # — 필터링: 카테고리 →
+    # — 지금 급상승 중인 채널 Top 5 —
+    if not surging.empty:
+        top = [
+            f"**{channel_meta[cid]['channel_title']}** (+{row['gain']:,.0f}/일)"
+            for cid, row in surging.head(5).iterrows() if cid in channel_meta
+        ]
+        st.caption("🚀 지금 급상승: " + " · ".join(top))
+
     selected = st.session_state.selected_cats
+
+    # — 지금 뜨는 영상 (선택한 카테고리의 top K만 합침) —
+    if trending_tops:
+        trending = merge_trending_tops(trending_tops, None if '전체' in selected else selected, top_n=10)
+        render_trending_panel(trending, video_meta, channel_meta)
+
+    # — 필터링: 카테고리 →
     if '전체' in selected:
         filtered_ids = list(channel_meta.keys())
     else:
-        filtered_ids = [
-            cid for cid, meta in channel_meta.items()
-            if meta.get("category", "") in selected
-        ]
+        filtered_ids = [cid for cid in channel_meta if channel_meta.category(cid) in selected]
 
     # — 추가 필터: 검색어 →
     if search_query:
+        candidates = channel_meta.get_many(filtered_ids)
         filtered_ids = [
             cid for cid in filtered_ids
-            if search_query in channel_meta[cid]["channel_title"].lower()
-            or search_query in channel_meta[cid].get("channel_description", "").lower()
-            or search_query in channel_meta[cid].get("handle", "").lower()
+            if search_query in candidates[cid]["channel_title"].lower()
+            or search_query in candidates[cid].get("channel_description", "").lower()
+            or search_query in candidates[cid].get("handle", "").lower()
         ]
 
     # — 결과 개수 및 정렬 기준 선택 —
     col1, col2 = st.columns([4, 1])
-    col1.metric(label=f"결과 {len(filtered_ids)}명", value="Youtuber List")
     with col2:
         sort_key = st.selectbox(
             "정렬 기준",
@@ -113,16 +172,34 @@ with main:
         )
 
     # — 소팅 & 렌더링 —
+    # as_of 시점까지 스냅샷이 없는 채널은 통계가 없으므로 목록에서 뺌
     sort_series = sort_column_map[sort_key] \
-                  .loc[filtered_ids] \
+                  .reindex(filtered_ids) \
+                  .dropna() \
                   .sort_values(ascending=False)
+    col1.metric(label=f"결과 {len(sort_series)}명", value="Youtuber List")
+
+    with profile_section("channel_cards", rows=len(sort_series)):
+        for cid in sort_series.index:
+            meta = channel_meta[cid]
+            stats = {
+                "subs_diff":    subs_diff.get(cid, 0),
+                "avg_views":    avg_views.get(cid, 0),
+                "short_ratio":  short_ratio.get(cid, 0.0),
+                "subscriber_count": subscriber_count.get(cid, 0.0),
+            }
+            render_channel_card(channel_id=cid, meta=meta, stats=stats, as_of=as_of)
+
+    render_profiler_panel(page="CategoryList", fragment=True)
+
+
+skeleton.empty()
+non1, main, non2 = st.columns([0.5, 10, 0.5])
+with main:
+    render_channel_list(
+        channel_meta, video_meta, categories, sort_column_map,
+        (subs_diff, avg_views, short_ratio, subscriber_count),
+        surging, trending_tops, as_of
+    )
 
-    for cid in sort_series.index:
-        meta = channel_meta[cid]
-        stats = {
-            "subs_diff":    subs_diff.get(cid, 0),
-            "avg_views":    avg_views.get(cid, 0),
-            "short_ratio":  short_ratio.get(cid, 0.0),
-            "subscriber_count": subscriber_count.get(cid, 0.0),
-        }
-        render_channel_card(channel_id=cid, meta=meta, stats=stats)
+render_profiler_panel(page="CategoryList")
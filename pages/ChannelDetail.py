@@ -1,23 +1,32 @@
 # pages/2_ChannelDetail.py
+import os
+import pandas as pd
 import streamlit as st
-import pandas as np
-import streamlit.components.v1 as components
-from streamlit.components.v1 import html
-from utils.data_loader import load_processed_data, load_channel_meta
+from utils.data_loader import (
+    load_processed_data, load_channel_meta, load_snapshot_index, get_channel_snapshots, parse_as_of,
+    get_data_version, slice_as_of
+)
+from utils.chunked import (
+    PARTITION_DIR, METRICS_DIR, load_channel_partition, load_channel_metrics, partition_file_version
+)
 from utils.metrics import (
     get_subscriber_metrics, avg_views, 
-    avg_view_by_days_since_published, format_korean_count, parse_published_at
+    avg_view_by_days_since_published, format_korean_count, parse_published_at,
+    load_video_trajectories, add_day_since_pub, curve_tables
 )
+from utils.forecast import load_view_forecasts, forecast_views
+from utils.similar import load_similar_index, nearest_channels
+from utils.percentile import load_percentile_ranks, category_percentiles
+from utils.upload_timing import load_timing_cube, timing_cube_version, TIMING_CUBE_PATH
 from utils.apply_hyojun_index import compute_video_gain_scores, aggregate_views_within_days
 from components.charts import render_avg_views_table, render_avg_views_line_chart
 from components.video_card_st import render_video_card
+from components.video_table import render_video_table
 from components.channel_nameCard import render_name_card
-import base64
-import requests
-
-def img_url_to_base64(url):
-    response = requests.get(url)
-    return base64.b64encode(response.content).decode()
+from components.similar_channels import render_similar_channels
+from components.upload_timing_panel import render_upload_timing_panel
+from components.profiler_panel import render_profiler_panel
+from utils.profiler import begin_profiling, profile_section
 
 st.set_page_config(
     page_icon="📺",
@@ -25,20 +34,161 @@ st.set_page_config(
     initial_sidebar_state="collapsed" # 'collapsed', 'expanded', 또는 'auto'
 )
 
+# 탭별 데이터 필터링 함수
+def filter_by_tab(df, tab_name):
+    if tab_name == "쇼츠":
+        return df[df['is_short'] == True]
+    elif tab_name == "롱폼":
+        return df[df['is_short'] == False]
+    return df
+
+
+# 정렬 순서를 바꾸면 해당 탭의 영상 목록만 다시 그림 (데이터 로드·곡선·Gain Score 계산은 건너뜀)
+@st.fragment
+def render_video_tab(
+    tab_name, ch_df, video_gain_df, forecast_df, result_L, result_S,
+    compact=False, trajectories=None, expected_L=None, expected_S=None,
+    ranks=None, category=""
+):
+    begin_profiling(fragment=True)  # fragment만 다시 돌 때는 여기서부터 새로 기록
+    # 3) 탭별 필터링
+    sub = filter_by_tab(ch_df, tab_name)
+
+    # 4) 최신 스냅샷 기준으로 video_id별 최신 row만
+    update_video = (
+        sub.sort_values('timestamp', ascending=False)
+           .drop_duplicates(subset='video_id', keep='first')
+    )
+
+    # 5) Gain Score 머지
+    update_video = (
+        update_video
+        .merge(video_gain_df, on='video_id', how='left')
+        .fillna({'gain_score': 0})     # 계산 누락된 경우 0으로
+    )
+    update_video['forecast_views'] = (
+        update_video['video_id'].map(forecast_df['forecast_views']).fillna(0).astype(int)
+    )
+
+    #여기에 칼럼 업데이트-------------------------------------------------------
+    map_L = result_L.set_index('day')['avg_view_count'].to_dict()
+    map_S = result_S.set_index('day')['avg_view_count'].to_dict()
+    # 2) update_video DataFrame 준비
+
+    # 3) 기본은 Long-form 맵으로 채우고
+    update_video['expected_views'] = update_video['day_since_pub'].map(map_L)
+
+    # 4) Shorts인 행만 Shorts 맵으로 덮어쓰기
+    mask_shorts = update_video['is_short']
+    update_video.loc[mask_shorts, 'expected_views'] = (
+        update_video.loc[mask_shorts, 'day_since_pub']
+                    .map(map_S)
+    )
+
+    # 5) NaN은 0으로, 정수형으로 변환
+    update_video['expected_views'] = (
+        update_video['expected_views']
+        .fillna(0)
+        .astype(int)
+    )
+
+    # 카테고리 내 백분위: 미리 만든 (카테고리, 유형)별 정렬 배열에 이진 탐색 (다른 채널은 건드리지 않음)
+    if ranks is not None:
+        retain = update_video['view_count'] / update_video['expected_views'].where(update_video['expected_views'] > 0)
+        gain = update_video['gain_score'].where(~update_video['is_short'].astype(bool))
+        update_video['gain_pct'] = category_percentiles(ranks, "gain", category, update_video['is_short'], gain)
+        update_video['retain_pct'] = category_percentiles(ranks, "retain", category, update_video['is_short'], retain)
+
+    # 6) 정렬 기준 선택
+    sort_options = ["최신순", "조회수순", "기여도순", "예측 조회수순"]
+    if ranks is not None:
+        sort_options += ["Gain 백분위순", "Retain 백분위순"]
+    col1, col2 = st.columns([3,1])
+    col1.markdown(f"**총 영상개수: {len(update_video):,}개**")
+    sort_option = col2.selectbox(
+        "정렬 순서",
+        sort_options,
+        index=0,
+        key=f"sort-{tab_name}"
+    )
+
+    if sort_option == "최신순":
+        update_video = update_video.sort_values('published_at', ascending=False)
+    elif sort_option == "조회수순":
+        update_video = update_video.sort_values('view_count', ascending=False)
+    elif sort_option == "예측 조회수순":
+        update_video = update_video.sort_values('forecast_views', ascending=False)
+    elif sort_option == "Gain 백분위순":
+        update_video = update_video.sort_values('gain_pct', ascending=False)
+    elif sort_option == "Retain 백분위순":
+        update_video = update_video.sort_values('retain_pct', ascending=False)
+    else:  # 기여도순
+        update_video = update_video.sort_values('gain_score', ascending=False)
+
+    #----------------------------------------------------
+    # 7) 각 영상 렌더링
+    if compact:
+        render_video_table(update_video, trajectories, expected_L, expected_S, tab_name)
+    else:
+        for _, row in update_video.iterrows():
+            vid = row["video_id"]
+            # 해당 영상 전체 스냅샷
+            snapshot_df = ch_df[ch_df["video_id"] == vid].copy()
+            # 올바른 metrics_df 선택
+            metrics_df  = result_S if row["is_short"] else result_L
+
+            render_video_card(
+                row=           row,
+                snapshot_df=   snapshot_df,
+                metrics_df=    metrics_df,
+                tab_name = tab_name
+            )
+
+    render_profiler_panel(page="ChannelDetail", fragment=True)
+
+
 def main():
-    df = load_processed_data("data/processed_data_v2.csv")
+    begin_profiling()
+    # 데이터를 읽기 전에 자리표시자부터 보내 첫 화면이 바로 뜨도록
+    skeleton = st.empty()
+    skeleton.info("⏳ 채널 데이터를 불러오는 중입니다...")
+
     channel_meta = load_channel_meta("data/channel_meta.json")
 
     channel_id = st.query_params.get("channel_id")
-    ch_df = df[df["channel_id"] == channel_id]
-    growth, daily_avg, end, start = get_subscriber_metrics(ch_df, 30)
+    # ?as_of=... 가 있으면 그 시점까지의 스냅샷만 (채널 인덱스 + 이진 탐색, 전체 필터링 없음)
+    as_of = parse_as_of(st.query_params.get("as_of"))
+    stored = None
+    if PARTITION_DIR:
+        # 청크 모드: 이 채널의 파티션 파일만 읽고, 최신 기준이면 build_partitions가 저장해 둔 지표를 씀
+        partition_version = partition_file_version(PARTITION_DIR, f"{channel_id}.csv")
+        ch_df = slice_as_of(load_channel_partition(channel_id, PARTITION_DIR, partition_version), as_of)
+        if as_of is None:
+            metrics_version = partition_file_version(PARTITION_DIR, os.path.join(METRICS_DIR, f"{channel_id}.json"))
+            stored = load_channel_metrics(channel_id, PARTITION_DIR, metrics_version)
+    else:
+        data_version = get_data_version("data/processed_data_v2.csv")
+        df = load_processed_data("data/processed_data_v2.csv", data_version)
+        snapshot_index = load_snapshot_index("data/processed_data_v2.csv", data_version)
+        with profile_section("channel_filter", rows=len(df)):
+            ch_df = get_channel_snapshots(df, snapshot_index, channel_id, as_of)
+    if ch_df.empty:
+        skeleton.empty()
+        when = f" {as_of:%Y-%m-%d %H:%M} 시점까지" if as_of is not None else ""
+        st.warning(f"이 채널은{when} 수집된 스냅샷이 없습니다.")
+        st.stop()
+    if stored:
+        growth, daily_avg, end, start = stored["subscribers"]
+    else:
+        growth, daily_avg, end, start = get_subscriber_metrics(ch_df, 30)
 
-    ch_df = ch_df.copy()
-    ch_df['published_at_dt'] = parse_published_at(ch_df['published_at'])
-    ch_df['day_since_pub'] = (ch_df['timestamp'] - ch_df['published_at_dt']).dt.days + 1 #공개 후 경과일 계산 (1일 차부터)
+    ch_df = add_day_since_pub(ch_df) #공개 후 경과일 계산 (1일 차부터)
 
     #==========================UI랜더링=========================
+    skeleton.empty()
     render_name_card(channel_meta, channel_id, ch_df)
+    if as_of is not None:
+        st.caption(f"🕒 기준 시점: {as_of:%Y-%m-%d %H:%M} (총 영상 수·총 조회수는 최신 메타 기준)")
 
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
@@ -53,6 +203,19 @@ def main():
         st.metric("구독자 증가수", f"{growth:,}명")
     with col5:
         st.metric("30일 일평균 구독자 증가량", f"{daily_avg:,.1f}명")
+
+    # 비슷한 채널: 최신 전체 로그 기준 k-NN 인덱스 (청크 모드는 전체 로그를 올리지 않으므로 생략)
+    if not PARTITION_DIR:
+        data_path = "data/processed_data_v2.csv"
+        similar_index = load_similar_index(data_path, get_data_version(data_path))
+        with profile_section("similar_channels"):
+            neighbors = nearest_channels(similar_index, channel_id, k=5)
+        render_similar_channels(neighbors, channel_meta, as_of)
+        if not neighbors.empty:
+            compare_url = "/Compare?channel_ids=" + ",".join([channel_id, *neighbors['channel_id']])
+            if as_of is not None:
+                compare_url += f"&as_of={as_of:%Y-%m-%dT%H:%M:%S}"
+            st.markdown(f"[⚖️ 비슷한 채널과 한 번에 비교하기]({compare_url})")
     st.write("---")
    
     # Shorts vs Long-form 평균 조회수
@@ -60,126 +223,95 @@ def main():
     st.write(ch_df)
     col1, col2 = st.columns(2)
     with col1: # 롱폼
-        long_metrics, result_L = avg_view_by_days_since_published(
-            ch_df,
-            max_days=30,
-            is_short=False
-        )
+        if stored:
+            long_metrics, result_L = curve_tables(stored["curves"]["long"])
+            long_avg = stored["avg_views"]["long"]
+        else:
+            long_metrics, result_L = avg_view_by_days_since_published(
+                ch_df,
+                max_days=30,
+                is_short=False
+            )
+            long_avg = avg_views(ch_df, 10, False)
         
         st.markdown("#### :green-badge[Long Form] 공개 이후 평균 조회수")
-        st.metric(label="Long-form 평균 조회수", value=f"{int(avg_views(ch_df, 10, False)):,}")
+        st.metric(label="Long-form 평균 조회수", value=f"{int(long_avg):,}")
         render_avg_views_table(long_metrics)
         render_avg_views_line_chart(result_L, "")
         
     with col2:
         # 숏폼
-        short_metrics, result_S = avg_view_by_days_since_published(
-            ch_df,
-            max_days=30,
-            is_short=True
-        )
+        if stored:
+            short_metrics, result_S = curve_tables(stored["curves"]["short"])
+            short_avg = stored["avg_views"]["short"]
+        else:
+            short_metrics, result_S = avg_view_by_days_since_published(
+                ch_df,
+                max_days=30,
+                is_short=True
+            )
+            short_avg = avg_views(ch_df, 10, True)
         st.markdown("#### :blue-badge[Short Form] 공개 이후 평균 조회수")
-        st.metric(label="Shorts 평균 조회수", value=f"{int(avg_views(ch_df, 10, True)):,}")
+        st.metric(label="Shorts 평균 조회수", value=f"{int(short_avg):,}")
         render_avg_views_table(short_metrics)
         render_avg_views_line_chart(result_S, "")
+
+    # 업로드 요일·시각별 N일차 조회수: 적재 시점에 만든 큐브에서 이 채널 행만 (스냅샷은 다시 읽지 않음)
+    if os.path.exists(TIMING_CUBE_PATH):
+        render_upload_timing_panel(load_timing_cube(TIMING_CUBE_PATH, timing_cube_version()), "channel", channel_id, key="timing-channel")
     
     #─────────────────────────────────────────────────────────── gainscore 계산 시작
     # 1) per-video Gain Score 계산
     #    반환값: DataFrame with columns ['video_id','gain_score']
-    video_gain_df = compute_video_gain_scores(
-        channel_df   = ch_df,
-        end_subs     = end,
-        total_views  = total_view,
-        c            = 100.0,
-        days         = 10
-    )
+    #    청크 모드는 파티션을 만들 때의 채널 메타(total_view_count)로 계산해 둔 값
+    if stored:
+        video_gain_df = pd.DataFrame(stored["gains"], columns=['video_id', 'gain_score'])
+    else:
+        video_gain_df = compute_video_gain_scores(
+            channel_df   = ch_df,
+            end_subs     = end,
+            total_views  = total_view,
+            c            = 100.0,
+            days         = 10
+        )
+    # 2) 영상별 D+30 예측 조회수 (최신 기준은 전체 영상을 한 번에 피팅해 데이터 버전별 캐시)
+    if as_of is None and not PARTITION_DIR:
+        data_path = "data/processed_data_v2.csv"
+        forecast_df = load_view_forecasts(data_path, get_data_version(data_path), horizon=30)
+    else:
+        forecast_df = forecast_views(ch_df, horizon=30)
+    # 3) 카테고리 백분위용 정렬 배열 (전체 영상 배치 계산, 청크 모드는 전체 로그가 없어 생략)
+    ranks = None
+    if not PARTITION_DIR:
+        data_path = "data/processed_data_v2.csv"
+        ranks = load_percentile_ranks(data_path, get_data_version(data_path), as_of, _channel_meta=channel_meta)
     # ──────────────────────────────────────────────────────────
     # 최근 영상 Expander
-    st.subheader("최근 영상 상세")
-    
+    head1, head2 = st.columns([3, 1])
+    head1.subheader("최근 영상 상세")
+    compact = head2.toggle("컴팩트 보기", key="compact_view", help="영상 목록을 표 하나로 빠르게 보기")
+
+    # 컴팩트 보기용 영상별 조회수 궤적 (탭마다 다시 계산하지 않도록 한 번만)
+    trajectories = expected_L = expected_S = None
+    if compact:
+        # 채널·데이터 버전·as_of별로 캐시 (청크 모드는 이 채널 파티션 파일의 버전)
+        version_path = os.path.join(PARTITION_DIR, f"{channel_id}.csv") if PARTITION_DIR else "data/processed_data_v2.csv"
+        trajectories = load_video_trajectories(channel_id, get_data_version(version_path), as_of, _ch_df=ch_df)
+        expected_L = result_L['avg_view_count'].tolist()
+        expected_S = result_S['avg_view_count'].tolist()
+
     # 1) 롱폼/숏폼 필터링 탭
     tab_all, tab_longs, tab_shorts = st.tabs(["전체영상", "롱폼", "쇼츠"])
-    
-    # 2) 탭별 데이터 필터링 함수
-    def filter_by_tab(df, tab_name):
-        if tab_name == "쇼츠":
-            return df[df['is_short'] == True]
-        elif tab_name == "롱폼":
-            return df[df['is_short'] == False]
-        return df
 
     for tab_name, tab in zip(["전체영상", "쇼츠", "롱폼"], [tab_all, tab_shorts, tab_longs]):
         with tab:
-            # 3) 탭별 필터링
-            sub = filter_by_tab(ch_df, tab_name)
-
-            # 4) 최신 스냅샷 기준으로 video_id별 최신 row만
-            update_video = (
-                sub.sort_values('timestamp', ascending=False)
-                   .drop_duplicates(subset='video_id', keep='first')
-            )
-
-            # 5) Gain Score 머지
-            update_video = (
-                update_video
-                .merge(video_gain_df, on='video_id', how='left')
-                .fillna({'gain_score': 0})     # 계산 누락된 경우 0으로
-            )
-
-            # 6) 정렬 기준 선택
-            col1, col2 = st.columns([3,1])
-            col1.markdown(f"**총 영상개수: {len(update_video):,}개**")
-            sort_option = col2.selectbox(
-                "정렬 순서",
-                ["최신순", "조회수순", "기여도순"],
-                index=0,
-                key=f"sort-{tab_name}"
-            )
-
-            if sort_option == "최신순":
-                update_video = update_video.sort_values('published_at', ascending=False)
-            elif sort_option == "조회수순":
-                update_video = update_video.sort_values('view_count', ascending=False)
-            else:  # 기여도순
-                update_video = update_video.sort_values('gain_score', ascending=False)
-            
-            #여기에 칼럼 업데이트-------------------------------------------------------
-            map_L = result_L.set_index('day')['avg_view_count'].to_dict()
-            map_S = result_S.set_index('day')['avg_view_count'].to_dict()
-            # 2) update_video DataFrame 준비
-
-            # 3) 기본은 Long-form 맵으로 채우고
-            update_video['expected_views'] = update_video['day_since_pub'].map(map_L)
-
-            # 4) Shorts인 행만 Shorts 맵으로 덮어쓰기
-            mask_shorts = update_video['is_short']
-            update_video.loc[mask_shorts, 'expected_views'] = (
-                update_video.loc[mask_shorts, 'day_since_pub']
-                            .map(map_S)
+            render_video_tab(
+                tab_name, ch_df, video_gain_df, forecast_df, result_L, result_S,
+                compact, trajectories, expected_L, expected_S,
+                ranks, channel_meta.category(channel_id)
             )
 
-            # 5) NaN은 0으로, 정수형으로 변환
-            update_video['expected_views'] = (
-                update_video['expected_views']
-                .fillna(0)
-                .astype(int)
-            )
-
-            #----------------------------------------------------
-            # 7) 각 영상 렌더링
-            for _, row in update_video.iterrows():
-                vid = row["video_id"]
-                # 해당 영상 전체 스냅샷
-                snapshot_df = ch_df[ch_df["video_id"] == vid].copy()
-                # 올바른 metrics_df 선택
-                metrics_df  = result_S if row["is_short"] else result_L
-
-                render_video_card(
-                    row=           row,
-                    snapshot_df=   snapshot_df,
-                    metrics_df=    metrics_df,
-                    tab_name = tab_name
-    )
+    render_profiler_panel(page="ChannelDetail")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
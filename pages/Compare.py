@@ -0,0 +1,114 @@
+import streamlit as st
+import pandas as pd
+from utils.data_loader import (
+    load_processed_data, load_channel_meta, load_channel_titles, load_snapshot_index, get_channels_snapshots,
+    parse_as_of, slice_as_of, get_data_version
+)
+from utils.chunked import PARTITION_DIR, load_channel_partition, partition_file_version
+from utils.compare import compare_channels
+from utils.profiler import begin_profiling, profile_section
+from components.charts import render_curve_overlay
+from components.profiler_panel import render_profiler_panel
+
+st.set_page_config(
+    page_title="VPI · 채널 비교",
+    page_icon="📺",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+MAX_CHANNELS = 6
+
+begin_profiling()
+st.metric(value="⚖️ 채널 비교", label="Video Performance Indicator")
+
+channel_meta = load_channel_meta()
+# 선택 목록 라벨은 캐시한 id → 채널명 표에서 (rerun마다 레코드를 디코딩하지 않음)
+channel_titles = load_channel_titles("data/channel_meta.json", get_data_version("data/channel_meta.json"))
+# ?channel_ids=UC..,UC.. 로 비교할 채널을 넘겨받고, 고른 결과도 다시 URL에 남겨 공유할 수 있게
+as_of = parse_as_of(st.query_params.get("as_of"))
+initial = [cid for cid in st.query_params.get("channel_ids", "").split(",") if cid in channel_meta][:MAX_CHANNELS]
+channel_ids = st.multiselect(
+    "비교할 채널",
+    list(channel_meta),
+    default=initial,
+    max_selections=MAX_CHANNELS,
+    format_func=lambda cid: channel_titles.get(cid, cid),
+)
+st.query_params["channel_ids"] = ",".join(channel_ids)
+
+if len(channel_ids) < 2:
+    st.info(f"채널을 2개 이상(최대 {MAX_CHANNELS}개) 골라 주세요.")
+    st.stop()
+
+# 고른 채널들의 스냅샷만 한 번에 모아서 배치 계산 한 번
+if PARTITION_DIR:
+    with profile_section("partition_load") as rec:
+        sel = pd.concat([
+            slice_as_of(load_channel_partition(cid, PARTITION_DIR, partition_file_version(PARTITION_DIR, f"{cid}.csv")), as_of)
+            for cid in channel_ids
+        ])
+        rec["rows"] = len(sel)
+else:
+    data_version = get_data_version("data/processed_data_v2.csv")
+    df = load_processed_data("data/processed_data_v2.csv", data_version)
+    snapshot_index = load_snapshot_index("data/processed_data_v2.csv", data_version)
+    with profile_section("channels_filter", rows=len(df)):
+        sel = get_channels_snapshots(df, snapshot_index, channel_ids, as_of)
+
+with profile_section("compare_channels", rows=len(sel)):
+    result = compare_channels(sel, channel_meta, channel_ids)
+summary = result["summary"]
+if as_of is not None:
+    st.caption(f"🕒 기준 시점: {as_of:%Y-%m-%d %H:%M}")
+if summary.empty:
+    st.warning("선택한 채널의 스냅샷이 없습니다.")
+    st.stop()
+
+labels = summary['channel_title'].to_dict()
+
+# — 나란히 비교 표 —
+table = summary.copy()
+table['link'] = [f"/ChannelDetail?channel_id={cid}" for cid in table.index]
+if as_of is not None:
+    table['link'] += f"&as_of={as_of:%Y-%m-%dT%H:%M:%S}"
+st.dataframe(
+    table,
+    hide_index=True,
+    use_container_width=True,
+    column_config={
+        "channel_title":   st.column_config.TextColumn("채널"),
+        "category":        st.column_config.TextColumn("카테고리"),
+        "subscribers":     st.column_config.NumberColumn("구독자 수", format="localized"),
+        "growth":          st.column_config.NumberColumn("구독자 증가수", format="localized"),
+        "daily_avg":       st.column_config.NumberColumn("30일 일평균 구독자 증가량", format="%.1f"),
+        "long_videos":     st.column_config.NumberColumn("롱폼 수", format="%d"),
+        "short_videos":    st.column_config.NumberColumn("쇼츠 수", format="%d"),
+        "long_avg_views":  st.column_config.NumberColumn("Long-form 평균 조회수", format="localized"),
+        "short_avg_views": st.column_config.NumberColumn("Shorts 평균 조회수", format="localized"),
+        "gain_index":      st.column_config.NumberColumn("Gain Index", format="%.2f", help="롱폼 Gain Score 합"),
+        "max_gain_score":  st.column_config.NumberColumn("최고 Gain Score", format="%.2f"),
+        "link":            st.column_config.LinkColumn("상세", display_text="채널 보기"),
+    },
+)
+
+# — 겹쳐 그린 곡선 —
+curves = result["curves"]
+# 곡선 구간(1~30일차)에 스냅샷이 없는 채널은 curves에 없으므로 summary 순서를 유지한 채 걸러냄
+curve_ids = summary.index[summary.index.isin(curves.index.get_level_values('channel_id'))]
+left, right = st.columns(2)
+with left:
+    render_curve_overlay(
+        curves.loc[(curve_ids, False), :].droplevel('is_short'), labels,
+        "#### :green-badge[Long Form] 공개 이후 평균 조회수"
+    )
+with right:
+    render_curve_overlay(
+        curves.loc[(curve_ids, True), :].droplevel('is_short'), labels,
+        "#### :blue-badge[Short Form] 공개 이후 평균 조회수"
+    )
+
+st.markdown("#### 구독자 수 추이")
+st.line_chart(result["subscribers"].rename(columns=labels), use_container_width=True)
+
+render_profiler_panel(page="Compare")
@@ -0,0 +1,89 @@
+import math
+import streamlit as st
+import pandas as pd
+from utils.data_loader import load_channel_meta, load_video_meta, get_data_version
+from utils.leaderboard import load_leaderboard, leaderboard_page, LEADERBOARD_METRICS, ALL_CATEGORIES
+from utils.chunked import PARTITION_DIR
+from utils.profiler import begin_profiling, profile_section
+from components.profiler_panel import render_profiler_panel
+
+st.set_page_config(
+    page_title="VPI · 리더보드",
+    page_icon="🏆",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+PAGE_SIZE = 20
+RECENT_DAYS = 7
+
+begin_profiling()
+st.metric(value="🏆 영상 리더보드", label="Video Performance Indicator")
+
+if PARTITION_DIR:
+    st.warning("청크 모드(VPI_PARTITION_DIR)에서는 전체 로그를 올리지 않으므로 리더보드를 제공하지 않습니다.")
+    st.stop()
+
+skeleton = st.empty()
+skeleton.info("⏳ 리더보드를 불러오는 중입니다...")
+
+channel_meta = load_channel_meta()
+video_meta = load_video_meta()
+# 처음 한 번 전체 이력으로 만들고, 이후에는 새로 들어온 스냅샷의 채널만 다시 계산해 반영
+board = load_leaderboard(days=RECENT_DAYS, channel_meta=channel_meta, data_version=get_data_version())
+skeleton.empty()
+
+metric_labels = {**LEADERBOARD_METRICS, "views_recent": f"최근 {RECENT_DAYS}일 조회수 증가"}
+
+# — 지표 · 카테고리 · 페이지 선택 —
+c1, c2, c3 = st.columns([3, 2, 1])
+metric = c1.radio("지표", list(LEADERBOARD_METRICS), format_func=metric_labels.get, horizontal=True)
+category = c2.selectbox("카테고리", [ALL_CATEGORIES] + sorted(channel_meta.categories()))
+total = len(board["lists"].get((metric, category), []))
+n_pages = max(math.ceil(total / PAGE_SIZE), 1)
+page = c3.number_input("페이지", min_value=1, max_value=n_pages, value=1, step=1)
+
+with profile_section("leaderboard_page"):
+    ranked, total = leaderboard_page(board, metric, category, page - 1, PAGE_SIZE)
+
+if board["now"] is not None:
+    st.caption(f"총 {total:,}개 영상 · {page}/{n_pages} 페이지 · 기준 시점 {board['now']:%Y-%m-%d %H:%M}")
+
+if ranked.empty:
+    st.info("표시할 영상이 없습니다.")
+    st.stop()
+
+# 보이는 영상·채널 메타만 꺼내 읽음
+videos = video_meta.get_many(ranked.index)
+channels = channel_meta.get_many(ranked['channel_id'].unique())
+table = pd.DataFrame({
+    "rank":      ranked['rank'].to_numpy(),
+    "thumbnail": [videos.get(vid, {}).get("thumbnail_url", "") for vid in ranked.index],
+    "title":     [videos.get(vid, {}).get("title", vid) for vid in ranked.index],
+    "channel":   [channels.get(cid, {}).get('channel_title', cid) for cid in ranked['channel_id']],
+    "channel_link": [f"/ChannelDetail?channel_id={cid}" for cid in ranked['channel_id']],
+    "category":  ranked['category'].to_numpy(),
+    "type":      ranked['is_short'].map({True: "Shorts", False: "Long-form"}).to_numpy(),
+    "value":     ranked['value'].to_numpy(),
+    "link":      "https://www.youtube.com/watch?v=" + ranked.index.to_series().to_numpy(),
+})
+
+value_format = "localized" if metric == "views_recent" else "%.2f"
+st.dataframe(
+    table,
+    hide_index=True,
+    use_container_width=True,
+    column_config={
+        "rank":      st.column_config.NumberColumn("순위", format="%d"),
+        "thumbnail": st.column_config.ImageColumn("썸네일", width="small"),
+        "title":     st.column_config.TextColumn("제목", width="large"),
+        "channel":   st.column_config.TextColumn("채널"),
+        "channel_link": st.column_config.LinkColumn("채널 상세", display_text="채널 보기"),
+        "category":  st.column_config.TextColumn("카테고리"),
+        "type":      st.column_config.TextColumn("유형"),
+        "value":     st.column_config.NumberColumn(metric_labels[metric], format=value_format),
+        "link":      st.column_config.LinkColumn("영상", display_text="보러가기"),
+    },
+)
+
+render_profiler_panel(page="Leaderboard")
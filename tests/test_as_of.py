@@ -0,0 +1,68 @@
+# tests/test_as_of.py
+"""
+as_of 시점 조회 회귀 테스트 (tools/generate_data.py로 만든 가짜 데이터 사용)
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from streamlit.testing.v1 import AppTest
+from tools.generate_data import generate_dataset
+from utils.metrics import get_recent_videos
+
+EARLY_AS_OF = "2020-01-01"  # 모든 스냅샷보다 이른 시점
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    work_dir = tmp_path_factory.mktemp("vpi_as_of")
+    df = generate_dataset(str(work_dir / "data"), n_channels=4, videos_per_channel=5, days=20)
+    return work_dir, df
+
+
+def _run_page(work_dir, page, **params):
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        at = AppTest.from_file(os.path.join(REPO_ROOT, "pages", f"{page}.py"), default_timeout=120)
+        for key, value in params.items():
+            at.query_params[key] = value
+        at.run()
+        return at
+    finally:
+        os.chdir(cwd)
+
+
+def test_category_list_with_as_of_before_first_snapshot(data_dir):
+    work_dir, _ = data_dir
+    at = _run_page(work_dir, "CategoryList", as_of=EARLY_AS_OF)
+    assert not at.exception, at.exception[0].value
+    assert "결과 0명" in [m.label for m in at.metric]
+
+
+def test_channel_detail_with_as_of_before_first_snapshot(data_dir):
+    work_dir, df = data_dir
+    at = _run_page(work_dir, "ChannelDetail", channel_id=df['channel_id'].iloc[0], as_of=EARLY_AS_OF)
+    assert not at.exception, at.exception[0].value
+    assert at.warning
+
+
+def test_get_recent_videos_keeps_future_published_without_as_of():
+    now = pd.Timestamp.now().floor("min")
+    df = pd.DataFrame({
+        "timestamp": [now - pd.Timedelta(days=2)] * 2,
+        "video_id": ["past", "future"],
+        "published_at": [f"{now - pd.Timedelta(days=3):%Y-%m-%dT%H:%M:%S}Z",
+                         f"{now + pd.Timedelta(days=3):%Y-%m-%dT%H:%M:%S}Z"],
+    })
+    # as_of 없이는 예전처럼 공개 시각 상한 없이 최근 days일
+    assert set(get_recent_videos(df, days=10)["video_id"]) == {"past", "future"}
+    # as_of가 있으면 그 시점 이후 공개된 영상은 빠짐
+    as_of = now - pd.Timedelta(days=1)
+    assert set(get_recent_videos(df, days=10, as_of=as_of)["video_id"]) == {"past"}
@@ -0,0 +1,63 @@
+# tests/test_chunked.py
+"""
+청크 모드(utils/chunked.py) 회귀 테스트: 샤드가 겹쳐도 load_processed_data와 같은 결과인지
+
+    python -m pytest -q tests
+"""
+import json
+import os
+import sys
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.generate_data import generate_dataset
+from utils.chunked import build_partitions, load_channel_partition, METRICS_DIR
+from utils.data_loader import load_processed_data
+from utils.metrics import channel_view_stats, get_subscriber_metrics, avg_views, avg_view_by_days_since_published, add_day_since_pub
+
+
+@pytest.fixture(scope="module")
+def overlapping(tmp_path_factory):
+    work_dir = tmp_path_factory.mktemp("vpi_chunked")
+    df = generate_dataset(str(work_dir / "data"), n_channels=3, videos_per_channel=4, days=12)
+    src = pd.read_csv(work_dir / "data" / "processed_data_v2.csv")
+    shard_dir = work_dir / "shards"
+    shard_dir.mkdir()
+    # 샤드 3개, 각 샤드가 다음 샤드의 앞부분 20%를 한 번 더 가짐
+    n = len(src)
+    for i in range(3):
+        src.iloc[i * n // 3: min(n, (i + 1) * n // 3 + n // 5)].to_csv(shard_dir / f"s{i}.csv", index=False)
+    partition_dir = str(work_dir / "partitions")
+    summary = build_partitions(str(shard_dir), partition_dir, max_memory_mb=1)
+    return load_processed_data(str(shard_dir)), summary, partition_dir
+
+
+def test_summary_matches_deduplicated_log(overlapping):
+    df, summary, _ = overlapping
+    g = df.sort_values('timestamp', kind='stable').groupby('channel_id')
+    expected = pd.DataFrame({
+        'subscriber_count': g['subscriber_count'].last(),
+        'subs_diff': g['subscriber_count'].last() - g['subscriber_count'].first(),
+    }).join(channel_view_stats(df))
+    pd.testing.assert_frame_equal(summary[expected.columns], expected, check_names=False, check_dtype=False)
+
+
+def test_stored_metrics_match_channel_functions(overlapping):
+    df, summary, partition_dir = overlapping
+    for cid in summary.index:
+        ch_df = df[df['channel_id'] == cid].reset_index(drop=True)
+        assert len(load_channel_partition(cid, partition_dir)) == len(ch_df)
+        with open(os.path.join(partition_dir, METRICS_DIR, f"{cid}.json"), encoding="utf-8") as f:
+            stored = json.load(f)
+
+        assert stored["subscribers"] == pytest.approx([float(v) for v in get_subscriber_metrics(ch_df, 30)])
+        assert stored["avg_views"]["long"] == pytest.approx(avg_views(ch_df, 10, False))
+        assert stored["avg_views"]["short"] == pytest.approx(avg_views(ch_df, 10, True))
+        ch_df = add_day_since_pub(ch_df)
+        _, result_L = avg_view_by_days_since_published(ch_df, 30, False)
+        _, result_S = avg_view_by_days_since_published(ch_df, 30, True)
+        assert stored["curves"]["long"] == result_L['avg_view_count'].tolist()
+        assert stored["curves"]["short"] == result_S['avg_view_count'].tolist()
@@ -0,0 +1,39 @@
+# tests/test_compaction.py
+"""
+스냅샷 압축(utils/compaction.py) 회귀 테스트: 압축 전/후 지표가 비트 단위로 같은지
+
+    python -m pytest -q tests
+"""
+import json
+import os
+import sys
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.generate_data import generate_dataset
+from utils.compaction import compact_snapshots, verify_compaction, NOT_PRESERVED
+from utils.data_loader import load_snapshot_shards
+
+
+@pytest.fixture(scope="module")
+def snapshots(tmp_path_factory):
+    # 압축 대상이 생기도록 age_days(30일)보다 긴 이력
+    data_dir = tmp_path_factory.mktemp("vpi_compaction") / "data"
+    generate_dataset(str(data_dir), n_channels=3, videos_per_channel=4, days=90)
+    df, _ = load_snapshot_shards(str(data_dir / "processed_data_v2.csv"))
+    with open(data_dir / "channel_meta.json", "r", encoding="utf-8-sig") as f:
+        meta = json.load(f)
+    return df, meta
+
+
+def test_compaction_keeps_metrics_identical(snapshots):
+    df, meta = snapshots
+    compacted = compact_snapshots(df, age_days=30)
+    assert len(compacted) < len(df)
+
+    checks = verify_compaction(df, compacted, channel_meta=meta)
+    assert {"avg_views", "category_cube", "category_subs"} <= set(checks)
+    assert not set(NOT_PRESERVED) & set(checks)
+    assert all(checks.values()), [name for name, ok in checks.items() if not ok]
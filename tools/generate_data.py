@@ -0,0 +1,122 @@
+# tools/generate_data.py
+"""
+부하 테스트/벤치마크용 가짜 데이터 생성기
+
+data/processed_data_v2.csv, channel_meta.json, video_meta.json과 같은 형식의 파일을
+out_dir 아래에 만들고, 메타 저장소(utils/meta_store.py)도 컴파일해 둔다.
+조회수는 포화 곡선 V(t) = K(1 - e^(-t/τ)) 모양으로 증가한다.
+
+    python -m tools.generate_data /tmp/vpi_data --channels 20 --videos 30 --days 45
+"""
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+from utils.meta_store import compile_meta_store
+
+CATEGORIES = ["IT & Tech", "Game", "Food", "Music", "Travel"]
+
+
+def generate_dataset(
+    out_dir: str,
+    n_channels: int = 10,
+    videos_per_channel: int = 20,
+    days: int = 45,
+    snaps_per_day: int = 4,
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    out_dir/processed_data_v2.csv, channel_meta.json, video_meta.json 생성 후
+    스냅샷 DataFrame 반환
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    start = pd.Timestamp("2025-06-01 00:00")
+    stamps = [start + pd.Timedelta(hours=24 / snaps_per_day * i) for i in range(days * snaps_per_day)]
+    channel_meta, video_meta, frames = {}, {}, []
+
+    for c in range(n_channels):
+        channel_id = f"UC{c:04d}GENERATED"
+        category = CATEGORIES[c % len(CATEGORIES)]
+        subs0 = int(rng.integers(10_000, 2_000_000))
+        subs_rate = float(rng.uniform(10, 2_000))  # 하루 구독자 증가량
+
+        channel_meta[channel_id] = {
+            "channel_title": f"테스트 채널 {c}",
+            "channel_description": f"부하 테스트용 채널 {c}",
+            "profile_image": "",
+            "banner_image": "",
+            "handle": f"@test{c}",
+            "category": category,
+            "video_count": videos_per_channel,
+            "total_view_count": subs0 * 300,
+            "join_date": "2016-08-07T10:23:41Z",
+        }
+
+        ts = pd.Series(stamps)
+        elapsed_days = np.arange(len(stamps)) / snaps_per_day
+        subs = (subs0 + subs_rate * elapsed_days + rng.normal(0, subs_rate / 4, len(stamps))).astype(int)
+
+        for v in range(videos_per_channel):
+            video_id = f"{channel_id}_v{v:04d}"
+            published = start - pd.Timedelta(days=10) + pd.Timedelta(hours=float(rng.uniform(0, (days + 5) * 24)))
+            is_short = bool(rng.random() < 0.4)
+            k, tau = float(rng.uniform(1e3, 1e6)), float(rng.uniform(1, 8))
+
+            # published_at은 실제 데이터처럼 ISO(Z, UTC) / 단순 형식(Asia/Seoul)을 섞어서 저장
+            if v % 2:
+                published_at = (published - pd.Timedelta(hours=9)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            else:
+                published_at = published.strftime("%Y-%m-%d %H:%M")
+
+            video_meta[video_id] = {
+                "title": f"테스트 영상 {v}",
+                "published_at": published_at,
+                "thumbnail_url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+                "is_short": is_short,
+            }
+
+            alive = ts >= published
+            t = (ts[alive] - published).dt.total_seconds().to_numpy() / 86400
+            views = (k * (1 - np.exp(-t / tau)) + rng.integers(0, 10, len(t))).astype(int)
+            frames.append(pd.DataFrame({
+                "timestamp": ts[alive].dt.strftime("%Y-%m-%d %H:%M:%S").to_numpy(),
+                "channel_id": channel_id,
+                "video_id": video_id,
+                "published_at": published_at,
+                "view_count": views,
+                "like_count": views // 50,
+                "comment_count": views // 500,
+                "subscriber_count": subs[alive.to_numpy()],
+                "is_short": is_short,
+                "category": category,
+                "video_title": f"테스트 영상 {v}",
+                "thumbnail_url": video_meta[video_id]["thumbnail_url"],
+            }))
+
+    df = pd.concat(frames, ignore_index=True).sort_values("timestamp", kind="stable")
+    df.to_csv(os.path.join(out_dir, "processed_data_v2.csv"), index=False, encoding="utf-8-sig")
+    with open(os.path.join(out_dir, "channel_meta.json"), "w", encoding="utf-8") as f:
+        json.dump(channel_meta, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(out_dir, "video_meta.json"), "w", encoding="utf-8") as f:
+        json.dump(video_meta, f, ensure_ascii=False, indent=2)
+    # 페이지는 컴파일된 메타 저장소만 읽으므로 적재 단계처럼 미리 만들어 둠
+    for name in ("channel_meta.json", "video_meta.json"):
+        compile_meta_store(os.path.join(out_dir, name))
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VPI 가짜 데이터 생성")
+    parser.add_argument("out_dir")
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--days", type=int, default=45)
+    parser.add_argument("--snaps-per-day", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = generate_dataset(args.out_dir, args.channels, args.videos, args.days, args.snaps_per_day, args.seed)
+    print(f"{len(df):,}행 생성 → {args.out_dir}")
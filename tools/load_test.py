@@ -0,0 +1,197 @@
+# tools/load_test.py
+"""
+동시 세션 부하 테스트 (네트워크 없이 Streamlit AppTest로 페이지를 직접 실행)
+
+세션 하나 = AppTest 인스턴스 하나 = 프로세스 하나.
+(AppTest는 프로세스에 하나뿐인 Streamlit Runtime을 띄웠다 내리므로 한 프로세스에서 여러 세션을 동시에 돌리면 서로 충돌함)
+각 세션은 CategoryList에서 검색어 입력·카테고리 pills 변경·정렬 변경을 하고,
+ChannelDetail로 채널을 옮겨 다니며 탭별 정렬을 바꾼다.
+세션 수를 늘려가며 rerun 지연(p50/p95/p99), 처리량, 세션 프로세스 메모리를 출력한다.
+세션 안에서 난 예외는 errors로 세고, rerun 수가 계획보다 적은 실행은 표시한 뒤 종료 코드 1로 끝낸다.
+
+    python -m tools.load_test --sessions 1 4 16 --channels 10 --videos 20
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from streamlit.testing.v1 import AppTest
+from tools.generate_data import generate_dataset
+
+CATEGORY_PAGE = os.path.join(REPO_ROOT, "pages", "CategoryList.py")
+DETAIL_PAGE = os.path.join(REPO_ROOT, "pages", "ChannelDetail.py")
+SEARCH_TEXT = "테스트 채널"
+DETAIL_TABS = ["전체영상", "롱폼", "쇼츠"]
+DETAIL_SORTS = ["조회수순", "기여도순"]
+
+
+def expected_reruns(n_channels: int) -> int:
+    """
+    세션 하나가 끝까지 돌았을 때의 rerun 수 (run_session의 동작 순서와 맞춰야 함)
+    """
+    category = 1 + len(SEARCH_TEXT) + 1 + 1 + 1       # 첫 진입, 글자 입력, 검색어 지움, pills, 정렬
+    detail = 1 + len(DETAIL_TABS) * len(DETAIL_SORTS)  # 채널 진입, 탭별 정렬
+    return category + min(2, n_channels) * detail
+
+
+def _timed_run(at: AppTest, latencies: list, errors: list):
+    started = time.perf_counter()
+    at.run()
+    latencies.append(time.perf_counter() - started)
+    if at.exception:
+        errors.append(str(at.exception[0].value))
+    return at
+
+
+def run_session(session_no: int, channel_ids: list, categories: list,
+                latencies: list, errors: list, timeout: float):
+    """
+    한 명의 사용자가 하는 일련의 동작을 재현
+    - 도중에 예외가 나면 errors에 남기고 그 세션을 끝냄 (남은 rerun은 빠지므로 expected_reruns보다 적어짐)
+    """
+    rng = np.random.default_rng(session_no)
+    try:
+        # 1) CategoryList: 첫 진입 → 검색어 한 글자씩 입력 → pills 변경 → 정렬 변경
+        at = AppTest.from_file(CATEGORY_PAGE, default_timeout=timeout)
+        _timed_run(at, latencies, errors)
+        query = ""
+        for ch in SEARCH_TEXT:
+            query += ch
+            at.text_input(key="search_query").input(query)
+            _timed_run(at, latencies, errors)
+        at.text_input(key="search_query").input("")
+        _timed_run(at, latencies, errors)
+
+        cat = categories[rng.integers(len(categories))]
+        at.button_group(key="selected_cats").set_value([cat])
+        _timed_run(at, latencies, errors)
+        sb = next(sb for sb in at.selectbox if sb.label == "정렬 기준")
+        sb.select(sb.options[rng.integers(len(sb.options))])
+        _timed_run(at, latencies, errors)
+
+        # 2) ChannelDetail: 채널 두 개를 옮겨 다니며 탭별 정렬 변경
+        for channel_id in rng.choice(channel_ids, size=min(2, len(channel_ids)), replace=False):
+            at = AppTest.from_file(DETAIL_PAGE, default_timeout=timeout)
+            at.query_params["channel_id"] = channel_id
+            _timed_run(at, latencies, errors)
+            if at.exception:
+                continue
+            for tab_name in DETAIL_TABS:
+                for sort_option in DETAIL_SORTS:
+                    at.selectbox(key=f"sort-{tab_name}").select(sort_option)
+                    _timed_run(at, latencies, errors)
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+
+
+def _session_process(session_no: int, channel_ids: list, categories: list, timeout: float, barrier, results):
+    # 세션 프로세스: 모든 세션이 import를 마칠 때까지 기다렸다가 동시에 시작
+    latencies, errors = [], []
+    barrier.wait()
+    started = time.time()
+    run_session(session_no, channel_ids, categories, latencies, errors, timeout)
+    results.put({
+        "latencies": latencies,
+        "errors": errors,
+        "started": started,
+        "finished": time.time(),
+        "rss_mb": _rss_mb(),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def _rss_mb() -> float:
+    # 현재 RSS (Linux /proc 기준, 없으면 최대 RSS로 대체)
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_load_test(n_sessions: int, channel_ids: list, categories: list, timeout: float = 120) -> dict:
+    """
+    세션 n_sessions개를 각각 별도 프로세스로 동시에 돌려 결과를 모음
+    - rss_mb / max_rss_mb: 세션 프로세스들의 RSS 합 / 가장 큰 프로세스의 최대 RSS
+    """
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(n_sessions)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_session_process, args=(i, channel_ids, categories, timeout, barrier, results))
+        for i in range(n_sessions)
+    ]
+    for p in procs:
+        p.start()
+    # 프로세스가 끝나기 전에 큐를 비워야 큰 결과를 넣은 자식이 막히지 않음
+    reports = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    latencies = [lat for r in reports for lat in r["latencies"]]
+    errors = [e for r in reports for e in r["errors"]]
+    wall = max(r["finished"] for r in reports) - min(r["started"] for r in reports)
+    lat_ms = np.array(latencies) * 1000 if latencies else np.array([np.nan])
+    expected = n_sessions * expected_reruns(len(channel_ids))
+    return {
+        "sessions": n_sessions,
+        "reruns": len(latencies),
+        "expected": expected,
+        "complete": len(latencies) >= expected,
+        "p50_ms": np.percentile(lat_ms, 50),
+        "p95_ms": np.percentile(lat_ms, 95),
+        "p99_ms": np.percentile(lat_ms, 99),
+        "reruns_per_s": len(latencies) / wall if wall > 0 else 0.0,
+        "rss_mb": sum(r["rss_mb"] for r in reports),
+        "max_rss_mb": max(r["max_rss_mb"] for r in reports),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else "",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VPI Streamlit 페이지 동시 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    # 페이지들이 상대경로 data/...를 읽으므로 임시 디렉터리에 데이터를 만들고 그곳으로 이동
+    work_dir = tempfile.mkdtemp(prefix="vpi_load_")
+    df = generate_dataset(os.path.join(work_dir, "data"), args.channels, args.videos, args.days)
+    os.chdir(work_dir)
+
+    channel_ids = sorted(df["channel_id"].unique())
+    categories = sorted(df["category"].unique())
+    print(f"데이터: {len(df):,}행, 채널 {len(channel_ids)}개 ({work_dir})")
+    print(f"{'sessions':>8} {'reruns':>11} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} "
+          f"{'rerun/s':>8} {'rss_mb':>8} {'max_rss':>8} {'errors':>6}")
+
+    failed = False
+    for n in args.sessions:
+        r = run_load_test(n, channel_ids, categories, args.timeout)
+        reruns = f"{r['reruns']}/{r['expected']}"
+        print(f"{r['sessions']:>8} {reruns:>11} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} "
+              f"{r['reruns_per_s']:>8.2f} {r['rss_mb']:>8.1f} {r['max_rss_mb']:>8.1f} {r['errors']:>6}")
+        if not r["complete"]:
+            print(f"  ⚠ rerun {r['expected'] - r['reruns']}회가 빠짐 → 이 줄의 지연·처리량은 중간에 끊긴 데이터")
+        if r["errors"]:
+            print(f"  첫 번째 오류: {r['first_error']}")
+        failed |= bool(r["errors"]) or not r["complete"]
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# tools/startup_bench.py
+"""
+시작 시간 예산 테스트
+
+1) import 시간: utils/·components/의 모듈과 pages/가 import하는 모듈을 새 파이썬 프로세스에서 import하는 데 걸린 시간
+   (import만으로 matplotlib/plotly/requests가 올라오면 실패)
+2) 첫 렌더 시간: 캐시가 비어 있는 상태에서 AppTest로 각 페이지를 처음 실행하는 데 걸린 시간
+   (CategoryDashboard용 큐브는 가짜 데이터로 미리 만들어 두고 시간에서 뺌)
+
+예산을 넘으면 종료 코드 1로 끝나므로 CI에서 그대로 쓸 수 있다.
+
+    python -m tools.startup_bench --import-budget-ms 3000 --render-budget-ms 8000
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+IMPORT_BUDGET_MS = float(os.environ.get("VPI_IMPORT_BUDGET_MS", 3000))
+RENDER_BUDGET_MS = float(os.environ.get("VPI_RENDER_BUDGET_MS", 8000))
+
+PAGE_DIRS = ["utils", "components"]
+# 차트를 실제로 그리기 전에는 올라오면 안 되는 무거운 모듈
+DEFERRED_MODULES = ["matplotlib", "plotly", "requests"]
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import streamlit
+base = time.perf_counter()
+# streamlit 자체가 이미 올린 모듈은 페이지 모듈 탓이 아니므로 제외
+preloaded = [m for m in {deferred!r} if m in sys.modules]
+for name in {modules!r}:
+    __import__(name)
+done = time.perf_counter()
+print(json.dumps({{
+    "streamlit_ms": (base - started) * 1000,
+    "modules_ms": (done - base) * 1000,
+    "loaded_heavy": [m for m in {deferred!r} if m in sys.modules and m not in preloaded],
+}}))
+"""
+
+
+def page_modules() -> list:
+    """
+    import 시간을 잴 모듈 목록 (새 모듈을 추가해도 목록을 고칠 필요 없도록 디렉터리를 훑어서 만듦)
+    - utils/, components/ 의 모든 모듈
+    - pages/*.py 가 top-level에서 import하는 저장소 모듈 (페이지 자체는 import하면 실행되므로 제외)
+    """
+    modules = []
+    for package in PAGE_DIRS:
+        for path in sorted(glob.glob(os.path.join(REPO_ROOT, package, "*.py"))):
+            modules.append(f"{package}.{os.path.splitext(os.path.basename(path))[0]}")
+    for path in sorted(glob.glob(os.path.join(REPO_ROOT, "pages", "*.py"))):
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in tree.body:
+            names = [a.name for a in node.names] if isinstance(node, ast.Import) else (
+                [node.module] if isinstance(node, ast.ImportFrom) and node.module else []
+            )
+            modules += [n for n in names if n.split(".")[0] in PAGE_DIRS]
+    return list(dict.fromkeys(modules))
+
+
+def measure_import() -> dict:
+    code = _IMPORT_PROBE.format(modules=page_modules(), deferred=DEFERRED_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure_first_render(channels: int, videos: int, days: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+    from tools.generate_data import generate_dataset
+    from utils.data_loader import load_snapshot_shards
+    from utils.rollup import (
+        build_category_cube, build_day_n_histogram, build_category_subs, CUBE_PATH, CUBE_HIST_PATH, CUBE_SUBS_PATH
+    )
+    from utils.upload_timing import build_timing_cube, TIMING_CUBE_PATH
+
+    work_dir = tempfile.mkdtemp(prefix="vpi_startup_")
+    df = generate_dataset(os.path.join(work_dir, "data"), channels, videos, days)
+    os.chdir(work_dir)
+
+    # 적재 시점 산출물 (페이지 첫 렌더 시간에는 넣지 않음)
+    snapshots, _ = load_snapshot_shards("data/processed_data_v2.csv")
+    with open("data/channel_meta.json", "r", encoding="utf-8-sig") as f:
+        meta = json.load(f)
+    build_category_cube(snapshots, meta).to_csv(CUBE_PATH, index=False, encoding="utf-8")
+    build_day_n_histogram(snapshots, meta).to_csv(CUBE_HIST_PATH, index=False, encoding="utf-8")
+    build_category_subs(snapshots, meta).to_csv(CUBE_SUBS_PATH, index=False, encoding="utf-8")
+    build_timing_cube(snapshots, meta).to_csv(TIMING_CUBE_PATH, index=False, encoding="utf-8")
+
+    channel_ids = list(dict.fromkeys(df["channel_id"]))
+    results = {}
+    for page, params in [
+        ("CategoryList", {}),
+        ("ChannelDetail", {"channel_id": channel_ids[0]}),
+        ("CategoryDashboard", {}),
+        ("Leaderboard", {}),
+        ("Compare", {"channel_ids": ",".join(channel_ids[:3])}),
+    ]:
+        at = AppTest.from_file(os.path.join(REPO_ROOT, "pages", f"{page}.py"), default_timeout=120)
+        for key, value in params.items():
+            at.query_params[key] = value
+        started = time.perf_counter()
+        at.run()
+        results[page] = (time.perf_counter() - started) * 1000
+        if at.exception:
+            raise RuntimeError(f"{page} 렌더링 실패: {at.exception[0].value}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VPI 시작 시간 예산 테스트")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--render-budget-ms", type=float, default=RENDER_BUDGET_MS)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    failures = []
+
+    imp = measure_import()
+    print(f"import: streamlit {imp['streamlit_ms']:.0f} ms + 페이지 모듈 {imp['modules_ms']:.0f} ms")
+    if imp["modules_ms"] > args.import_budget_ms:
+        failures.append(f"페이지 모듈 import {imp['modules_ms']:.0f} ms > 예산 {args.import_budget_ms:.0f} ms")
+    if imp["loaded_heavy"]:
+        failures.append(f"import만으로 무거운 모듈이 올라옴: {', '.join(imp['loaded_heavy'])}")
+
+    for page, ms in measure_first_render(args.channels, args.videos, args.days).items():
+        print(f"첫 렌더: {page} {ms:.0f} ms")
+        if ms > args.render_budget_ms:
+            failures.append(f"{page} 첫 렌더 {ms:.0f} ms > 예산 {args.render_budget_ms:.0f} ms")
+
+    if failures:
+        print("\n".join(["❌ 시작 시간 예산 초과"] + [f"  - {f}" for f in failures]))
+        sys.exit(1)
+    print("✅ 시작 시간 예산 통과")
+
+
+if __name__ == "__main__":
+    main()
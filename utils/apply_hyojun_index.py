@@ -3,20 +3,24 @@ import numpy as np
 import pandas as pd
 import streamlit as st
 from utils.metrics import parse_published_at
+from utils.data_loader import slice_as_of
+from utils.profiler import profiled
 
 def compute_channel_gain_index(
     channel_df: pd.DataFrame,
     r0: float = 0.01,
     days: int = 10, 
-    daily_avg: float = None
+    daily_avg: float = None,
+    as_of=None
 ) -> float:
     """
     채널 전체의 보정 전환 기여도 (GainIndex_chan) 계산.
     - 기대전환율 r0는 외부에서 주입된 값(예: (end_subs/total_views)/ln(end_subs+c))
     - 실제전환율 r_d는 기간 내 구독자 증가량 ΔS_d / 기간 내 조회수 V_d
+    - as_of: 이 시점까지의 스냅샷만 사용 (None이면 최신)
     """
     # 1) timestamp 기준 오름차순 보장
-    df = channel_df.sort_values('timestamp')
+    df = slice_as_of(channel_df.sort_values('timestamp'), as_of)
 
     # 2) 기간 내 조회수 변화량 집계
     views_series = aggregate_views_within_days(df, days=days)
@@ -51,16 +55,21 @@ def compute_channel_gain_index(
     return GainIndex_chan
 
 
+@profiled()
 def aggregate_views_within_days( #조회수 변화량을 영상별로 집계 (10일 경과 시점 고정)
     channel_df: pd.DataFrame,
-    days: int = 10
+    days: int = 10,
+    as_of=None
 ) -> pd.Series:
     """
     업로드일로부터 최대 'days'일 이내의 조회수 변화량을
     video_id별로 계산해 반환.
     - 10일 초과 영상: published_at + days 시점 스냅샷을 고정 사용
     - 최근 영상(10일 미만): 최신 스냅샷 사용
+    - as_of: 이 시점까지의 스냅샷만 사용 (None이면 최신)
     """
+    if as_of is not None:
+        channel_df = slice_as_of(channel_df.sort_values('timestamp'), as_of)
     df = channel_df.copy()
     # datetime 타입 보장
     df['published_at'] = parse_published_at(df['published_at'])
@@ -98,12 +107,14 @@ def aggregate_views_within_days( #조회수 변화량을 영상별로 집계 (10
     return delta_views.rename("delta_views")
 
 
+@profiled()
 def compute_video_gain_scores(
     channel_df: pd.DataFrame,
     end_subs: int,
     total_views: int,
     c: float = 100.0,
-    days: int = 10
+    days: int = 10,
+    as_of=None
 ) -> pd.DataFrame:
     """
     쇼츠 영상을 배제하고 롱폼 영상 기준으로 채널 GainIndex를 계산한 뒤,
@@ -116,12 +127,15 @@ def compute_video_gain_scores(
     - total_views: 기간 내 전체 조회수 합 (롱폼 기반 계산을 위해 재계산됨)
     - c: 로그 안정화 상수
     - days: 계산 기준 기간 (일)
+    - as_of: 이 시점까지의 스냅샷만 사용 (None이면 최신)
 
     Returns:
     DataFrame with columns ['video_id', 'gain_score']
       - gain_score: 롱폼 영상에만 실수 값, 쇼츠는 None
     """
     # 1) 롱폼 영상만 필터링
+    if as_of is not None:
+        channel_df = slice_as_of(channel_df.sort_values('timestamp'), as_of)
     long_df = channel_df[channel_df['is_short'] == False].copy()
 
     # 2) 기준 전환율 r0 설정: (end_subs/total_views) / ln(end_subs + c)
@@ -162,3 +176,65 @@ def compute_video_gain_scores(
 
     # 8) 반환: ['video_id', 'gain_score'] 형태
     return result_df[['video_id', 'gain_score']]
+
+
+@profiled()
+def compute_video_gain_scores_batch(
+    df: pd.DataFrame,
+    end_subs: pd.Series,
+    total_views: pd.Series,
+    c: float = 100.0,
+    days: int = 10
+) -> pd.DataFrame:
+    """
+    여러 채널의 compute_video_gain_scores를 채널 루프 없이 한 번에 계산.
+    영상별 조회수 변화량은 aggregate_views_within_days 한 번으로 구하고,
+    채널 단위 값(r0, 기간 내 구독자 증가량, GainIndex_chan)은 groupby로 계산합니다.
+
+    Parameters:
+    - df: 여러 채널의 시계열 데이터 (channel_id 포함)
+    - end_subs: channel_id → 기간 종료 시점 누적 구독자 수
+    - total_views: channel_id → 채널 총 조회수 (channel_meta의 total_view_count)
+    - c, days: compute_video_gain_scores와 같음
+
+    Returns:
+    DataFrame with columns ['channel_id', 'video_id', 'gain_score'] (쇼츠는 None)
+    """
+    long_df = df[df['is_short'] == False].sort_values('timestamp', kind='stable')
+
+    # 1) 채널별 기준 전환율 r0 = (end_subs/total_views) / ln(end_subs + c)
+    end_subs = end_subs.astype(float)
+    total_views = total_views.reindex(end_subs.index).astype(float)
+    r0 = ((end_subs / total_views) / np.log(end_subs + c)).where(total_views > 0, 0.0)
+
+    # 2) 롱폼 영상 조회수 변화량 → 채널별 합계
+    video_channel = long_df.drop_duplicates('video_id').set_index('video_id')['channel_id']
+    if long_df.empty:
+        views_series = pd.Series(dtype=float)
+    else:
+        views_series = aggregate_views_within_days(long_df, days=days)
+    views_channel = video_channel.reindex(views_series.index)
+    total_in_days = views_series.groupby(views_channel).sum()
+
+    # 3) 채널별 기간 내 구독자 증가량 ΔS (롱폼 스냅샷 기준, 2개 미만이면 0)
+    cutoff = long_df.groupby('channel_id')['timestamp'].transform('max') - timedelta(days=days)
+    recent = long_df[long_df['timestamp'] >= cutoff].groupby('channel_id')['subscriber_count']
+    delta_subs = (recent.last() - recent.first()).where(recent.size() >= 2, 0)
+
+    # 4) GainIndex_chan = (ΔS / V_d) / r0
+    total_in_days = total_in_days.reindex(end_subs.index).fillna(0.0)
+    delta_subs = delta_subs.reindex(end_subs.index).fillna(0)
+    actual_rate = (delta_subs / total_in_days.where(total_in_days > 0)).fillna(0.0)
+    gain_chan = (actual_rate / r0.where(r0 > 0)).fillna(0.0)
+
+    # 5) 영상별 Gain Score = GainIndex_chan × 조회수 비중
+    channel_total = views_channel.map(total_in_days)
+    weights = (views_series / channel_total.where(channel_total > 0)).fillna(views_series * 0.0)
+    gain_scores = views_channel.map(gain_chan) * weights
+
+    # 6) 전체 영상 리스트와 합치기 (쇼츠는 None)
+    result_df = df[['channel_id', 'video_id', 'is_short']].drop_duplicates(subset='video_id').copy()
+    result_df['gain_score'] = result_df['video_id'].map(gain_scores.to_dict())
+    result_df.loc[result_df['is_short'], 'gain_score'] = None
+    return result_df[['channel_id', 'video_id', 'gain_score']].reset_index(drop=True)
+
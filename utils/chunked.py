@@ -0,0 +1,249 @@
+# utils/chunked.py
+"""
+메모리에 다 올라가지 않는 스냅샷 로그를 위한 청크 처리 모드
+
+  1) 로그를 정해진 메모리 안에서 청크 단위로 읽으면서 행을 채널별 파티션 파일(partition_dir/<channel_id>.csv)로 나눠 쓰고
+  2) 파티션을 하나씩 다시 읽어 (video_id, timestamp) 중복을 없앤 뒤(샤드가 겹쳐도 됨)
+     채널 요약용 부분 집계·급상승 상태와 채널 지표(partition_dir/_metrics/<channel_id>.json)를 계산해 저장한다.
+이후 CategoryList는 요약 파일만, ChannelDetail은 자기 채널 파티션과 지표 파일만 읽는다.
+메모리: 1) 청크 하나, 2) 가장 큰 채널 파티션 하나 + 채널 수에 비례하는 부분 집계/급상승 상태
+
+    python -m utils.chunked data/processed_data_v2.csv data/partitions --max-memory-mb 128 --channel-meta data/channel_meta.json
+
+페이지에서 쓰려면 VPI_PARTITION_DIR=data/partitions 로 실행한다.
+"""
+import argparse
+import json
+import os
+import shutil
+import pandas as pd
+import streamlit as st
+from utils.data_loader import _resolve_shard_paths, _fill_thumbnails, get_data_version
+from utils.metrics import add_day_since_pub, avg_view_curves_by_channel, avg_views_batch, get_subscriber_metrics_batch
+from utils.apply_hyojun_index import compute_video_gain_scores_batch
+from utils.surge import replay_surge_state, DEFAULT_ALPHA
+
+# 청크 하나가 쓸 수 있는 최대 메모리 (MB)
+MAX_MEMORY_MB = int(os.environ.get("VPI_MAX_MEMORY_MB", 256))
+# 파티션 디렉터리 (설정되어 있으면 페이지들이 청크 모드 산출물을 사용)
+PARTITION_DIR = os.environ.get("VPI_PARTITION_DIR")
+
+SUMMARY_FILE = "_channel_summary.csv"
+METRICS_DIR = "_metrics"
+# 청크를 읽은 뒤 집계·분할하면서 생기는 복사본까지 감안한 여유 배수
+_WORKING_SET_FACTOR = 4
+
+
+def estimate_chunk_rows(path: str, max_memory_mb: int = MAX_MEMORY_MB, sample_rows: int = 2000) -> int:
+    """
+    앞부분 sample_rows행의 실제 메모리 사용량으로 행당 바이트를 추정해
+    max_memory_mb 안에 들어가는 청크 행 수 계산
+    """
+    sample = pd.read_csv(path, encoding='utf-8-sig', on_bad_lines='skip', nrows=sample_rows)
+    bytes_per_row = max(sample.memory_usage(deep=True).sum() / max(len(sample), 1), 1)
+    return max(int(max_memory_mb * 1024 ** 2 / (bytes_per_row * _WORKING_SET_FACTOR)), 1000)
+
+
+def iter_snapshot_chunks(path: str, max_memory_mb: int = MAX_MEMORY_MB):
+    """
+    단일 CSV/샤드 디렉터리/glob 패턴을 메모리 한도 안의 청크로 순서대로 읽음
+    """
+    for shard in _resolve_shard_paths(path):
+        chunk_rows = estimate_chunk_rows(shard, max_memory_mb)
+        reader = pd.read_csv(shard, encoding='utf-8-sig', on_bad_lines='skip', chunksize=chunk_rows)
+        for chunk in reader:
+            chunk['timestamp'] = pd.to_datetime(chunk['timestamp'])
+            yield chunk
+
+
+def _dedupe_snapshots(df: pd.DataFrame) -> pd.DataFrame:
+    # load_processed_data와 같은 중복 제거·정렬 (같은 영상·시각은 나중 행 우선)
+    return (
+        df.drop_duplicates(subset=['video_id', 'timestamp'], keep='last')
+          .sort_values('timestamp', kind='stable')
+          .reset_index(drop=True)
+    )
+
+
+def _partial_channel_summary(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    청크 하나의 채널별 부분 집계 (서로 합칠 수 있는 값만)
+    - 합계·개수는 그대로 더해지므로 부분 집계끼리 (video_id, timestamp)가 겹치면 안 됨
+      (build_partitions는 중복을 없앤 채널 파티션 단위로 만듦)
+    """
+    chunk = chunk.sort_values('timestamp', kind='stable')
+    g = chunk.groupby('channel_id')
+    return pd.DataFrame({
+        'first_ts':   g['timestamp'].first(),
+        'first_subs': g['subscriber_count'].first(),
+        'last_ts':    g['timestamp'].last(),
+        'last_subs':  g['subscriber_count'].last(),
+        'view_sum':   g['view_count'].sum(),
+        'view_n':     g['view_count'].count(),
+        'short_sum':  g['is_short'].sum(),
+        'short_n':    g['is_short'].count(),
+    })
+
+
+def merge_channel_summaries(partials: list) -> pd.DataFrame:
+    """
+    부분 집계들을 하나로 합침 (처음/마지막 값은 시각 기준, 합계·개수는 더함)
+    """
+    allp = pd.concat(partials)
+    first = allp.sort_values('first_ts', kind='stable').groupby(level=0)[['first_ts', 'first_subs']].first()
+    last = allp.sort_values('last_ts', kind='stable').groupby(level=0)[['last_ts', 'last_subs']].last()
+    sums = allp.groupby(level=0)[['view_sum', 'view_n', 'short_sum', 'short_n']].sum()
+    return first.join(last).join(sums)
+
+
+def finalize_channel_summary(merged: pd.DataFrame, surge_state: dict = None) -> pd.DataFrame:
+    """
+    합쳐진 부분 집계 → CategoryList가 쓰는 채널 통계
+    """
+    summary = pd.DataFrame({
+        'subscriber_count': merged['last_subs'],
+        'subs_diff':        merged['last_subs'] - merged['first_subs'],
+        'avg_views':        merged['view_sum'] / merged['view_n'],
+        'short_ratio':      merged['short_sum'] / merged['short_n'],
+    })
+    if surge_state:
+        surge = pd.DataFrame.from_dict(surge_state, orient='index')[['gain', 'ewma', 'var', 'score']]
+        summary = summary.join(surge)
+    summary.index.name = 'channel_id'
+    return summary
+
+
+def compute_channel_metrics(rows: pd.DataFrame, total_views: float = 0, max_days: int = 30) -> dict:
+    """
+    채널 하나의 스냅샷 → ChannelDetail 지표 (JSON으로 저장할 수 있는 값만)
+    {
+      "subscribers" : [growth, daily_avg, end, start]   get_subscriber_metrics(df, 30)
+      "avg_views"   : {"long", "short"}                 avg_views(df, 10, False/True)
+      "curves"      : {"long", "short"} 1..max_days일차  avg_view_by_days_since_published
+      "gains"       : [[video_id, gain_score], ...]     compute_video_gain_scores (쇼츠는 None)
+    }
+    """
+    cid = rows['channel_id'].iloc[0]
+    rows = add_day_since_pub(rows)
+    subs = get_subscriber_metrics_batch(rows, 30)
+    views = avg_views_batch(rows, 10)
+    curves = avg_view_curves_by_channel(rows, max_days)
+    gains = compute_video_gain_scores_batch(rows, subs['end'], pd.Series({cid: total_views}, dtype=float), days=10)
+    return {
+        "subscribers": [int(subs.at[cid, 'growth']), float(subs.at[cid, 'daily_avg']),
+                        int(subs.at[cid, 'end']), int(subs.at[cid, 'start'])],
+        "avg_views": {"long": float(views.at[cid, 'long']), "short": float(views.at[cid, 'short'])},
+        "curves": {"long": [int(v) for v in curves.loc[(cid, False)]],
+                   "short": [int(v) for v in curves.loc[(cid, True)]]},
+        "gains": [[vid, None if pd.isna(score) else float(score)]
+                  for vid, score in zip(gains['video_id'], gains['gain_score'])],
+    }
+
+
+def build_partitions(
+    path: str,
+    partition_dir: str,
+    max_memory_mb: int = MAX_MEMORY_MB,
+    alpha: float = DEFAULT_ALPHA,
+    channel_meta=None
+) -> pd.DataFrame:
+    """
+    로그를 청크로 훑어 채널별 파티션 파일을 만든 뒤, 파티션별로 채널 지표 파일과 채널 요약 파일 생성
+    - 샤드가 겹쳐 같은 (video_id, timestamp)가 여러 번 나와도 load_processed_data와 같은 결과
+    - channel_meta: Gain Score 기준 전환율에 쓰는 total_view_count (없으면 0 → Gain Score 0)
+    """
+    if os.path.isdir(partition_dir):
+        shutil.rmtree(partition_dir)
+    os.makedirs(os.path.join(partition_dir, METRICS_DIR))
+
+    # 1) 청크 → 채널별 파티션 (중복 포함)
+    channel_ids = set()
+    for chunk in iter_snapshot_chunks(path, max_memory_mb):
+        for cid, rows in chunk.groupby('channel_id'):
+            out = os.path.join(partition_dir, f"{cid}.csv")
+            rows.to_csv(out, mode='a', header=cid not in channel_ids, index=False, encoding='utf-8')
+            channel_ids.add(cid)
+
+    # 2) 파티션별 중복 제거 → 부분 집계·급상승 상태·채널 지표
+    partials, surge_state = [], {}
+    for cid in sorted(channel_ids):
+        out = os.path.join(partition_dir, f"{cid}.csv")
+        rows = pd.read_csv(out, encoding='utf-8')
+        rows['timestamp'] = pd.to_datetime(rows['timestamp'])
+        rows = _dedupe_snapshots(rows)
+        rows.to_csv(out, index=False, encoding='utf-8')
+
+        partials.append(_partial_channel_summary(rows))
+        # 부분 집계가 쌓여 커지지 않도록 주기적으로 합쳐 둠
+        if len(partials) >= 32:
+            partials = [merge_channel_summaries(partials)]
+        surge_state.update(replay_surge_state(rows, alpha))
+
+        total_views = (channel_meta or {}).get(cid, {}).get('total_view_count', 0)
+        with open(os.path.join(partition_dir, METRICS_DIR, f"{cid}.json"), "w", encoding="utf-8") as f:
+            json.dump(compute_channel_metrics(rows, total_views), f, ensure_ascii=False)
+
+    summary = finalize_channel_summary(merge_channel_summaries(partials), surge_state)
+    summary.to_csv(os.path.join(partition_dir, SUMMARY_FILE), encoding='utf-8')
+    return summary
+
+
+def partition_file_version(partition_dir: str, name: str) -> str:
+    """
+    파티션 디렉터리 안 파일 하나(f"{channel_id}.csv", SUMMARY_FILE 등)의 get_data_version, 없으면 ""
+    """
+    path = os.path.join(partition_dir, name)
+    return get_data_version(path) if os.path.exists(path) else ""
+
+
+@st.cache_data
+def load_channel_summary(partition_dir: str = PARTITION_DIR, data_version: str = "") -> pd.DataFrame:
+    """
+    build_partitions가 만든 채널 요약 (index=channel_id)
+    - data_version: 요약 파일의 get_data_version (파티션을 다시 만들면 캐시도 새로 읽음)
+    """
+    return pd.read_csv(os.path.join(partition_dir, SUMMARY_FILE), encoding='utf-8', index_col='channel_id')
+
+
+@st.cache_data
+def load_channel_partition(channel_id: str, partition_dir: str = PARTITION_DIR, data_version: str = "") -> pd.DataFrame:
+    """
+    채널 하나의 스냅샷만 읽기 (load_processed_data와 같은 정렬·중복 제거·썸네일 보정)
+    - data_version: 파티션 파일의 get_data_version
+    """
+    path = os.path.join(partition_dir, f"{channel_id}.csv")
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=['timestamp', 'channel_id', 'video_id', 'published_at',
+                                     'view_count', 'subscriber_count', 'is_short', 'thumbnail_url'])
+    df = pd.read_csv(path, encoding='utf-8')
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return _fill_thumbnails(_dedupe_snapshots(df))
+
+
+@st.cache_data
+def load_channel_metrics(channel_id: str, partition_dir: str = PARTITION_DIR, data_version: str = ""):
+    """
+    build_partitions가 저장한 채널 지표 (compute_channel_metrics 형식, 파일이 없으면 None)
+    - data_version: 지표 파일의 get_data_version (파티션을 다시 만들면 캐시도 새로 읽음)
+    """
+    path = os.path.join(partition_dir, METRICS_DIR, f"{channel_id}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스냅샷 로그를 청크로 읽어 채널별 파티션/요약 생성")
+    parser.add_argument("source", help="CSV 경로, 샤드 디렉터리 또는 glob 패턴")
+    parser.add_argument("partition_dir")
+    parser.add_argument("--max-memory-mb", type=int, default=MAX_MEMORY_MB)
+    parser.add_argument("--channel-meta", default="data/channel_meta.json", help="Gain Score 계산용 채널 메타")
+    args = parser.parse_args()
+
+    meta = None
+    if os.path.exists(args.channel_meta):
+        with open(args.channel_meta, "r", encoding="utf-8-sig") as f:
+            meta = json.load(f)
+    summary = build_partitions(args.source, args.partition_dir, args.max_memory_mb, channel_meta=meta)
+    print(f"채널 {len(summary):,}개 → {args.partition_dir}")
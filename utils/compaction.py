@@ -0,0 +1,173 @@
+# utils/compaction.py
+"""
+스냅샷 로그 단계별 압축 (tiered compaction)
+
+최근 age_days일(최신 스냅샷 기준)은 원본 해상도 그대로 두고,
+그보다 오래된 스냅샷은 영상·날짜별 마지막 스냅샷 하나로 줄인다.
+단, 지표 계산에 쓰이는 아래 행은 나이와 상관없이 항상 남긴다.
+
+  - 공개 후 1~max_days일차 스냅샷 전부          : 공개 후 평균 조회수 곡선, 스파크라인, D+30 예측
+  - 영상별 공개 직후 첫 스냅샷                   : aggregate_views_within_days의 view0
+  - 영상별 published_at + gain_days 이후 첫 스냅샷 : aggregate_views_within_days의 view_end
+  - 영상별 마지막 스냅샷                         : 아직 gain_days가 안 지난 영상의 view_end
+  - (채널, 롱/숏폼, 시각)마다 마지막 스냅샷 한 행  : 구독자 지표·Gain Index의 ΔS·급상승 감지기
+  - 영상·날짜별 마지막 스냅샷                    : 카테고리 큐브의 일별 증가량
+  - 채널의 가장 최근 공개 - recent_days일 이후 공개된 영상의 스냅샷 전부
+                                                 : ChannelDetail/Compare의 평균 조회수 (avg_views / avg_views_batch)
+
+그래서 최신 기준 구독자 지표, Gain Score, 곡선/예측, 급상승 상태, 카테고리 큐브, avg_views는
+압축 전과 비트 단위로 같다 (verify_compaction으로 확인, tests/test_compaction.py).
+as_of 조회는 as_of >= (최신 시각 - age_days + METRIC_WINDOW_DAYS) 구간에서만 같다.
+
+달라지는 값 (NOT_PRESERVED, 압축을 켜면 화면 값이 바뀜):
+  - CategoryList의 "평균 조회수"·"Shorts 비율"과 유사 채널 임베딩의 Shorts 비율 (channel_view_stats)
+    : 채널 스냅샷 전체에 대한 평균이라 스냅샷 개수가 줄면 값이 달라짐 (남길 행을 골라서는 지킬 수 없음)
+  - 영상 카드의 스냅샷 추이 차트 (오래된 구간이 하루 한 점으로 보임)
+
+    python -m utils.compaction data/processed_data_v2.csv data/compacted.csv --age-days 45
+"""
+import argparse
+import os
+import pandas as pd
+from utils.data_loader import load_snapshot_shards
+from utils.metrics import add_day_since_pub, avg_views_batch, get_subscriber_metrics_batch
+from utils.apply_hyojun_index import aggregate_views_within_days, compute_video_gain_scores_batch
+from utils.forecast import build_day_matrix
+from utils.surge import replay_surge_state
+from utils.rollup import build_category_cube, build_category_subs, build_day_n_histogram
+
+# 원본 해상도로 남길 최근 기간 (일)
+COMPACT_AGE_DAYS = int(os.environ.get("VPI_COMPACT_AGE_DAYS", 45))
+# 지표가 보는 가장 긴 기간: get_subscriber_metrics(30일), 곡선 max_days(30일), Gain Score(10일)
+METRIC_WINDOW_DAYS = 30
+# 압축 전/후 값이 달라지는 지표 → verify_compaction에서 비교하지 않고 CLI가 따로 알림
+NOT_PRESERVED = {
+    "channel_view_stats": "CategoryList 평균 조회수·Shorts 비율, 유사 채널의 Shorts 비율 (스냅샷 전체 평균)",
+    "snapshot_trend": "영상 카드의 스냅샷 추이 차트 (오래된 구간은 하루 한 점)",
+}
+
+
+def compaction_keep_mask(
+    df: pd.DataFrame,
+    age_days: int = COMPACT_AGE_DAYS,
+    max_days: int = 30,
+    gain_days: int = 10,
+    recent_days: int = 10
+) -> pd.Series:
+    """
+    스냅샷 df(timestamp 오름차순)에서 압축 후에도 남길 행 → bool Series (index=df.index)
+    """
+    if age_days < max(METRIC_WINDOW_DAYS, max_days, gain_days):
+        raise ValueError(
+            f"age_days({age_days})는 지표 기간({max(METRIC_WINDOW_DAYS, max_days, gain_days)}일)보다 짧을 수 없습니다."
+        )
+
+    df = add_day_since_pub(df)
+    keep = df['timestamp'] >= df['timestamp'].max() - pd.Timedelta(days=age_days)
+
+    # 공개 후 max_days일까지 (공개일 파싱 실패 행도 보수적으로 남김)
+    keep |= ~(df['day_since_pub'] > max_days)
+
+    # 영상·날짜별 마지막 스냅샷 (하루 한 점)
+    date = df['timestamp'].dt.normalize()
+    keep |= ~pd.concat([df['video_id'], date], axis=1).duplicated(keep='last')
+
+    # 영상별 공개 직후 첫 스냅샷 / 공개 + gain_days 이후 첫 스냅샷 / 마지막 스냅샷
+    after_pub = df['timestamp'] >= df['published_at_dt']
+    after_gain = df['timestamp'] >= df['published_at_dt'] + pd.Timedelta(days=gain_days)
+    keep |= after_pub & ~df['video_id'].where(after_pub).duplicated()
+    keep |= after_gain & ~df['video_id'].where(after_gain).duplicated()
+    keep |= ~df['video_id'].duplicated(keep='last')
+
+    # 채널 단위 구독자 시계열: (채널, 롱/숏폼, 시각)마다 한 행
+    keep |= ~df[['channel_id', 'is_short', 'timestamp']].duplicated(keep='last')
+
+    # avg_views: 채널의 최근 공개 영상은 스냅샷 전체 평균이라 전부 남김
+    latest_pub = df.groupby('channel_id')['published_at_dt'].transform('max')
+    keep |= df['published_at_dt'] >= latest_pub - pd.Timedelta(days=recent_days)
+    return keep
+
+
+def compact_snapshots(
+    df: pd.DataFrame,
+    age_days: int = COMPACT_AGE_DAYS,
+    max_days: int = 30,
+    gain_days: int = 10,
+    recent_days: int = 10
+) -> pd.DataFrame:
+    """
+    스냅샷 df(timestamp 오름차순) → 압축된 df (남은 행의 순서는 그대로)
+    """
+    return df[compaction_keep_mask(df, age_days, max_days, gain_days, recent_days)].reset_index(drop=True)
+
+
+def _metric_snapshot(df: pd.DataFrame, max_days: int, gain_days: int, channel_meta: dict = None) -> dict:
+    """
+    verify_compaction이 비교하는 지표 묶음
+    """
+    df = add_day_since_pub(df)
+    subs = get_subscriber_metrics_batch(df, 30)
+    # Gain Score의 r0 분모: 영상별 최신 조회수 합 (원본/압축본 모두 마지막 스냅샷이 남으므로 같은 값)
+    total_views = df.drop_duplicates('video_id', keep='last').groupby('channel_id')['view_count'].sum()
+    gains = compute_video_gain_scores_batch(df, subs['end'], total_views, days=gain_days)
+    surge = pd.DataFrame.from_dict(replay_surge_state(df), orient='index').sort_index()
+    metrics = {
+        "subscriber_metrics": subs.sort_index(),
+        "views_within_days": aggregate_views_within_days(df, days=gain_days).sort_index(),
+        "gain_scores": gains.set_index('video_id')['gain_score'].sort_index(),
+        "day_matrix": build_day_matrix(df, max_days).sort_index(),
+        "surge_state": surge,
+        "avg_views": avg_views_batch(df, 10).sort_index(),
+    }
+    if channel_meta is not None:
+        metrics["category_cube"] = build_category_cube(df, channel_meta, gain_days=gain_days)
+        metrics["category_subs"] = build_category_subs(df, channel_meta)
+        metrics["category_day_n_hist"] = build_day_n_histogram(df, channel_meta)
+    return metrics
+
+
+def verify_compaction(
+    original: pd.DataFrame,
+    compacted: pd.DataFrame,
+    max_days: int = 30,
+    gain_days: int = 10,
+    channel_meta: dict = None
+) -> dict:
+    """
+    압축 전/후 지표가 비트 단위로 같은지 확인 → {지표 이름: bool}
+    - channel_meta를 주면 카테고리 큐브도 비교
+    - NOT_PRESERVED 지표는 비교하지 않음
+    """
+    before = _metric_snapshot(original, max_days, gain_days, channel_meta)
+    after = _metric_snapshot(compacted, max_days, gain_days, channel_meta)
+    return {name: before[name].equals(after[name]) for name in before}
+
+
+if __name__ == "__main__":
+    import json
+
+    parser = argparse.ArgumentParser(description="오래된 스냅샷을 하루 단위로 압축 (지표에 쓰이는 행은 유지)")
+    parser.add_argument("source", help="CSV 경로, 샤드 디렉터리 또는 glob 패턴")
+    parser.add_argument("out")
+    parser.add_argument("--age-days", type=int, default=COMPACT_AGE_DAYS)
+    parser.add_argument("--channel-meta", help="주면 카테고리 큐브도 비교 (channel_meta.json 경로)")
+    parser.add_argument("--no-verify", action="store_true", help="압축 전/후 지표 비교 생략")
+    args = parser.parse_args()
+
+    snapshots, _ = load_snapshot_shards(args.source)
+    compacted = compact_snapshots(snapshots, args.age_days)
+    compacted.to_csv(args.out, index=False, encoding="utf-8")
+    print(f"{len(snapshots):,}행 → {len(compacted):,}행 ({len(compacted) / max(len(snapshots), 1):.1%}) → {args.out}")
+
+    if not args.no_verify:
+        meta = None
+        if args.channel_meta:
+            with open(args.channel_meta, "r", encoding="utf-8-sig") as f:
+                meta = json.load(f)
+        checks = verify_compaction(snapshots, compacted, channel_meta=meta)
+        for name, ok in checks.items():
+            print(f"  {'OK ' if ok else 'DIFF'} {name}")
+        for name, note in NOT_PRESERVED.items():
+            print(f"  --  {name}: 압축 후 달라짐 ({note})")
+        if not all(checks.values()):
+            raise SystemExit(1)
@@ -0,0 +1,73 @@
+# utils/compare.py
+"""
+여러 채널 비교
+
+ChannelDetail이 채널 하나에 대해 따로 부르는 계산을, 고른 채널들의 스냅샷을 한 번에 모아 배치 함수로 한 번씩만 돌린다.
+  - 공개 후 평균 조회수 곡선  : avg_view_curves_by_channel        (avg_view_by_days_since_published × 2)
+  - 구독자 증가               : get_subscriber_metrics_batch       (get_subscriber_metrics)
+  - 최근 평균 조회수          : avg_views_batch                    (avg_views × 2)
+  - Gain Score               : compute_video_gain_scores_batch    (compute_video_gain_scores)
+parse_published_at도 add_day_since_pub에서 고유 공개 시각에 대해 한 번만 돌므로
+채널 N개의 비용이 채널 하나일 때와 거의 같다 (행 수에만 비례).
+"""
+import pandas as pd
+from utils.metrics import (
+    add_day_since_pub, avg_view_curves_by_channel, avg_views_batch, get_subscriber_metrics_batch
+)
+from utils.apply_hyojun_index import compute_video_gain_scores_batch
+
+
+def compare_channels(
+    df: pd.DataFrame,
+    channel_meta,
+    channel_ids,
+    max_days: int = 30,
+    gain_days: int = 10
+) -> dict:
+    """
+    고른 채널들의 스냅샷(df) → 비교용 값 묶음
+    {
+      "curves"      : DataFrame (index=[channel_id, is_short], columns=1..max_days) 일차별 평균 조회수
+      "summary"     : DataFrame (index=channel_id, channel_ids 순서) 채널별 지표
+      "subscribers" : DataFrame (index=날짜, columns=channel_id) 일별 마지막 구독자 수
+      "gains"       : DataFrame ['channel_id', 'video_id', 'gain_score'] 영상별 Gain Score
+    }
+    - 스냅샷이 없는 채널은 summary에서 빠짐
+    """
+    channel_ids = [cid for cid in dict.fromkeys(channel_ids) if cid in set(df['channel_id'])]
+    if 'day_since_pub' not in df.columns:
+        df = add_day_since_pub(df)
+
+    curves = avg_view_curves_by_channel(df, max_days)
+    subs = get_subscriber_metrics_batch(df, 30)
+    recent_views = avg_views_batch(df, 10)
+    total_views = pd.Series(
+        {cid: channel_meta[cid].get('total_view_count', 0) for cid in channel_ids if cid in channel_meta},
+        dtype=float
+    ).reindex(subs.index).fillna(0)
+    gains = compute_video_gain_scores_batch(df, subs['end'], total_views, days=gain_days)
+
+    long_gains = gains.dropna(subset=['gain_score']).groupby('channel_id')['gain_score']
+    videos = df.drop_duplicates('video_id').groupby('channel_id')['is_short']
+    summary = pd.DataFrame({
+        'channel_title': [channel_meta.get(cid, {}).get('channel_title', cid) for cid in channel_ids],
+        'category': [channel_meta.get(cid, {}).get('category', '') for cid in channel_ids],
+        'subscribers': subs['end'].reindex(channel_ids).to_numpy(),
+        'growth': subs['growth'].reindex(channel_ids).to_numpy(),
+        'daily_avg': subs['daily_avg'].reindex(channel_ids).to_numpy(),
+        'long_videos': (videos.size() - videos.sum()).reindex(channel_ids).to_numpy(),
+        'short_videos': videos.sum().reindex(channel_ids).to_numpy(),
+        'long_avg_views': recent_views['long'].reindex(channel_ids).to_numpy(),
+        'short_avg_views': recent_views['short'].reindex(channel_ids).to_numpy(),
+        # 채널 Gain Score 합 = GainIndex_chan (조회수 비중 가중치의 합이 1)
+        'gain_index': long_gains.sum().reindex(channel_ids).fillna(0.0).to_numpy(),
+        'max_gain_score': long_gains.max().reindex(channel_ids).to_numpy(),
+    }, index=pd.Index(channel_ids, name='channel_id'))
+
+    daily_subs = (
+        df.assign(date=df['timestamp'].dt.normalize())
+          .groupby(['date', 'channel_id'])['subscriber_count'].last()
+          .unstack('channel_id')
+          .reindex(columns=channel_ids)
+    )
+    return {"curves": curves, "summary": summary, "subscribers": daily_subs, "gains": gains}
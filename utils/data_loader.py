@@ -1,56 +1,242 @@
+import glob
+import logging
+import os
+import time
+import numpy as np
 import pandas as pd
-import json
 import streamlit as st
+from utils.profiler import profiled
+from utils.meta_store import load_meta_store
 
+logger = logging.getLogger(__name__)
 
-@st.cache_data #캐싱 데코레이터 : 함수의 실행결과를 메모리에 저장함.
-def load_processed_data(path="data/processed_data_v2.csv"):
+
+def _resolve_shard_paths(path):
     """
-    영상별 구독자/조회수/카테고리 로그 CSV 파일 불러오기
+    path를 실제 CSV 파일 목록으로 변환
+    - 단일 파일: 그대로
+    - 디렉터리: 안의 *.csv 전부
+    - glob 패턴: 매칭되는 파일 전부 (예: "data/shards/*.csv")
+    """
+    if os.path.isdir(path):
+        paths = glob.glob(os.path.join(path, "*.csv"))
+    elif glob.has_magic(path):
+        paths = glob.glob(path)
+    else:
+        paths = [path]
+    return sorted(paths)
+
+
+def _read_shard(path):
+    """
+    샤드 CSV 한 개 읽기 (프로세스 풀 워커에서 실행되므로 top-level 함수)
+    반환: (DataFrame, 샤드 리포트 dict)
     """
-    df = pd.read_csv(path, encoding='utf-8-sig', on_bad_lines='skip')  
+    started = time.perf_counter()
+    df = pd.read_csv(path, encoding='utf-8-sig', on_bad_lines='skip')
     df['timestamp'] = pd.to_datetime(df['timestamp'])
+    report = {
+        "shard": os.path.basename(path),
+        "rows": len(df),
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+    return df, report
 
-      # 누락된 썸네일 채우기
+
+def _fill_thumbnails(df):
+    # 누락된 썸네일 채우기
     if 'thumbnail_url' in df.columns:
         thumbnail_map = df.dropna(subset=['video_id', 'thumbnail_url']) \
                           .drop_duplicates(subset=['video_id'], keep='last') \
-                          .set_index('video_id')['thumbnail_url'].to_dict()
+                          .set_index('video_id')['thumbnail_url']
 
-        df['thumbnail_url'] = df.apply(
-            lambda row: thumbnail_map.get(row['video_id'], "") if pd.isna(row.get('thumbnail_url')) else row['thumbnail_url'],
-            axis=1
-        )
+        missing = df['thumbnail_url'].isna()
+        df.loc[missing, 'thumbnail_url'] = df.loc[missing, 'video_id'].map(thumbnail_map).fillna("")
     else:
         df['thumbnail_url'] = ""  # 컬럼이 아예 없을 경우 기본 생성
+    return df
+
+
+def load_snapshot_shards(path="data/processed_data_v2.csv", max_workers=None):
+    """
+    스냅샷 샤드(일별 CSV 등)를 프로세스 풀로 동시에 읽어 하나의 스냅샷 DataFrame으로 병합
+
+    Parameters
+    ----------
+    path : str
+        단일 CSV 경로, 샤드 디렉터리, 또는 glob 패턴
+    max_workers : int
+        프로세스 수 (None이면 CPU 코어 수)
+
+    Returns
+    -------
+    (df, report)
+        df     : timestamp 순으로 정렬되고 (video_id, timestamp) 중복이 제거된 DataFrame
+        report : 샤드별 ['shard', 'rows', 'seconds'] DataFrame
+    """
+    paths = _resolve_shard_paths(path)
+    if not paths:
+        raise FileNotFoundError(f"스냅샷 파일을 찾을 수 없습니다: {path}")
+
+    # 샤드가 하나면 프로세스 풀 띄우는 비용이 더 크므로 그냥 읽음
+    if len(paths) == 1:
+        results = [_read_shard(paths[0])]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = min(max_workers or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_read_shard, paths))
+
+    frames = [frame for frame, _ in results]
+    report = pd.DataFrame([shard_report for _, shard_report in results])
+
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    # 샤드 경계에서 겹친 스냅샷 제거 후 시간순 정렬 (같은 시각은 원래 순서 유지)
+    df = (
+        df.drop_duplicates(subset=['video_id', 'timestamp'], keep='last')
+          .sort_values('timestamp', kind='stable')
+          .reset_index(drop=True)
+    )
+    df = _fill_thumbnails(df)
+    return df, report
 
+
+@profiled("load_processed_data")
+@st.cache_data(max_entries=2) #캐싱 데코레이터 : 함수의 실행결과를 메모리에 저장함. (직전 버전까지만 보관)
+def load_processed_data(path="data/processed_data_v2.csv", data_version=""):
+    """
+    영상별 구독자/조회수/카테고리 로그 CSV 파일 불러오기
+    - path에 디렉터리나 glob 패턴("data/shards/*.csv")을 주면 샤드들을 병렬로 읽어 병합
+    - data_version(get_data_version)이 바뀌면 캐시 키가 달라져 파일을 다시 읽음
+    """
+    df, report = load_snapshot_shards(path)
+    if len(report) > 1:
+        logger.info("샤드 %d개 로드\n%s", len(report), report.to_string(index=False))
     return df
 
 
-@st.cache_data
+def get_data_version(path="data/processed_data_v2.csv"):
+    """
+    스냅샷 파일(샤드 포함)의 수정 시각·크기로 만든 버전 문자열
+    - 캐시 함수 인자로 넘기면 데이터가 바뀔 때만 다시 계산됨
+    """
+    parts = []
+    for p in _resolve_shard_paths(path):
+        stat = os.stat(p)
+        parts.append(f"{os.path.basename(p)}:{stat.st_mtime_ns}:{stat.st_size}")
+    return "|".join(parts)
+
+
+def parse_as_of(value):
+    """
+    쿼리 파라미터 등으로 받은 as_of 문자열 → Timestamp (없거나 잘못된 값이면 None)
+    - 날짜만 주면("2025-06-20") 그날 끝(23:59:59)까지 포함
+    """
+    if not value:
+        return None
+    try:
+        as_of = pd.Timestamp(value)
+    except ValueError:
+        return None
+    if len(str(value)) <= 10:
+        as_of = as_of + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    return as_of
+
+
+def slice_as_of(df, as_of=None):
+    """
+    timestamp 오름차순으로 정렬된 스냅샷 df에서 as_of 시점까지의 행만 반환
+    - 이진 탐색(searchsorted)으로 경계를 찾아 앞부분만 잘라내므로 전체 필터링 없음
+    - as_of가 None이면 그대로 반환
+    """
+    if as_of is None:
+        return df
+    end = df['timestamp'].searchsorted(pd.Timestamp(as_of), side='right')
+    return df.iloc[:end]
+
+
+@st.cache_resource(max_entries=2)
+def load_snapshot_index(path="data/processed_data_v2.csv", data_version=""):
+    """
+    load_processed_data(path, data_version) 결과에 대한 시간순 인덱스 (같은 data_version으로 불러야 행 위치가 맞음)
+    - timestamps : 전체 timestamp 배열 (정렬됨)
+    - channels   : channel_id → 해당 채널 행 위치 배열 (오름차순 = 시간순)
+    읽기 전용이므로 cache_resource로 복사 없이 공유
+    """
+    df = load_processed_data(path, data_version)
+    return {
+        "timestamps": df['timestamp'].to_numpy(),
+        "channels": {cid: np.asarray(pos) for cid, pos in df.groupby('channel_id').indices.items()},
+    }
+
+
+def get_channel_snapshots(df, index, channel_id, as_of=None):
+    """
+    채널 하나의 스냅샷을 (as_of 시점까지) 인덱스로 바로 꺼냄
+    - df, index는 같은 path의 load_processed_data / load_snapshot_index 결과
+    """
+    positions = index["channels"].get(channel_id, np.empty(0, dtype=np.intp))
+    if as_of is not None:
+        end = np.searchsorted(index["timestamps"], np.datetime64(pd.Timestamp(as_of)), side='right')
+        positions = positions[:np.searchsorted(positions, end)]
+    return df.iloc[positions]
+
+
+def get_channels_snapshots(df, index, channel_ids, as_of=None):
+    """
+    여러 채널의 스냅샷을 (as_of 시점까지) 인덱스로 한 번에 꺼냄 (시간순 유지)
+    - 채널별 행 위치 배열을 합쳐 정렬한 뒤 iloc 한 번
+    """
+    empty = np.empty(0, dtype=np.intp)
+    positions = np.concatenate([empty] + [index["channels"].get(cid, empty) for cid in channel_ids])
+    positions = np.unique(positions)  # 정렬 + 중복 채널 id 제거
+    if as_of is not None:
+        end = np.searchsorted(index["timestamps"], np.datetime64(pd.Timestamp(as_of)), side='right')
+        positions = positions[:np.searchsorted(positions, end)]
+    return df.iloc[positions]
+
+
 def load_channel_meta(path="data/channel_meta.json"):
     """
-    채널별 썸네일, 배너, 이름, 카테고리 등이 담긴 JSON
+    채널별 썸네일, 배너, 이름, 카테고리 등 (channel_id → dict Mapping)
+    - 컴파일된 메타 저장소에서 필요한 채널만 꺼내 읽음 (utils/meta_store.py, 없거나 원본보다 오래됐으면 먼저 컴파일)
     """
-    with open(path, "r", encoding="utf-8-sig") as f:
-        data = json.load(f)
-    return data  # list 또는 dict 구조
+    return load_meta_store(path)
+
+
+@st.cache_data(max_entries=2)
+def load_channel_titles(path="data/channel_meta.json", data_version=""):
+    """
+    channel_id → 채널명 (채널 선택 목록의 라벨용, 레코드 전체를 한 번만 디코딩)
+    - data_version: get_data_version(path) (원본 JSON이 바뀌면 다시 만듦)
+    """
+    meta = load_channel_meta(path)
+    return {cid: record.get("channel_title", cid) for cid, record in meta.get_many(list(meta)).items()}
 
 
-@st.cache_data
 def load_video_meta(path="data/video_meta.json"):
     """
-    각 영상의 is_short, title, published_at 등이 담긴 JSON
+    각 영상의 is_short, title, published_at 등 (video_id → dict Mapping)
     """
-    with open(path, "r", encoding="utf-8-sig") as f:
-        data = json.load(f)
-    return data  # list 또는 dict 구조
+    return load_meta_store(path)
 
 if __name__ == "__main__":
+    import sys
+
+    # python -m utils.data_loader "data/shards/*.csv" → 샤드별 로딩 시간/행 수 출력
+    if len(sys.argv) > 1:
+        started = time.perf_counter()
+        df, report = load_snapshot_shards(sys.argv[1])
+        print(report.to_string(index=False))
+        print(f"총 {len(df):,}행, {time.perf_counter() - started:.2f}초")
+        sys.exit(0)
+
     df = load_processed_data()
     channel_meta = load_channel_meta()
     video_meta = load_video_meta()
 
     print(df.head())
-    print(channel_meta[0])
-    print(video_meta[0])
\ No newline at end of file
+    print(next(iter(channel_meta.values())))
+    print(next(iter(video_meta.values())))
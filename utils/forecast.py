@@ -0,0 +1,135 @@
+# utils/forecast.py
+"""
+영상별 조회수 궤적 예측
+
+각 영상의 일별 조회수를 포화 곡선 V(t) = K · (1 - e^(-t/τ)) 로 맞춘 뒤 D+N 조회수를 예측한다.
+log V = log K + log(1 - e^(-t/τ)) 이므로 τ를 고정하면 log K는 평균 한 번으로 풀린다.
+τ 후보(grid)마다 모든 영상을 (영상 × 일) 행렬 연산으로 한꺼번에 맞추고, 잔차가 가장 작은 τ를 고른다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import load_processed_data
+from utils.metrics import add_day_since_pub
+
+TAU_GRID = np.geomspace(0.25, 60, 48)  # 포화 시간상수 후보 (일)
+
+
+def build_day_matrix(df: pd.DataFrame, max_days: int = 30) -> pd.DataFrame:
+    """
+    (video_id, day_since_pub)별 snapshot 평균 조회수를 video × day(1~max_days) 행렬로
+    관측이 없는 칸은 NaN
+    """
+    df = df[(df['day_since_pub'] >= 1) & (df['day_since_pub'] <= max_days)]
+    return (
+        df.groupby(['video_id', 'day_since_pub'])['view_count']
+          .mean()
+          .unstack('day_since_pub')
+          .reindex(columns=range(1, max_days + 1))
+    )
+
+
+def _day_midpoints(n_days: int) -> np.ndarray:
+    # day_since_pub = d 는 공개 후 [d-1, d)일 구간 → 구간 중앙값을 경과 시간으로 사용
+    return np.arange(1, n_days + 1, dtype=float) - 0.5
+
+
+def _log_observations(matrix: np.ndarray):
+    # 관측 여부 mask와 log 조회수 (조회수 0은 1로 올려 log 0)
+    mask = ~np.isnan(matrix)
+    return mask, np.log(np.where(mask, np.maximum(matrix, 1.0), 1.0))
+
+
+def fit_saturating_curves(matrix: np.ndarray, tau_grid: np.ndarray = TAU_GRID):
+    """
+    (영상 × 일) 조회수 행렬 전체를 한 번에 피팅
+
+    Returns
+    -------
+    (log_k, tau, n_points) : 영상별 배열 (관측 2개 미만인 영상은 log_k, tau가 NaN)
+    """
+    n_videos, n_days = matrix.shape
+    t = _day_midpoints(n_days)
+    mask, log_v = _log_observations(matrix)
+    n_points = mask.sum(axis=1)
+
+    best_resid = np.full(n_videos, np.inf)
+    best_tau = np.full(n_videos, np.nan)
+    best_log_k = np.full(n_videos, np.nan)
+    for tau in tau_grid:
+        g = np.log1p(-np.exp(-t / tau))                        # (days,)
+        diff = np.where(mask, log_v - g, 0.0)                  # (videos, days)
+        log_k = diff.sum(axis=1) / np.maximum(n_points, 1)
+        resid = (np.where(mask, diff - log_k[:, None], 0.0) ** 2).sum(axis=1)
+        better = resid < best_resid - 1e-12
+        best_resid[better] = resid[better]
+        best_tau[better] = tau
+        best_log_k[better] = log_k[better]
+
+    # 점이 1개뿐이면 어떤 τ든 잔차 0 → 자기 τ를 정할 수 없음
+    unfit = n_points < 2
+    best_tau[unfit] = np.nan
+    best_log_k[unfit] = np.nan
+    return best_log_k, best_tau, n_points
+
+
+def _log_k_for(tau: np.ndarray, mask: np.ndarray, log_v: np.ndarray) -> np.ndarray:
+    t = _day_midpoints(mask.shape[1])
+    g = np.log1p(-np.exp(-t[None, :] / tau[:, None]))
+    diff = np.where(mask, log_v - g, 0.0)
+    return diff.sum(axis=1) / np.maximum(mask.sum(axis=1), 1)
+
+
+def forecast_views(df: pd.DataFrame, horizon: int = 30, max_days: int = 30) -> pd.DataFrame:
+    """
+    스냅샷 DataFrame(day_since_pub 포함) → 영상별 D+horizon 예측 조회수
+
+    Returns
+    -------
+    DataFrame (index=video_id) with columns
+      ['forecast_views', 'saturation_views', 'tau_days', 'n_points']
+      - saturation_views: 곡선이 수렴하는 조회수 K
+      - 관측이 1개뿐인 영상은 같은 유형(숏폼/롱폼) 영상들의 τ 중앙값을 빌려 씀
+    """
+    matrix = build_day_matrix(df, max_days)
+    if matrix.empty:
+        return pd.DataFrame(columns=['forecast_views', 'saturation_views', 'tau_days', 'n_points'])
+
+    values = matrix.to_numpy(dtype=float)
+    log_k, tau, n_points = fit_saturating_curves(values)
+
+    # τ를 못 정한 영상: 유형별 τ 중앙값 → 그것도 없으면 전체 중앙값
+    unfit = ~np.isfinite(tau)
+    is_short = df.drop_duplicates('video_id').set_index('video_id')['is_short'].reindex(matrix.index).fillna(False).to_numpy(bool)
+    overall = np.nanmedian(tau) if (~unfit).any() else 3.0
+    for flag in (True, False):
+        group = is_short == flag
+        fitted = tau[group & ~unfit]
+        tau[group & unfit] = np.median(fitted) if len(fitted) else overall
+
+    # 빌려 온 τ로 그 영상들의 log K만 다시 풂
+    if unfit.any():
+        mask, log_v = _log_observations(values[unfit])
+        log_k[unfit] = _log_k_for(tau[unfit], mask, log_v)
+    k = np.exp(log_k)
+    forecast = k * -np.expm1(-(horizon - 0.5) / tau)
+
+    # 이미 관측된 최신 조회수보다 작게 예측하지 않음
+    latest = matrix.ffill(axis=1).iloc[:, -1].fillna(0).to_numpy()
+    forecast = np.maximum(forecast, latest)
+
+    return pd.DataFrame({
+        'forecast_views': forecast.round(0).astype(int),
+        'saturation_views': k.round(0).astype(int),
+        'tau_days': tau,
+        'n_points': n_points,
+    }, index=matrix.index)
+
+
+@st.cache_data
+def load_view_forecasts(path="data/processed_data_v2.csv", data_version: str = "", horizon: int = 30) -> pd.DataFrame:
+    """
+    전체 영상의 예측 결과 (data_version이 바뀔 때만 다시 계산, 원본도 그 버전으로 다시 읽음)
+    """
+    df = add_day_since_pub(load_processed_data(path, data_version))
+    return forecast_views(df, horizon=horizon)
@@ -0,0 +1,186 @@
+# utils/leaderboard.py
+"""
+전체 채널 영상 리더보드
+
+지표마다, 카테고리마다(+ 전체) 영상을 값 내림차순으로 정렬된 리스트[(-값, video_id)]로 들고 있다.
+  - gain         : Gain Score (롱폼만, compute_video_gain_scores_batch)
+  - views_recent : 최근 days일 조회수 증가량 (최신 조회수 - days일 전 시점의 마지막 조회수)
+  - retain       : Retain Index (최신 조회수 ÷ 채널 기대 조회수)
+
+새 스냅샷이 들어오면 그 스냅샷이 속한 채널의 영상만 다시 계산하고, 그 영상이 든 리스트만
+배치당 한 번 새로 만든다 (옛 항목을 걸러 낸 정렬 리스트 + 새 항목 → timsort가 이미 정렬된 구간을 그대로 병합).
+전체 이력을 다시 계산하지 않고, 영상 하나마다 리스트 중간에 끼워 넣지도 않는다.
+갱신은 기존 board를 고치지 않고 새 board를 만들어 바꿔 끼우므로(copy-on-write),
+페이지가 받은 board는 다른 세션이 갱신해도 바뀌지 않는 스냅샷이다.
+페이지는 리스트를 잘라서(slice) 읽으므로 페이지 하나가 O(page_size).
+
+Gain Score와 Retain Index는 채널 단위 값(구독자 증가량, 기대 곡선)에 기대므로 채널 단위로 다시 계산한다.
+views_recent의 기준 시각은 마지막으로 들어온 스냅샷 시각이라, 이번 배치에 스냅샷이 없는 채널
+(수집 중단 등)의 값은 이전 기준 그대로 남는다.
+"""
+import threading
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import load_processed_data
+from utils.metrics import add_day_since_pub
+from utils.percentile import compute_video_scores
+
+LEADERBOARD_METRICS = {
+    "gain": "Gain Score",
+    "views_recent": "최근 조회수 증가",
+    "retain": "Retain Index",
+}
+ALL_CATEGORIES = "전체"
+
+
+def views_gained_within(df: pd.DataFrame, days: int = 7, now=None) -> pd.Series:
+    """
+    영상별 최근 days일 조회수 증가량 (index=video_id)
+    - 기준: now(없으면 df의 마지막 시각) - days 시점 이전의 마지막 스냅샷, 그 뒤에 처음 잡힌 영상은 0부터
+    """
+    now = pd.Timestamp(now) if now is not None else df['timestamp'].max()
+    cutoff = now - pd.Timedelta(days=days)
+    snaps = df[['video_id', 'timestamp', 'view_count']].sort_values('timestamp', kind='stable')
+
+    latest = snaps.drop_duplicates('video_id', keep='last').set_index('video_id')['view_count']
+    before = snaps[snaps['timestamp'] <= cutoff].drop_duplicates('video_id', keep='last')
+    base = before.set_index('video_id')['view_count'].reindex(latest.index).fillna(0)
+    return (latest - base).rename('views_recent')
+
+
+def compute_leaderboard_rows(df: pd.DataFrame, channel_meta, days: int = 7, now=None) -> pd.DataFrame:
+    """
+    스냅샷(여러 채널 가능) → 영상별 리더보드 값 (index=video_id)
+    ['channel_id', 'category', 'is_short', 'gain', 'views_recent', 'retain']
+    """
+    if df.empty:
+        return pd.DataFrame(columns=['channel_id', 'category', 'is_short', *LEADERBOARD_METRICS])
+    df = add_day_since_pub(df)
+    rows = compute_video_scores(df, channel_meta)
+    rows['views_recent'] = views_gained_within(df, days, now).reindex(rows.index).astype(float)
+    return rows[['channel_id', 'category', 'is_short', *LEADERBOARD_METRICS]]
+
+
+def new_leaderboard(days: int = 7) -> dict:
+    """
+    빈 리더보드 {"days", "now", "rows": video_id → 값 dict, "lists": (지표, 카테고리) → 정렬 리스트}
+    """
+    return {"days": days, "now": None, "rows": {}, "lists": {}}
+
+
+def update_leaderboard(board: dict, rows: pd.DataFrame) -> dict:
+    """
+    다시 계산한 영상 값들로 새 board 반환 (board는 그대로, NaN은 리스트에서 빠짐)
+    - 바뀐 영상이 들었던/들어갈 (지표, 카테고리) 리스트만 새로 만듦: O(리스트 길이 + 바뀐 영상 수 × log)
+    """
+    if rows.empty:
+        return board
+    records = dict(zip(rows.index, rows.to_dict('records')))
+    old_categories = {board["rows"][vid]['category'] for vid in records if vid in board["rows"]}
+    categories = {ALL_CATEGORIES} | old_categories | set(rows['category'])
+
+    lists = dict(board["lists"])
+    for metric in LEADERBOARD_METRICS:
+        for category in categories:
+            key = (metric, category)
+            kept = [entry for entry in lists.get(key, []) if entry[1] not in records]
+            fresh = [
+                (-float(row[metric]), vid) for vid, row in records.items()
+                if pd.notna(row[metric]) and category in (ALL_CATEGORIES, row['category'])
+            ]
+            if kept or fresh:
+                lists[key] = sorted(kept + fresh)
+            else:
+                lists.pop(key, None)
+    return {**board, "rows": {**board["rows"], **records}, "lists": lists}
+
+
+def build_leaderboard(df: pd.DataFrame, channel_meta, days: int = 7) -> dict:
+    """
+    전체 이력으로 리더보드 처음 만들기 (리스트마다 정렬 한 번)
+    """
+    board = new_leaderboard(days)
+    if df.empty:
+        return board
+    board["now"] = df['timestamp'].max()
+    rows = compute_leaderboard_rows(df, channel_meta, days, board["now"])
+    board["rows"] = dict(zip(rows.index, rows.to_dict('records')))
+    for metric in LEADERBOARD_METRICS:
+        valid = rows[rows[metric].notna()]
+        for category, group in [(ALL_CATEGORIES, valid), *valid.groupby('category')]:
+            board["lists"][(metric, category)] = sorted(zip(-group[metric].to_numpy(dtype=float), group.index))
+    return board
+
+
+def refresh_leaderboard(board: dict, df: pd.DataFrame, new_snapshots: pd.DataFrame, channel_meta) -> dict:
+    """
+    새로 들어온 스냅샷(new_snapshots)이 속한 채널의 영상만 다시 계산해서 반영한 새 board
+    - df: 새 스냅샷까지 포함한 전체 스냅샷 (해당 채널 행만 꺼내 씀)
+    """
+    if new_snapshots.empty:
+        return board
+    now = max(board["now"], new_snapshots['timestamp'].max()) if board["now"] is not None \
+        else new_snapshots['timestamp'].max()
+    touched = new_snapshots['channel_id'].unique()
+    channel_df = df[df['channel_id'].isin(touched)]
+    rows = compute_leaderboard_rows(channel_df, channel_meta, board["days"], now)
+    return {**update_leaderboard(board, rows), "now": now}
+
+
+def leaderboard_page(
+    board: dict,
+    metric: str,
+    category: str = ALL_CATEGORIES,
+    page: int = 0,
+    page_size: int = 20
+):
+    """
+    (지표, 카테고리) 리스트의 page번째 페이지 → (DataFrame, 전체 개수)
+    DataFrame: index=video_id, ['rank', 'channel_id', 'category', 'is_short', 'value']
+    """
+    entries = board["lists"].get((metric, category), [])
+    start = page * page_size
+    chunk = entries[start:start + page_size]
+    ids = [vid for _, vid in chunk]
+    table = pd.DataFrame({
+        'rank': np.arange(start + 1, start + len(chunk) + 1),
+        'channel_id': [board["rows"][vid]['channel_id'] for vid in ids],
+        'category': [board["rows"][vid]['category'] for vid in ids],
+        'is_short': [board["rows"][vid]['is_short'] for vid in ids],
+        'value': [-neg for neg, _ in chunk],
+    }, index=pd.Index(ids, name='video_id'))
+    return table, len(entries)
+
+
+@st.cache_resource
+def _leaderboard_holder(path: str, days: int) -> dict:
+    # 세션 간 공유하는 리더보드 하나 + 갱신용 잠금 (rows: 마지막으로 반영한 df 행 수)
+    return {"board": None, "lock": threading.Lock(), "rows": 0}
+
+
+def load_leaderboard(
+    path: str = "data/processed_data_v2.csv",
+    days: int = 7,
+    channel_meta=None,
+    data_version: str = ""
+) -> dict:
+    """
+    path의 리더보드 (처음엔 전체 이력으로 만들고, 이후엔 마지막 반영 시각 이후 스냅샷만 반영)
+    - data_version: get_data_version(path), 바뀌면 새 스냅샷을 읽어 반영
+    - 반환한 board는 이후 갱신에도 바뀌지 않는 스냅샷 (갱신은 새 board로 교체)
+    """
+    holder = _leaderboard_holder(path, days)
+    df = load_processed_data(path, data_version)
+    with holder["lock"]:
+        board = holder["board"]
+        # df는 timestamp 오름차순 → 마지막 반영 시각 이후 행만 이진 탐색으로 잘라냄
+        start = df['timestamp'].searchsorted(board["now"], side='right') \
+            if board is not None and board["now"] is not None else 0
+        if board is None or start != holder["rows"]:
+            # 처음이거나 이미 반영한 구간의 행이 바뀜 (백필·압축) → 전체 이력으로 다시 만듦
+            board = build_leaderboard(df, channel_meta or {}, days)
+        elif start < len(df):
+            board = refresh_leaderboard(board, df, df.iloc[start:], channel_meta or {})
+        holder["board"], holder["rows"] = board, len(df)
+    return board
@@ -0,0 +1,299 @@
+# utils/meta_store.py
+"""
+channel_meta.json / video_meta.json 컴파일 저장소
+
+JSON 원본을 한 줄에 레코드 하나인 JSON Lines 파일(<원본>.jsonl)과
+id → [offset, length, hash, category] 인덱스 파일(<원본>.idx.json)로 변환해 둔다.
+저장소는 적재 단계에서 아래 CLI로 미리 만들어 두는 것이 기본이고, 페이지가 열 때 저장소가 없거나
+원본보다 오래됐으면 그 자리에서 한 번 컴파일(바뀐 레코드만 덧붙임)한다. data/에 쓸 수 없으면
+원본 JSON을 그대로 읽은 메모리 저장소로 대신한다. 인덱스만 메모리에 두고,
+레코드는 접근할 때 파일을 열어 해당 줄만 읽은 뒤 바로 닫는다.
+
+원본이 바뀌면(수정 시각·크기) 레코드별 해시를 비교해 바뀐/새 레코드만 파일 끝에 덧붙이고
+인덱스를 갱신한다. 버려진 줄이 파일의 절반을 넘으면 새 파일로 다시 쓴다.
+덧붙이기/교체만 하므로 이미 열린 저장소가 가리키는 offset은 그대로 유효하다.
+
+    python -m utils.meta_store data/channel_meta.json data/video_meta.json
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+# 읽어 둔 레코드(JSON 줄)를 들고 있을 최대 개수 (카탈로그 크기와 무관하게 메모리 상한)
+RECORD_CACHE_SIZE = 2048
+# 같은 프로세스의 여러 세션이 동시에 컴파일하지 않도록
+_compile_lock = threading.Lock()
+
+
+def _store_paths(json_path: str):
+    base, _ = os.path.splitext(json_path)
+    return base + ".jsonl", base + ".idx.json"
+
+
+def _source_stamp(json_path: str) -> dict:
+    stat = os.stat(json_path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _read_index(index_path: str):
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def _write_atomic(path: str, write):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+
+def compile_meta_store(json_path: str) -> dict:
+    """
+    json_path를 저장소로 컴파일(이미 최신이면 그대로)하고 인덱스 dict 반환
+    - 레코드 내용이 같은 id는 기존 줄을 그대로 쓰고, 바뀐/새 id만 덧붙임
+    """
+    data_path, index_path = _store_paths(json_path)
+    source = _source_stamp(json_path)
+    index = _read_index(index_path)
+    if index is not None and not os.path.exists(data_path):
+        index = None
+    if index is not None and index["source"] == source:
+        return index
+
+    with open(json_path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    items = data.items() if isinstance(data, dict) else ((str(i), v) for i, v in enumerate(data))
+
+    old = index["records"] if index is not None else {}
+    dead = index["dead_bytes"] if index is not None else 0
+    records, pending = {}, []
+    end = os.path.getsize(data_path) if index is not None else 0
+
+    for key, value in items:
+        line = _encode(value)
+        digest = hashlib.blake2b(line, digest_size=8).hexdigest()
+        prev = old.get(key)
+        if prev is not None and prev[2] == digest:
+            records[key] = prev
+            continue
+        if prev is not None:
+            dead += prev[1] + 1
+        category = value.get("category", "") if isinstance(value, dict) else ""
+        records[key] = [end, len(line), digest, category]
+        pending.append(line)
+        end += len(line) + 1
+    dead += sum(prev[1] + 1 for key, prev in old.items() if key not in records)
+
+    if index is not None and dead * 2 > end:
+        # 버려진 줄이 절반 이상 → 처음부터 다시 컴파일
+        os.remove(index_path)
+        return compile_meta_store(json_path)
+
+    if index is None:
+        _write_atomic(data_path, lambda f: f.writelines(line + b"\n" for line in pending))
+    elif pending:
+        with open(data_path, "ab") as f:
+            f.writelines(line + b"\n" for line in pending)
+
+    index = {"version": INDEX_VERSION, "source": source, "dead_bytes": dead, "records": records}
+    _write_atomic(index_path, lambda f: f.write(json.dumps(index, ensure_ascii=False).encode("utf-8")))
+    return index
+
+
+class MetaStore(Mapping):
+    """
+    id → 메타 dict 읽기 전용 Mapping
+    - 인덱스(id, offset, category)만 메모리에 두고 레코드는 꺼낼 때 파싱
+    - id in store, len(store), 카테고리 조회는 레코드를 파싱하지 않음
+    - 파일 핸들을 들고 있지 않음 (읽을 때만 열고 닫음)
+    - 꺼낸 dict는 매번 새로 파싱한 사본이라 고쳐도 다른 세션/다음 조회에 영향 없음
+    """
+
+    def __init__(self, data_path: str, index: dict, cache_size: int = RECORD_CACHE_SIZE, index_path: str = None):
+        self._data_path = data_path
+        self._index_path = index_path
+        self._records = index["records"]
+        # id → JSON 줄(bytes) LRU, 여러 세션이 같은 저장소를 공유하므로 잠금으로 보호
+        self._lines = OrderedDict()
+        self._lock = threading.Lock()
+        self._cache_size = cache_size
+
+    def _read_lines(self, keys) -> dict:
+        # 캐시에 없는 줄만 파일을 한 번 열어 offset 순서대로 읽고 닫음 → {id: bytes}
+        with self._lock:
+            lines = {k: self._lines[k] for k in keys if k in self._lines}
+            for k in lines:
+                self._lines.move_to_end(k)
+        missing = sorted((k for k in keys if k not in lines), key=lambda k: self._records[k][0])
+        if missing:
+            read = self._read_from_file(missing)
+            if read is None and self._reload_index():
+                # CLI가 저장소를 새로 쓴 경우 → 새 인덱스로 한 번 더 (그사이 빠진 id는 KeyError)
+                missing = [k for k in missing if k in self._records]
+                read = self._read_from_file(missing)
+            if read is None:
+                raise RuntimeError(f"{self._data_path}가 인덱스와 맞지 않습니다. 저장소를 다시 컴파일하세요.")
+            lines.update(read)
+            with self._lock:
+                for k in missing:
+                    self._lines[k] = lines[k]
+                while len(self._lines) > self._cache_size:
+                    self._lines.popitem(last=False)
+        return lines
+
+    def _read_from_file(self, keys):
+        # offset 순서대로 읽고 레코드 해시로 확인 (맞지 않으면 None)
+        records, read = self._records, {}
+        with open(self._data_path, "rb") as f:
+            for k in sorted(keys, key=lambda k: records[k][0]):
+                offset, length, digest = records[k][:3]
+                f.seek(offset)
+                line = f.read(length)
+                if hashlib.blake2b(line, digest_size=8).hexdigest() != digest:
+                    return None
+                read[k] = line
+        return read
+
+    def _reload_index(self) -> bool:
+        index = _read_index(self._index_path) if self._index_path else None
+        if index is None or index["records"] is self._records:
+            return False
+        self._records = index["records"]
+        with self._lock:
+            self._lines.clear()
+        return True
+
+    def __getitem__(self, key):
+        if key not in self._records:
+            raise KeyError(key)
+        return json.loads(self._read_lines([key])[key])
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def get_many(self, keys) -> dict:
+        """
+        여러 id를 파일 순서(offset)대로 한 번에 읽기 → {id: 레코드}
+        """
+        found = sorted((k for k in keys if k in self._records), key=lambda k: self._records[k][0])
+        lines = self._read_lines(found)
+        return {k: json.loads(lines[k]) for k in found}
+
+    def category(self, key, default: str = "") -> str:
+        record = self._records.get(key)
+        return record[3] if record is not None else default
+
+    def categories(self) -> set:
+        return {record[3] for record in self._records.values() if record[3]}
+
+
+class JsonMetaStore(Mapping):
+    """
+    저장소를 만들 수 없을 때 쓰는 대체본: 원본 JSON 전체를 메모리에 들고 MetaStore와 같은 방식으로 조회
+    - 꺼낸 dict는 MetaStore처럼 매번 새로 파싱한 사본
+    """
+
+    def __init__(self, json_path: str):
+        with open(json_path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+        items = data.items() if isinstance(data, dict) else ((str(i), v) for i, v in enumerate(data))
+        self._lines, self._categories = {}, {}
+        for key, value in items:
+            self._lines[key] = _encode(value)
+            self._categories[key] = value.get("category", "") if isinstance(value, dict) else ""
+
+    def __getitem__(self, key):
+        return json.loads(self._lines[key])
+
+    def __contains__(self, key):
+        return key in self._lines
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def __len__(self):
+        return len(self._lines)
+
+    def get_many(self, keys) -> dict:
+        return {k: json.loads(self._lines[k]) for k in keys if k in self._lines}
+
+    def category(self, key, default: str = "") -> str:
+        return self._categories.get(key, default)
+
+    def categories(self) -> set:
+        return {c for c in self._categories.values() if c}
+
+
+def open_meta_store(json_path: str):
+    """
+    json_path의 저장소 열기 → MetaStore
+    - 저장소가 없거나 원본보다 오래됐으면 compile_meta_store로 먼저 만듦 (바뀐 레코드만 덧붙임)
+    - data/에 쓸 수 없으면 경고를 남기고 JsonMetaStore(원본 JSON을 메모리에)로 대신함
+    """
+    data_path, index_path = _store_paths(json_path)
+    index = _read_index(index_path)
+    stale = (
+        index is None or not os.path.exists(data_path)
+        or (os.path.exists(json_path) and index["source"] != _source_stamp(json_path))
+    )
+    if stale:
+        try:
+            with _compile_lock:
+                index = compile_meta_store(json_path)
+        except OSError as e:
+            logger.warning("%s의 메타 저장소를 만들 수 없어 원본 JSON을 그대로 읽습니다: %s", json_path, e)
+            return JsonMetaStore(json_path)
+    return MetaStore(data_path, index, index_path=index_path)
+
+
+@st.cache_resource(max_entries=4)
+def _open_meta_store(json_path: str, version: str):
+    # version(원본 JSON·인덱스 파일의 수정 시각·크기)이 바뀌면, 즉 원본이 바뀌거나 다시 컴파일하면 새로 열림
+    return open_meta_store(json_path)
+
+
+def _file_stamp(path: str) -> str:
+    if not os.path.exists(path):
+        return ""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_meta_store(json_path: str):
+    """
+    json_path의 저장소 (프로세스 안에서 공유, 읽기 전용 Mapping)
+    - 원본 JSON이 바뀌면 다음 실행에서 바뀐 레코드만 다시 컴파일해 새로 엶
+    """
+    _, index_path = _store_paths(json_path)
+    return _open_meta_store(json_path, f"{_file_stamp(json_path)}|{_file_stamp(index_path)}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    for path in sys.argv[1:] or ["data/channel_meta.json", "data/video_meta.json"]:
+        index = compile_meta_store(path)
+        data_path, index_path = _store_paths(path)
+        print(f"{path}: {len(index['records']):,}개 → {data_path}, {index_path}")
@@ -4,7 +4,10 @@ import numpy as np
 import pandas as pd
 from typing import Union
 import streamlit as st
+from utils.profiler import profiled
+from utils.data_loader import slice_as_of
 
+@profiled()
 def parse_published_at(series: pd.Series) -> pd.Series:
     """
     Mixed-format datetime strings → naive datetime in Asia/Seoul.
@@ -49,6 +52,18 @@ def parse_published_at(series: pd.Series) -> pd.Series:
 
     return result
 
+def add_day_since_pub(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    published_at_dt(Asia/Seoul)와 day_since_pub(공개 후 경과일, 1일 차부터) 컬럼을 붙인 복사본 반환
+    - published_at 문자열은 고유값만 파싱해서 매핑 (전체 로그에 써도 부담 없음)
+    """
+    df = df.copy()
+    unique_pub = pd.Series(df['published_at'].unique())
+    parsed = pd.Series(parse_published_at(unique_pub).to_numpy(), index=unique_pub.to_numpy())
+    df['published_at_dt'] = df['published_at'].map(parsed)
+    df['day_since_pub'] = (df['timestamp'] - df['published_at_dt']).dt.days + 1 #공개 후 경과일 계산 (1일 차부터)
+    return df
+
 def format_korean_count(n: int) -> str:
     """
     1억 단위(100,000,000)와 만 단위(10,000)로 끊어서 
@@ -77,8 +92,9 @@ def format_korean_count(n: int) -> str:
         return f"{n:,}"
     return " ".join(parts)
 
-def get_subscriber_metrics(df: pd.DataFrame, days: int = 10): #10일 이내 구독자 변동성장률 가져옴
-    df = df.sort_values('timestamp') 
+@profiled()
+def get_subscriber_metrics(df: pd.DataFrame, days: int = 10, as_of=None): #10일 이내 구독자 변동성장률 가져옴
+    df = slice_as_of(df.sort_values('timestamp'), as_of) # as_of 시점 기준 (None이면 최신)
     cutoff = df['timestamp'].max() - timedelta(days=days) #최근 {days}일 전 timestamp
     recent = df[df['timestamp'] >= cutoff]
 
@@ -91,12 +107,43 @@ def get_subscriber_metrics(df: pd.DataFrame, days: int = 10): #10일 이내 구
     daily_avg = (end - start) / actual_days if actual_days > 0 else 0 # recent기간중 일일 변화량
     return growth, daily_avg, end, start
 
+def get_subscriber_metrics_batch(df: pd.DataFrame, days: int = 10) -> pd.DataFrame:
+    """
+    여러 채널의 get_subscriber_metrics를 groupby 한 번으로 계산
+
+    Returns
+    -------
+    DataFrame (index=channel_id) with columns ['growth', 'daily_avg', 'end', 'start']
+      - 최근 {days}일 스냅샷이 2개 미만인 채널은 모두 0
+    """
+    df = df[['channel_id', 'timestamp', 'subscriber_count']].sort_values('timestamp', kind='stable')
+    first = df.groupby('channel_id')['subscriber_count'].first()
+
+    cutoff = df.groupby('channel_id')['timestamp'].transform('max') - timedelta(days=days)
+    recent = df[df['timestamp'] >= cutoff].groupby('channel_id')
+    edges = recent.agg(
+        n=('timestamp', 'size'),
+        t0=('timestamp', 'first'), t1=('timestamp', 'last'),
+        start=('subscriber_count', 'first'), end=('subscriber_count', 'last'),
+    )
+
+    actual_days = (edges['t1'] - edges['t0']).dt.total_seconds() / (3600 * 24)
+    result = pd.DataFrame({
+        'growth': edges['end'] - first.reindex(edges.index),
+        'daily_avg': ((edges['end'] - edges['start']) / actual_days.where(actual_days > 0)).fillna(0.0),
+        'end': edges['end'],
+        'start': edges['start'],
+    })
+    result.loc[edges['n'] < 2] = 0
+    return result
+
 def filter_shorts(df: pd.DataFrame) -> pd.DataFrame:
     return df[df['is_short'] == True]
 
 def filter_longforms(df: pd.DataFrame) -> pd.DataFrame:
     return df[df['is_short'] == False]
 
+@profiled()
 def avg_view_by_days_since_published(
     df: pd.DataFrame,
     max_days: int = 30,
@@ -151,8 +198,15 @@ def avg_view_by_days_since_published(
         .astype(int)
     )
 
-    arr = result['avg_view_count']
-    result['avg_view_count'] = arr.round(0).astype(int)
+    return curve_tables(result['avg_view_count'].tolist())
+
+def curve_tables(values) -> tuple:
+    """
+    1일차부터의 평균 조회수 목록 → avg_view_by_days_since_published와 같은 (pivot, result)
+    (청크 모드에서 저장해 둔 곡선을 화면에 그대로 쓸 때)
+    """
+    result = pd.DataFrame({'day': range(1, len(values) + 1), 'avg_view_count': values})
+    result['avg_view_count'] = result['avg_view_count'].round(0).astype(int)
 
     # pivot & 컬럼명 변경
     pivot = result.set_index('day')['avg_view_count'].to_frame().T
@@ -161,7 +215,61 @@ def avg_view_by_days_since_published(
 
     return pivot, result
 
-def avg_views(df: pd.DataFrame, days: int = 10, is_short: bool = None) -> float: #10일 이내 평균조회수 계산하는 함수
+def avg_view_curves_by_channel(df: pd.DataFrame, max_days: int = 30) -> pd.DataFrame:
+    """
+    모든 채널의 avg_view_by_days_since_published 곡선을 채널 루프 없이 한 번에 계산
+    (day_since_pub 컬럼 필요 → add_day_since_pub)
+
+    Returns
+    -------
+    DataFrame (index=[channel_id, is_short], columns=1..max_days) : 일차별 평균 조회수(int)
+      - 채널마다 롱폼(False)/숏폼(True) 두 행, 해당 유형 영상이 없으면 0
+    """
+    df = df[(df['day_since_pub'] >= 1) & (df['day_since_pub'] <= max_days)]
+
+    # (video_id, day)별 snapshot 평균 → (채널, 유형, day)별 영상 평균
+    per_video = df.groupby(['channel_id', 'is_short', 'video_id', 'day_since_pub'])['view_count'].mean()
+    curves = (
+        per_video.groupby(level=['channel_id', 'is_short', 'day_since_pub']).mean()
+                 .unstack('day_since_pub')
+                 .reindex(columns=range(1, max_days + 1))
+    )
+    full_index = pd.MultiIndex.from_product(
+        [curves.index.get_level_values('channel_id').unique(), [False, True]],
+        names=['channel_id', 'is_short']
+    )
+    curves = curves.reindex(full_index)
+    curves.columns.name = 'day'
+
+    # 누락값 보간 & 앞뒤 채우기 (avg_view_by_days_since_published와 같은 순서)
+    return (
+        curves.interpolate(method='linear', axis=1)
+              .bfill(axis=1)
+              .ffill(axis=1)
+              .fillna(0)
+              .round(0)
+              .astype(int)
+    )
+
+def channel_view_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    채널별 평균 조회수·Shorts 비율 (CategoryList 카드/정렬용)
+
+    Returns
+    -------
+    DataFrame (index=channel_id) with columns ['avg_views', 'short_ratio']
+      - avg_views  : 채널 스냅샷 전체의 평균 조회수
+      - short_ratio: 채널 스냅샷 중 쇼츠 스냅샷 비율
+    """
+    g = df.groupby('channel_id')
+    return pd.DataFrame({
+        'avg_views': g['view_count'].mean(),
+        'short_ratio': g['is_short'].mean(),
+    })
+
+def avg_views(df: pd.DataFrame, days: int = 10, is_short: bool = None, as_of=None) -> float: #10일 이내 평균조회수 계산하는 함수
+    if as_of is not None:
+        df = slice_as_of(df.sort_values('timestamp'), as_of)
     df = df.copy()
     df['published_at_dt'] = parse_published_at(df['published_at'])
 
@@ -174,10 +282,74 @@ def avg_views(df: pd.DataFrame, days: int = 10, is_short: bool = None) -> float:
         recent = filter_longforms(recent)
     return float(recent['view_count'].mean()) if not recent.empty else 0.0
 
-def get_recent_videos(df: pd.DataFrame, days: int = 10) -> pd.DataFrame: #최근 10일 이내 함수 걷어내는 함수
-    cutoff = datetime.now() - timedelta(days=days)
+def avg_views_batch(df: pd.DataFrame, days: int = 10) -> pd.DataFrame:
+    """
+    여러 채널의 avg_views(롱폼/숏폼)를 groupby 한 번으로 계산
+    (published_at_dt 컬럼 필요 → add_day_since_pub)
+
+    Returns
+    -------
+    DataFrame (index=channel_id) with columns ['long', 'short']
+      - 채널의 가장 최근 공개 시각 - {days}일 이후 공개된 영상의 스냅샷 평균 조회수, 없으면 0
+    """
+    latest_time = df.groupby('channel_id')['published_at_dt'].transform('max')
+    recent = df[df['published_at_dt'] >= latest_time - timedelta(days=days)]
+    means = recent.groupby(['channel_id', 'is_short'])['view_count'].mean().unstack('is_short')
+    means = means.reindex(index=df['channel_id'].unique(), columns=[False, True])
+    return means.rename(columns={False: 'long', True: 'short'}).fillna(0.0).astype(float)
+
+def get_recent_videos(df: pd.DataFrame, days: int = 10, as_of=None) -> pd.DataFrame: #최근 10일 이내 함수 걷어내는 함수
+    # as_of가 주어지면 현재 시각 대신 그 시점을 기준으로 (그 뒤에 공개된 영상은 제외)
+    if as_of is not None:
+        df = slice_as_of(df.sort_values('timestamp'), as_of)
+        now = pd.Timestamp(as_of)
+    else:
+        now = datetime.now()
+    cutoff = now - timedelta(days=days)
     # cutoff.dt.tz_localize(None)
     df = df.copy()
     publish_date = pd.to_datetime(df['published_at'], utc=True, errors='coerce')
     df['published_at'] = publish_date.dt.tz_localize(None)
-    return df[df['published_at'] >= cutoff]
+    recent = df['published_at'] >= cutoff
+    if as_of is not None:
+        recent &= df['published_at'] <= now
+    return df[recent]
+
+@profiled()
+def build_video_trajectories(df: pd.DataFrame, max_days: int = 30) -> pd.Series:
+    """
+    영상별 공개 후 1일~max_days일 조회수 궤적을 한 번에 계산 (스파크라인용)
+    - (video_id, day_since_pub)별 snapshot 평균 → video × day 행렬로 pivot
+    - 중간에 빠진 날은 앞 값으로 채우고, 영상의 마지막 관측일 이후는 잘라냄
+
+    Returns
+    -------
+    pd.Series (index=video_id) : 각 값은 일별 조회수 list[int]
+    """
+    df = df[(df['day_since_pub'] >= 1) & (df['day_since_pub'] <= max_days)]
+    if df.empty:
+        return pd.Series(dtype=object, name='trajectory')
+
+    matrix = (
+        df.groupby(['video_id', 'day_since_pub'])['view_count']
+          .mean()
+          .unstack('day_since_pub')
+          .reindex(columns=range(1, max_days + 1))
+    )
+    last_day = matrix.notna().to_numpy()[:, ::-1].argmax(axis=1)
+    n_days = max_days - last_day
+    values = matrix.ffill(axis=1).fillna(0).round(0).astype(int).to_numpy()
+
+    return pd.Series(
+        [row[:n].tolist() for row, n in zip(values, n_days)],
+        index=matrix.index,
+        name='trajectory'
+    )
+
+@st.cache_data(max_entries=32)
+def load_video_trajectories(channel_id: str, data_version: str, as_of=None, _ch_df=None, max_days: int = 30) -> pd.Series:
+    """
+    build_video_trajectories의 (채널, 데이터 버전, as_of)별 캐시 (rerun·컴팩트 토글마다 다시 계산하지 않도록)
+    - _ch_df(add_day_since_pub을 적용한 채널 스냅샷)는 캐시 키에서 제외
+    """
+    return build_video_trajectories(_ch_df, max_days)
@@ -0,0 +1,106 @@
+# utils/percentile.py
+"""
+카테고리 내 백분위 (Gain Index / Retain Index)
+
+배치 단계에서 모든 영상의 Gain Score·Retain Index를 한 번에 계산하고
+(카테고리, is_short)마다 정렬된 값 배열을 만들어 둔다.
+렌더링 때는 영상 값 하나를 해당 배열에 이진 탐색(searchsorted)해서 O(log n)으로 백분위를 얻는다.
+
+  - gain   : compute_video_gain_scores_batch (롱폼만, ChannelDetail의 채널별 계산과 같은 값)
+  - retain : 최신 조회수 ÷ 채널 기대 조회수(같은 유형 평균 곡선의 같은 경과일 값), 기대값이 없으면 제외
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import load_processed_data, slice_as_of
+from utils.metrics import add_day_since_pub, avg_view_curves_by_channel, get_subscriber_metrics_batch
+from utils.apply_hyojun_index import compute_video_gain_scores_batch
+
+RANK_METRICS = ("gain", "retain")
+
+
+def compute_video_scores(
+    df: pd.DataFrame,
+    channel_meta,
+    gain_days: int = 10,
+    max_days: int = 30
+) -> pd.DataFrame:
+    """
+    전체 스냅샷 → 영상별 점수 DataFrame (index=video_id)
+    ['channel_id', 'category', 'is_short', 'gain', 'retain']
+    """
+    if 'day_since_pub' not in df.columns:
+        df = add_day_since_pub(df)
+
+    subs = get_subscriber_metrics_batch(df, 30)
+    total_views = pd.Series(
+        {cid: channel_meta[cid].get('total_view_count', 0) for cid in subs.index if cid in channel_meta},
+        dtype=float
+    ).reindex(subs.index).fillna(0)
+    gains = compute_video_gain_scores_batch(df, subs['end'], total_views, days=gain_days).set_index('video_id')
+
+    # Retain Index: 영상별 최신 row의 조회수 ÷ (채널, 유형) 곡선의 같은 경과일 값
+    latest = df.drop_duplicates('video_id', keep='last').set_index('video_id')
+    curves = avg_view_curves_by_channel(df, max_days)
+    expected = curves.stack().reindex(
+        pd.MultiIndex.from_arrays([latest['channel_id'], latest['is_short'].astype(bool), latest['day_since_pub']])
+    ).to_numpy(dtype=float)
+    expected[expected <= 0] = np.nan
+
+    category = latest['channel_id'].map(
+        channel_meta.category if hasattr(channel_meta, 'category')
+        else lambda cid: channel_meta.get(cid, {}).get('category', '')
+    )
+    return pd.DataFrame({
+        'channel_id': latest['channel_id'],
+        'category': category.fillna(''),
+        'is_short': latest['is_short'].astype(bool),
+        'gain': gains['gain_score'].reindex(latest.index).astype(float),
+        'retain': latest['view_count'].to_numpy(dtype=float) / expected,
+    })
+
+
+def build_rank_arrays(scores: pd.DataFrame) -> dict:
+    """
+    영상별 점수 → {metric: {(category, is_short): 오름차순 정렬된 값 배열}} (NaN 제외)
+    """
+    ranks = {}
+    for metric in RANK_METRICS:
+        valid = scores.dropna(subset=[metric])
+        ranks[metric] = {
+            (category, bool(is_short)): np.sort(group[metric].to_numpy(dtype=float))
+            for (category, is_short), group in valid.groupby(['category', 'is_short'])
+        }
+    return ranks
+
+
+def category_percentiles(ranks: dict, metric: str, category: str, is_short, values) -> np.ndarray:
+    """
+    같은 (카테고리, 유형) 영상 중 값이 values 이하인 비율(%) → 배열 (값이 없거나 비교 대상이 없으면 NaN)
+    - is_short는 값마다 다를 수 있음 (스칼라 또는 values와 같은 길이)
+    """
+    values = np.asarray(values, dtype=float)
+    is_short = np.broadcast_to(np.asarray(is_short, dtype=bool), values.shape)
+    result = np.full(values.shape, np.nan)
+    for flag in (False, True):
+        arr = ranks[metric].get((category, flag))
+        sel = (is_short == flag) & ~np.isnan(values)
+        if arr is None or not len(arr) or not sel.any():
+            continue
+        result[sel] = np.searchsorted(arr, values[sel], side='right') / len(arr) * 100
+    return result
+
+
+@st.cache_resource(max_entries=4)
+def load_percentile_ranks(
+    path: str = "data/processed_data_v2.csv",
+    data_version: str = "",
+    as_of=None,
+    _channel_meta=None
+) -> dict:
+    """
+    전체 영상 점수로 만든 백분위 배열 (data_version·as_of별, 읽기 전용이라 세션 간 공유)
+    - _channel_meta는 캐시 키에서 제외 (메타는 data_version과 함께 바뀐다고 가정)
+    """
+    df = slice_as_of(load_processed_data(path, data_version), as_of)
+    return build_rank_arrays(compute_video_scores(df, _channel_meta or {}))
@@ -0,0 +1,160 @@
+# utils/profiler.py
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# 세션(=스크립트 실행 스레드)별 기록 저장소
+_local = threading.local()
+
+# 트레이스를 JSONL로 남길 파일 (환경변수로 지정, 없으면 남기지 않음)
+TRACE_PATH = os.environ.get("VPI_TRACE_PATH")
+
+# tracemalloc은 프로세스 전체에 걸리고 켜 두면 모든 세션이 느려지므로
+# 프로파일링 중인 세션이 하나라도 있을 때만 켜 둠 (session_id → 마지막 시작 시각)
+_tracing_lock = threading.Lock()
+_tracing_sessions = {}
+# 패널까지 가지 못하고 끝난 실행(st.stop, 예외)이 잡아 둔 추적은 이 시간(초)이 지나면 해제
+TRACING_TTL = 600
+
+
+def _session_id():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else threading.get_ident()
+
+
+def _set_tracing(active: bool) -> None:
+    # 이 세션의 추적 참조를 잡거나 놓고, 참조가 하나라도 있으면 tracemalloc을 켜고 없으면 끔
+    with _tracing_lock:
+        now = time.monotonic()
+        if active:
+            _tracing_sessions[_session_id()] = now
+        else:
+            _tracing_sessions.pop(_session_id(), None)
+        for sid, started in list(_tracing_sessions.items()):
+            if now - started > TRACING_TTL:
+                del _tracing_sessions[sid]
+        if _tracing_sessions and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not _tracing_sessions and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def is_fragment_rerun() -> bool:
+    """
+    이번 실행이 st.fragment만 다시 도는 실행인지 (페이지 전체 실행이면 False)
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return bool(ctx is not None and ctx.fragment_ids_this_run)
+
+
+def begin_profiling(enabled: bool = None, fragment: bool = False):
+    """
+    페이지 맨 위에서 한 번 호출 → 이번 rerun의 기록을 초기화
+    - enabled가 None이면 쿼리 파라미터 ?profile=1 여부로 결정
+    - fragment=True: fragment 본문 맨 위에서 호출, fragment만 다시 돌 때만 초기화
+      (페이지 전체 실행 중이면 페이지 기록에 이어서 쌓음)
+    """
+    if fragment and not is_fragment_rerun():
+        return
+    if enabled is None:
+        enabled = st.query_params.get("profile") in ("1", "true")
+    _local.enabled = enabled
+    _local.records = []
+    _local.depth = 0
+    _set_tracing(enabled)
+
+
+def end_profiling():
+    """
+    이번 rerun의 계측 종료 (이 세션이 잡고 있던 tracemalloc 참조를 놓음, 기록은 남김)
+    """
+    if is_profiling():
+        _set_tracing(False)
+
+
+def is_profiling() -> bool:
+    return getattr(_local, "enabled", False)
+
+
+def get_profile_records() -> list:
+    return list(getattr(_local, "records", []))
+
+
+def _count_rows(result):
+    # DataFrame/Series면 행 수, 튜플이면 첫 번째 값 기준
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if getattr(result, "shape", None):  # 0차원(numpy 스칼라)은 행 수 없음
+        return int(result.shape[0])
+    return None
+
+
+@contextmanager
+def profile_section(name: str, rows: int = None):
+    """
+    with profile_section("gain_score") as rec:
+        ...
+        rec["rows"] = len(df)   # 처리 행 수를 직접 기록할 수도 있음
+    """
+    if not is_profiling():
+        yield {}
+        return
+
+    record = {"name": name, "rows": rows, "depth": _local.depth}
+    # tracemalloc은 프로세스 전체 값이라 같은 시각에 도는 다른 세션의 할당도 함께 잡힘
+    mem_before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    _local.depth += 1
+    try:
+        yield record
+    finally:
+        _local.depth -= 1
+        record["ms"] = round((time.perf_counter() - started) * 1000, 3)
+        record["alloc_kb"] = round((tracemalloc.get_traced_memory()[0] - mem_before) / 1024, 1)
+        _local.records.append(record)
+
+
+def profiled(name: str = None):
+    """
+    함수 실행 시간/처리 행 수/메모리 할당량을 기록하는 데코레이터
+    - 프로파일링이 꺼져 있으면 함수만 그대로 호출
+    - st.cache_data 함수에 붙일 때는 캐시 바깥(위)에 붙여서 캐시 히트 시간까지 기록
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_profiling():
+                return func(*args, **kwargs)
+            with profile_section(label) as record:
+                result = func(*args, **kwargs)
+                if record.get("rows") is None:
+                    record["rows"] = _count_rows(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def export_trace(path: str = None, page: str = ""):
+    """
+    이번 rerun의 기록을 JSONL 파일에 한 줄로 추가 (오프라인 분석용)
+    """
+    path = path or TRACE_PATH
+    records = get_profile_records()
+    if not path or not records:
+        return
+    line = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "page": page,
+        "records": records,
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(line, ensure_ascii=False) + "\n")
@@ -0,0 +1,188 @@
+# utils/rollup.py
+"""
+카테고리 롤업 큐브 (수집/적재 시점에 미리 계산)
+
+차원: (category, date, is_short)
+측정값 (모두 더하기만 하면 여러 날짜·카테고리·유형을 합칠 수 있는 값):
+  - views_gained : 그날 늘어난 조회수 합 (영상별 일 마지막 스냅샷의 전일 대비 증가량)
+  - upload_count : 그날 공개된 영상 수
+  - gain_sum / gain_count : 그날 공개된 롱폼 영상들의 Gain Score 합·개수 (평균 = gain_sum / gain_count)
+구독자 증가량은 채널 단위 값이라 is_short 차원이 없으므로 따로 (category, date) 표(CUBE_SUBS_PATH)에 둔다.
+  - subs_gained  : 그날 늘어난 구독자 수 합 (채널별 일 마지막 스냅샷의 전일 대비 증가량)
+D+N 조회수 중앙값은 따로 로그 구간 히스토그램(CUBE_HIST_PATH, CUBE_KEYS + ['bin', 'count'])으로 저장해
+upload_timing과 같은 방식(_median_from_bins)으로 합친 뒤 계산한다.
+
+    python -m utils.rollup data/processed_data_v2.csv data/channel_meta.json data/category_cube.csv \
+        data/category_cube_dayN.csv data/category_cube_subs.csv
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import load_snapshot_shards, get_data_version
+from utils.metrics import add_day_since_pub, get_subscriber_metrics_batch
+from utils.apply_hyojun_index import compute_video_gain_scores_batch
+from utils.upload_timing import LOG_BIN_WIDTH, _median_from_bins
+
+CUBE_PATH = "data/category_cube.csv"
+CUBE_HIST_PATH = "data/category_cube_dayN.csv"
+CUBE_SUBS_PATH = "data/category_cube_subs.csv"
+CUBE_KEYS = ['category', 'date', 'is_short']
+
+
+def _with_cube_columns(df: pd.DataFrame, channel_meta: dict) -> pd.DataFrame:
+    # 큐브 차원 컬럼 추가 (category, date, pub_date) + 공개 후 경과일
+    df = add_day_since_pub(df)
+    category_map = {cid: meta.get('category', '') for cid, meta in channel_meta.items()}
+    df['category'] = df['channel_id'].map(category_map).fillna(df.get('category', ''))
+    df['date'] = df['timestamp'].dt.normalize()
+    df['pub_date'] = df['published_at_dt'].dt.normalize()
+    return df
+
+
+def build_category_cube(
+    df: pd.DataFrame,
+    channel_meta: dict,
+    day_n: int = 7,
+    gain_days: int = 10
+) -> pd.DataFrame:
+    """
+    스냅샷 로그 전체 → 카테고리 큐브 DataFrame (CUBE_KEYS + 측정값 컬럼)
+    """
+    df = _with_cube_columns(df, channel_meta)
+
+    # 1) 조회수 증가량: 영상별 일 마지막 스냅샷 → 전일 대비 차이
+    #    영상의 첫 관측일은 그날 첫 스냅샷 대비 증가량, 그날 공개된 영상이면 첫 스냅샷 조회수(공개 후 0에서 시작)까지 포함
+    daily_views = (
+        df.groupby(['video_id', 'date'], as_index=False)
+          .agg(view_count=('view_count', 'last'), first_view=('view_count', 'first'),
+               pub_date=('pub_date', 'first'), category=('category', 'first'), is_short=('is_short', 'first'))
+    )
+    first_day = (
+        daily_views['view_count'] - daily_views['first_view']
+        + daily_views['first_view'].where(daily_views['pub_date'] == daily_views['date'], 0)
+    )
+    daily_views['views_gained'] = daily_views.groupby('video_id')['view_count'].diff().fillna(first_day)
+    views_gained = daily_views.groupby(CUBE_KEYS)['views_gained'].sum()
+
+    # 2) 공개일 기준 측정값: 업로드 수, Gain Score 합·개수
+    videos = df.drop_duplicates('video_id')[['channel_id', 'video_id', 'category', 'pub_date', 'is_short']]
+    subs = get_subscriber_metrics_batch(df, 30)
+    total_views = pd.Series({cid: meta.get('total_view_count', 0) for cid, meta in channel_meta.items()})
+    gains = compute_video_gain_scores_batch(df, subs['end'], total_views.reindex(subs.index).fillna(0), days=gain_days)
+    videos = videos.assign(gain_score=videos['video_id'].map(gains.set_index('video_id')['gain_score']).astype(float))
+
+    by_pub = videos.rename(columns={'pub_date': 'date'}).groupby(CUBE_KEYS).agg(
+        upload_count=('video_id', 'size'),
+        gain_sum=('gain_score', 'sum'),
+        gain_count=('gain_score', 'count'),
+    )
+
+    cube = pd.concat([views_gained, by_pub], axis=1).reset_index()
+    cube = cube.fillna({'views_gained': 0, 'upload_count': 0, 'gain_sum': 0, 'gain_count': 0})
+    cube['upload_count'] = cube['upload_count'].astype(int)
+    cube['gain_count'] = cube['gain_count'].astype(int)
+    cube['day_n'] = day_n  # CUBE_HIST_PATH 히스토그램의 N
+    return cube.sort_values(CUBE_KEYS).reset_index(drop=True)
+
+
+def build_category_subs(df: pd.DataFrame, channel_meta: dict) -> pd.DataFrame:
+    """
+    스냅샷 로그 전체 → 카테고리·날짜별 구독자 증가량 ['category', 'date', 'subs_gained']
+    - 채널별 일 마지막 스냅샷의 전일 대비 차이 (채널의 첫 관측일은 0)
+    """
+    df = _with_cube_columns(df, channel_meta)
+    daily_subs = (
+        df.groupby(['channel_id', 'date'], as_index=False)
+          .agg(subscriber_count=('subscriber_count', 'last'), category=('category', 'first'))
+    )
+    daily_subs['subs_gained'] = daily_subs.groupby('channel_id')['subscriber_count'].diff().fillna(0)
+    return (
+        daily_subs.groupby(['category', 'date'])['subs_gained'].sum()
+                  .reset_index()
+                  .sort_values(['category', 'date'])
+                  .reset_index(drop=True)
+    )
+
+
+def build_day_n_histogram(df: pd.DataFrame, channel_meta: dict, day_n: int = 7) -> pd.DataFrame:
+    """
+    스냅샷 로그 전체 → 공개일별 D+N 조회수 로그 구간 히스토그램 (CUBE_KEYS + ['bin', 'count'])
+    - 영상의 D+N 조회수는 그날 스냅샷 평균, bin은 upload_timing과 같은 floor(log10(1 + 조회수) / LOG_BIN_WIDTH)
+    """
+    df = _with_cube_columns(df, channel_meta)
+    day_n_views = df[df['day_since_pub'] == day_n].groupby('video_id')['view_count'].mean()
+    videos = df.drop_duplicates('video_id')[['video_id', 'category', 'pub_date', 'is_short']]
+    videos = videos.assign(views=videos['video_id'].map(day_n_views)).dropna(subset=['views'])
+    videos = videos.assign(bin=np.floor(np.log10(1 + videos['views'].clip(lower=0)) / LOG_BIN_WIDTH).astype(int))
+    hist = (
+        videos.rename(columns={'pub_date': 'date'})
+              .groupby([*CUBE_KEYS, 'bin']).size().rename('count')
+              .reset_index()
+    )
+    return hist.sort_values([*CUBE_KEYS, 'bin']).reset_index(drop=True)
+
+
+def day_n_median(hist: pd.DataFrame, by) -> pd.Series:
+    """
+    build_day_n_histogram 결과(필터한 일부도 가능) → by 그룹별 D+N 조회수 중앙값 (히스토그램을 더해서 계산)
+    """
+    if hist.empty:
+        return pd.Series(dtype=float)
+    median = _median_from_bins(hist, list(by))
+    if len(by) == 1:
+        median.index = median.index.get_level_values(0)
+    return median
+
+
+def cube_version(path: str) -> str:
+    """
+    큐브 파일의 get_data_version (파일이 없으면 "") → load_* 함수의 data_version 인자로 넘김
+    """
+    return get_data_version(path) if os.path.exists(path) else ""
+
+
+@st.cache_data
+def load_category_cube(path: str = CUBE_PATH, data_version: str = "") -> pd.DataFrame:
+    # data_version: cube_version(path) (큐브를 다시 만들면 캐시도 새로 읽음)
+    cube = pd.read_csv(path, encoding='utf-8', parse_dates=['date'])
+    cube['is_short'] = cube['is_short'].astype(bool)
+    return cube
+
+
+@st.cache_data
+def load_day_n_histogram(path: str = CUBE_HIST_PATH, data_version: str = "") -> pd.DataFrame:
+    hist = pd.read_csv(path, encoding='utf-8', parse_dates=['date'])
+    hist['is_short'] = hist['is_short'].astype(bool)
+    return hist
+
+
+@st.cache_data
+def load_category_subs(path: str = CUBE_SUBS_PATH, data_version: str = "") -> pd.DataFrame:
+    return pd.read_csv(path, encoding='utf-8', parse_dates=['date'])
+
+
+if __name__ == "__main__":
+    import json
+
+    parser = argparse.ArgumentParser(description="카테고리 롤업 큐브 생성")
+    parser.add_argument("source", nargs="?", default="data/processed_data_v2.csv")
+    parser.add_argument("channel_meta", nargs="?", default="data/channel_meta.json")
+    parser.add_argument("out", nargs="?", default=CUBE_PATH)
+    parser.add_argument("hist_out", nargs="?", default=CUBE_HIST_PATH)
+    parser.add_argument("subs_out", nargs="?", default=CUBE_SUBS_PATH)
+    parser.add_argument("--day-n", type=int, default=7)
+    args = parser.parse_args()
+
+    snapshots, _ = load_snapshot_shards(args.source)
+    with open(args.channel_meta, "r", encoding="utf-8-sig") as f:
+        meta = json.load(f)
+    cube = build_category_cube(snapshots, meta, day_n=args.day_n)
+    cube.to_csv(args.out, index=False, encoding="utf-8")
+    hist = build_day_n_histogram(snapshots, meta, day_n=args.day_n)
+    hist.to_csv(args.hist_out, index=False, encoding="utf-8")
+    subs = build_category_subs(snapshots, meta)
+    subs.to_csv(args.subs_out, index=False, encoding="utf-8")
+    print(f"{len(cube):,}행 → {args.out}, D+{args.day_n} 히스토그램 {len(hist):,}행 → {args.hist_out}, "
+          f"구독자 증가 {len(subs):,}행 → {args.subs_out}")
@@ -0,0 +1,101 @@
+# utils/similar.py
+"""
+성과 프로필이 비슷한 채널 찾기
+
+채널마다 아래 값을 이어 붙인 고정 길이 벡터를 만든다.
+  - 롱폼/숏폼 공개 후 1~max_days일 평균 조회수 곡선 (각 곡선의 최댓값으로 나눈 모양)
+  - 곡선 규모: log10(롱폼/숏폼 max_days일차 평균 조회수)
+  - 구독자 성장률: 30일 일평균 증가량 / 구독자 수, 수집 기간 증가량 / 구독자 수
+  - Shorts 비율
+각 열을 채널 전체 기준으로 표준화하고, 블록마다 1/sqrt(열 수) 가중치를 줘서
+곡선(30열)이 스칼라 지표(1열)를 묻어버리지 않게 한다.
+검색은 NumPy로 전체 채널과의 거리를 한 번에 계산하는 정확한 k-NN (채널 수천 개까지 수 ms).
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import load_processed_data
+from utils.metrics import add_day_since_pub, avg_view_curves_by_channel, channel_view_stats, get_subscriber_metrics_batch
+
+
+def build_channel_embeddings(df: pd.DataFrame, max_days: int = 30) -> pd.DataFrame:
+    """
+    스냅샷 DataFrame → 채널별 임베딩 (index=channel_id, 열=특징, 표준화·가중치 적용 완료)
+    """
+    if 'day_since_pub' not in df.columns:
+        df = add_day_since_pub(df)
+    curves = avg_view_curves_by_channel(df, max_days).astype(float)
+    long_curve = curves.xs(False, level='is_short')
+    short_curve = curves.xs(True, level='is_short')
+
+    def shape(curve):
+        peak = curve.max(axis=1)
+        return curve.div(peak.where(peak > 0), axis=0).fillna(0.0)
+
+    subs = get_subscriber_metrics_batch(df, 30).reindex(long_curve.index)
+    end = subs['end'].where(subs['end'] > 0)
+    short_ratio = channel_view_stats(df)['short_ratio'].reindex(long_curve.index)
+
+    blocks = {
+        "long_shape":  shape(long_curve).add_prefix("L"),
+        "short_shape": shape(short_curve).add_prefix("S"),
+        "scale": pd.DataFrame({
+            "long_scale":  np.log10(long_curve[max_days] + 1),
+            "short_scale": np.log10(short_curve[max_days] + 1),
+        }),
+        "growth": pd.DataFrame({
+            "daily_growth": (subs['daily_avg'] / end).fillna(0.0),
+            "total_growth": (subs['growth'] / end).fillna(0.0),
+        }),
+        "short_ratio": short_ratio.fillna(0.0).to_frame("short_ratio"),
+    }
+
+    weighted = []
+    for block in blocks.values():
+        std = block.std(ddof=0).replace(0, 1.0)
+        weighted.append((block - block.mean()) / std / np.sqrt(block.shape[1]))
+    return pd.concat(weighted, axis=1).fillna(0.0)
+
+
+def build_similar_index(embeddings: pd.DataFrame) -> dict:
+    """
+    임베딩 → k-NN 인덱스 {"ids": channel_id 배열, "position": id → 행 번호, "vectors": float 행렬, "sq_norms": 행별 제곱 노름}
+    """
+    vectors = np.ascontiguousarray(embeddings.to_numpy(dtype=np.float64))
+    return {
+        "ids": embeddings.index.to_numpy(),
+        "position": {cid: i for i, cid in enumerate(embeddings.index)},
+        "vectors": vectors,
+        "sq_norms": np.einsum('ij,ij->i', vectors, vectors),
+    }
+
+
+def nearest_channels(index: dict, channel_id: str, k: int = 5) -> pd.DataFrame:
+    """
+    channel_id와 가장 가까운 채널 k개 (자기 자신 제외) → DataFrame ['channel_id', 'distance']
+    - 인덱스에 없는 채널이면 빈 DataFrame
+    """
+    pos = index["position"].get(channel_id)
+    if pos is None or len(index["ids"]) < 2:
+        return pd.DataFrame(columns=['channel_id', 'distance'])
+
+    # |a-b|² = |a|² + |b|² - 2a·b  (행렬-벡터 곱 한 번)
+    query = index["vectors"][pos]
+    dist = index["sq_norms"] + index["sq_norms"][pos] - 2.0 * (index["vectors"] @ query)
+    dist[pos] = np.inf
+
+    k = min(k, len(dist) - 1)
+    top = np.argpartition(dist, k - 1)[:k]
+    top = top[np.argsort(dist[top], kind='stable')]
+    return pd.DataFrame({
+        'channel_id': index["ids"][top],
+        'distance': np.sqrt(np.maximum(dist[top], 0.0)),
+    })
+
+
+@st.cache_resource(max_entries=2)
+def load_similar_index(path: str = "data/processed_data_v2.csv", data_version: str = "") -> dict:
+    """
+    전체 채널 k-NN 인덱스 (data_version이 바뀔 때만 다시 생성, 읽기 전용이라 세션 간 공유)
+    """
+    return build_similar_index(build_channel_embeddings(load_processed_data(path, data_version)))
@@ -0,0 +1,135 @@
+# utils/surge.py
+"""
+채널별 구독자 급상승 감지기
+
+채널마다 아래 값만 들고 있다가 새 스냅샷이 들어올 때 O(1)로 갱신한다.
+  - gain  : 직전 스냅샷 대비 하루 환산 구독자 증가량
+  - ewma  : gain의 지수이동평균 (평소 증가 속도)
+  - var   : gain의 지수이동분산
+  - score : 이번 gain이 평소(ewma, var)에서 몇 표준편차 벗어났는지 (변화점 점수)
+
+replay_surge_state는 같은 계산을 전체 이력에 대해 pandas ewm으로 한 번에 수행한다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import load_processed_data, slice_as_of
+
+DEFAULT_ALPHA = 0.3
+
+
+def update_surge_state(
+    state: dict,
+    channel_id: str,
+    timestamp,
+    subscriber_count: int,
+    alpha: float = DEFAULT_ALPHA
+) -> dict:
+    """
+    스냅샷 하나로 채널 상태를 O(1) 갱신 (state는 channel_id → dict, 제자리 수정)
+    - 같은 시각이거나 더 과거의 스냅샷은 무시
+    """
+    timestamp = pd.Timestamp(timestamp)
+    ch = state.get(channel_id)
+    if ch is None:
+        state[channel_id] = {
+            "last_ts": timestamp, "last_subs": subscriber_count,
+            "gain": 0.0, "ewma": 0.0, "var": 0.0, "score": 0.0, "n": 0,
+        }
+        return state[channel_id]
+    if timestamp <= ch["last_ts"]:
+        return ch
+
+    dt_days = (timestamp - ch["last_ts"]).total_seconds() / 86400
+    gain = (subscriber_count - ch["last_subs"]) / dt_days
+
+    if ch["n"] == 0:
+        ch["ewma"], ch["var"], ch["score"] = gain, 0.0, 0.0
+    else:
+        diff = gain - ch["ewma"]
+        ch["score"] = diff / np.sqrt(ch["var"]) if ch["var"] > 0 else 0.0
+        ch["ewma"] += alpha * diff
+        ch["var"] = (1 - alpha) * (ch["var"] + alpha * diff * diff)
+
+    ch["gain"] = gain
+    ch["last_ts"], ch["last_subs"] = timestamp, subscriber_count
+    ch["n"] += 1
+    return ch
+
+
+def update_surge_state_batch(state: dict, snapshots: pd.DataFrame, alpha: float = DEFAULT_ALPHA) -> dict:
+    """
+    새로 들어온 스냅샷 묶음으로 상태 갱신 (채널·시각당 한 번만, 시간순)
+    """
+    subs = (
+        snapshots[['channel_id', 'timestamp', 'subscriber_count']]
+        .drop_duplicates(subset=['channel_id', 'timestamp'], keep='last')
+        .sort_values('timestamp', kind='stable')
+    )
+    for cid, ts, count in subs.itertuples(index=False):
+        update_surge_state(state, cid, ts, count, alpha)
+    return state
+
+
+def replay_surge_state(df: pd.DataFrame, alpha: float = DEFAULT_ALPHA) -> dict:
+    """
+    전체 이력으로 상태를 한 번에 재구성 (update_surge_state를 순서대로 적용한 것과 같은 결과)
+    """
+    subs = (
+        df[['channel_id', 'timestamp', 'subscriber_count']]
+        .drop_duplicates(subset=['channel_id', 'timestamp'], keep='last')
+        .sort_values(['channel_id', 'timestamp'], kind='stable')
+        .reset_index(drop=True)
+    )
+    if subs.empty:
+        return {}
+
+    g = subs.groupby('channel_id', sort=False)
+    dt_days = g['timestamp'].diff().dt.total_seconds() / 86400
+    subs['gain'] = g['subscriber_count'].diff() / dt_days
+
+    # 채널별 첫 스냅샷(gain 없음)은 빼고 ewm 계산
+    gains = subs.dropna(subset=['gain'])
+    ew = gains.groupby('channel_id', sort=False)['gain'].ewm(alpha=alpha, adjust=False)
+    ewma = ew.mean().reset_index(level=0, drop=True).reindex(gains.index)
+    var = ew.var(bias=True).reset_index(level=0, drop=True).reindex(gains.index).fillna(0.0)
+
+    # 변화점 점수: 이번 gain과 "직전까지의" ewma/var 비교
+    prev_ewma = ewma.groupby(gains['channel_id']).shift()
+    prev_std = np.sqrt(var.groupby(gains['channel_id']).shift())
+    score = ((gains['gain'] - prev_ewma) / prev_std.where(prev_std > 0)).fillna(0.0)
+
+    last = subs.groupby('channel_id', sort=False).agg(
+        last_ts=('timestamp', 'last'), last_subs=('subscriber_count', 'last'), n=('gain', 'count')
+    )
+    tail = pd.DataFrame({
+        'channel_id': gains['channel_id'], 'gain': gains['gain'],
+        'ewma': ewma, 'var': var, 'score': score,
+    }).groupby('channel_id', sort=False).last()
+
+    state = last.join(tail).fillna({'gain': 0.0, 'ewma': 0.0, 'var': 0.0, 'score': 0.0})
+    return state.to_dict('index')
+
+
+def rank_surging_channels(state: dict, top_n: int = None) -> pd.DataFrame:
+    """
+    "지금 급상승" 순위: 구독자가 늘고 있는 채널 중 변화점 점수가 높은 순
+    """
+    ranked = pd.DataFrame.from_dict(state, orient='index')
+    if ranked.empty:
+        return ranked
+    ranked = ranked[ranked['gain'] > 0].sort_values('score', ascending=False)
+    return ranked.head(top_n) if top_n else ranked
+
+
+@st.cache_data
+def load_surge_state(
+    path="data/processed_data_v2.csv",
+    as_of=None,
+    alpha: float = DEFAULT_ALPHA,
+    data_version: str = ""
+) -> dict:
+    """
+    스냅샷 로그 전체를 replay한 급상승 상태 (as_of가 있으면 그 시점까지, data_version별로 다시 계산)
+    """
+    return replay_surge_state(slice_as_of(load_processed_data(path, data_version), as_of), alpha)
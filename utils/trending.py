@@ -0,0 +1,282 @@
+# utils/trending.py
+"""
+지금 뜨는 영상 (조회수 속도 인덱스)
+
+영상마다 아래 값만 들고 있다가 새 스냅샷이 들어올 때 O(1)로 갱신한다.
+  - velocity : 직전 스냅샷 대비 시간당 조회수 증가량 (views/hour)
+  - accel    : velocity의 직전 대비 변화량 (views/hour²)
+  - score    : velocity ÷ 채널 기대 곡선의 같은 경과일 시간당 기울기 (1이면 채널 평소 속도)
+
+카테고리마다 score 상위 K개만 유지하는 top 목록을 두어 패널은 O(K)로 읽는다.
+배치 갱신 때는 "이번 배치에 들어온 영상 + 기존 top K"만 다시 줄 세운다.
+수집기가 한 번 돌 때 추적 중인 모든 영상의 스냅샷을 남기므로, 수집 1회분 배치 단위로 넣으면
+전체를 다시 정렬한 것과 같은 top K가 된다.
+
+replay_trending_state는 같은 계산을 전체 이력에 대해 pandas로 한 번에 수행한다.
+
+페이지(load_trending_top)는 최신 기준 상태를 프로세스 안에서 세션 간 공유해 rerun 사이에 유지한다.
+처음에는 replay로 만들고, 이후 데이터 버전이 바뀌면 마지막 반영 시각 이후 스냅샷만 update_trending_batch로 넣는다.
+기대 기울기는 replay 때 고정되므로 SLOPE_REFRESH가 지나면, 또 이미 반영한 구간의 행이 바뀌면
+(백필·압축) 다시 replay한다. as_of 조회는 그 시점까지를 replay한 결과를 캐시한다.
+"""
+import heapq
+import threading
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import load_processed_data, slice_as_of
+from utils.metrics import add_day_since_pub, avg_view_curves_by_channel
+
+DEFAULT_TOP_K = 20
+# 증분 갱신 중 고정해 두는 기대 기울기를 다시 계산하는 주기 (데이터 시각 기준)
+SLOPE_REFRESH = pd.Timedelta(days=1)
+# 기대 기울기 하한 (views/hour): 곡선이 평평해진 오래된 영상/작은 채널에서 점수가 폭주하지 않도록
+MIN_EXPECTED_SLOPE = 1.0
+
+
+def expected_hourly_slope(curves: pd.DataFrame) -> pd.DataFrame:
+    """
+    avg_view_curves_by_channel 결과 → 일차별 기대 시간당 조회수 증가량 (같은 모양, 하한 적용)
+    - d일차 기울기 = (d일차 평균 - (d-1)일차 평균) / 24, 0일차는 0
+    """
+    values = curves.to_numpy(dtype=float)
+    slope = np.diff(values, axis=1, prepend=0.0) / 24
+    return pd.DataFrame(np.maximum(slope, MIN_EXPECTED_SLOPE), index=curves.index, columns=curves.columns)
+
+
+def _slope_lookup(slopes: pd.DataFrame, channel_ids, is_short, days) -> np.ndarray:
+    # (채널, 유형, 경과일) → 기대 기울기 (max_days 이후는 마지막 날 기울기, 곡선이 없는 채널은 하한)
+    rows = slopes.index.get_indexer(pd.MultiIndex.from_arrays([channel_ids, is_short]))
+    cols = np.clip(np.asarray(days, dtype=float), 1, slopes.shape[1]).astype(int) - 1
+    table = slopes.to_numpy()
+    return np.where(rows >= 0, table[np.maximum(rows, 0), cols], MIN_EXPECTED_SLOPE)
+
+
+def new_trending_state(slopes: pd.DataFrame, category_map, k: int = DEFAULT_TOP_K) -> dict:
+    """
+    빈 인덱스 상태
+    - slopes       : expected_hourly_slope 결과 (배치 갱신 중에는 고정)
+    - category_map : channel_id → 카테고리 (dict 또는 MetaStore.category를 쓰는 Mapping)
+    """
+    # 스냅샷 하나씩 갱신할 때는 (채널, 유형) → 일차별 기울기 배열을 dict로 바로 찾음
+    slope_rows = {key: row for key, row in zip(slopes.index, slopes.to_numpy())}
+    return {"videos": {}, "top": {}, "k": k, "slope_rows": slope_rows, "category_map": category_map}
+
+
+def _category_of(state: dict, channel_id: str) -> str:
+    category_map = state["category_map"]
+    if hasattr(category_map, "category"):
+        return category_map.category(channel_id)
+    return category_map.get(channel_id, "")
+
+
+def update_trending_state(
+    state: dict,
+    video_id: str,
+    channel_id: str,
+    is_short: bool,
+    timestamp,
+    view_count: int,
+    day_since_pub: int
+) -> dict:
+    """
+    스냅샷 하나로 영상 상태를 O(1) 갱신 (제자리 수정, top 목록은 update_trending_batch가 갱신)
+    - 같은 시각이거나 더 과거의 스냅샷은 무시
+    """
+    timestamp = pd.Timestamp(timestamp)
+    v = state["videos"].get(video_id)
+    if v is None:
+        state["videos"][video_id] = {
+            "channel_id": channel_id, "is_short": bool(is_short),
+            "category": _category_of(state, channel_id),
+            "last_ts": timestamp, "last_views": view_count,
+            "velocity": 0.0, "accel": 0.0, "score": 0.0, "n": 0,
+        }
+        return state["videos"][video_id]
+    if timestamp <= v["last_ts"]:
+        return v
+
+    hours = (timestamp - v["last_ts"]).total_seconds() / 3600
+    velocity = (view_count - v["last_views"]) / hours
+    v["accel"] = (velocity - v["velocity"]) / hours if v["n"] > 0 else 0.0
+    v["velocity"] = velocity
+    slope_row = state["slope_rows"].get((channel_id, bool(is_short)))
+    if slope_row is None:
+        expected = MIN_EXPECTED_SLOPE
+    else:
+        expected = slope_row[int(min(max(day_since_pub, 1), len(slope_row))) - 1]
+    v["score"] = velocity / expected
+    v["last_ts"], v["last_views"] = timestamp, view_count
+    v["n"] += 1
+    return v
+
+
+def _refresh_top(state: dict, candidates) -> None:
+    # 카테고리별로 (기존 top K ∪ 후보) 중 score 상위 K개만 남김 (크기 K 최소 힙)
+    by_category = {}
+    for vid in candidates:
+        by_category.setdefault(state["videos"][vid]["category"], set()).add(vid)
+    for category, vids in by_category.items():
+        vids |= {vid for _, vid in state["top"].get(category, [])}
+        heap = []
+        for vid in vids:
+            v = state["videos"][vid]
+            if v["n"] == 0:
+                continue
+            item = (v["score"], vid)
+            if len(heap) < state["k"]:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        state["top"][category] = sorted(heap, reverse=True)
+
+
+def update_trending_batch(state: dict, snapshots: pd.DataFrame) -> dict:
+    """
+    새로 들어온 스냅샷 묶음으로 상태와 카테고리별 top K 갱신 (영상·시각당 한 번만, 시간순)
+    """
+    if 'day_since_pub' not in snapshots.columns:
+        snapshots = add_day_since_pub(snapshots)
+    rows = (
+        snapshots[['video_id', 'channel_id', 'is_short', 'timestamp', 'view_count', 'day_since_pub']]
+        .drop_duplicates(subset=['video_id', 'timestamp'], keep='last')
+        .sort_values('timestamp', kind='stable')
+    )
+    for vid, cid, is_short, ts, views, day in rows.itertuples(index=False):
+        update_trending_state(state, vid, cid, is_short, ts, views, day)
+    _refresh_top(state, rows['video_id'].unique())
+    return state
+
+
+def replay_trending_state(
+    df: pd.DataFrame,
+    slopes: pd.DataFrame,
+    category_map,
+    k: int = DEFAULT_TOP_K
+) -> dict:
+    """
+    전체 이력으로 상태를 한 번에 재구성 (update_trending_batch를 순서대로 적용한 것과 같은 결과)
+    """
+    state = new_trending_state(slopes, category_map, k)
+    if 'day_since_pub' not in df.columns:
+        df = add_day_since_pub(df)
+    snaps = (
+        df[['video_id', 'channel_id', 'is_short', 'timestamp', 'view_count', 'day_since_pub']]
+        .drop_duplicates(subset=['video_id', 'timestamp'], keep='last')
+        .sort_values(['video_id', 'timestamp'], kind='stable')
+        .reset_index(drop=True)
+    )
+    if snaps.empty:
+        return state
+
+    g = snaps.groupby('video_id', sort=False)
+    hours = g['timestamp'].diff().dt.total_seconds() / 3600
+    snaps['velocity'] = (g['view_count'].diff() / hours)
+    # 가속도는 속도가 두 번 이상 계산된 뒤부터 (첫 속도의 가속도는 0)
+    prev_velocity = snaps.groupby('video_id', sort=False)['velocity'].shift()
+    snaps['accel'] = ((snaps['velocity'] - prev_velocity) / hours).where(prev_velocity.notna(), 0.0)
+
+    last = g.tail(1).set_index('video_id')
+    n = g.size() - 1
+    velocity = last['velocity'].fillna(0.0)
+    expected = _slope_lookup(slopes, last['channel_id'].to_numpy(), last['is_short'].astype(bool).to_numpy(),
+                             last['day_since_pub'].to_numpy())
+    score = (velocity / expected).where(n > 0, 0.0)
+
+    for vid, row, nn, vel, sc in zip(last.index, last.itertuples(), n, velocity, score):
+        state["videos"][vid] = {
+            "channel_id": row.channel_id, "is_short": bool(row.is_short),
+            "category": _category_of(state, row.channel_id),
+            "last_ts": row.timestamp, "last_views": row.view_count,
+            "velocity": vel, "accel": row.accel if nn > 0 else 0.0, "score": sc, "n": int(nn),
+        }
+    _refresh_top(state, state["videos"].keys())
+    return state
+
+
+def top_trending_videos(state: dict, categories=None, top_n: int = None) -> pd.DataFrame:
+    """
+    카테고리별 top K를 합쳐 score 순으로 → DataFrame (index=video_id)
+    ['channel_id', 'category', 'is_short', 'velocity', 'accel', 'score', 'last_views', 'last_ts']
+    - categories가 None이면 전체 카테고리, top_n이 None이면 K개
+    """
+    top = state["top"]
+    lists = [top[c] for c in (top.keys() if categories is None else categories) if c in top]
+    merged = heapq.nlargest(top_n or state["k"], (item for items in lists for item in items))
+    columns = ['channel_id', 'category', 'is_short', 'velocity', 'accel', 'score', 'last_views', 'last_ts']
+    if not merged:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame.from_dict(
+        {vid: state["videos"][vid] for _, vid in merged}, orient='index'
+    )[columns]
+
+
+def _replay_from(df: pd.DataFrame, category_map, k: int) -> dict:
+    df = add_day_since_pub(df)
+    slopes = expected_hourly_slope(avg_view_curves_by_channel(df))
+    return replay_trending_state(df, slopes, category_map, k)
+
+
+def _tops(state: dict) -> dict:
+    return {category: top_trending_videos(state, [category]) for category in state["top"]}
+
+
+@st.cache_data(max_entries=8)
+def _replay_trending_top(path: str, data_version: str, as_of, k: int, _category_map=None) -> dict:
+    # as_of 시점까지 replay한 카테고리별 top K (영상별 전체 상태는 버리고 작게 캐시)
+    return _tops(_replay_from(slice_as_of(load_processed_data(path, data_version), as_of), _category_map or {}, k))
+
+
+@st.cache_resource
+def _trending_holder(path: str, k: int) -> dict:
+    # 세션 간 공유하는 최신 기준 상태 하나 + 갱신용 잠금
+    return {"state": None, "lock": threading.Lock(), "rows": 0, "now": None, "slopes_at": None}
+
+
+def load_trending_top(
+    path: str = "data/processed_data_v2.csv",
+    data_version: str = "",
+    as_of=None,
+    k: int = DEFAULT_TOP_K,
+    _category_map=None
+) -> dict:
+    """
+    카테고리별 top K → {카테고리: DataFrame(top_trending_videos 형식)}
+    - as_of가 없으면 공유 상태에 마지막 반영 이후 스냅샷만 update_trending_batch로 넣음
+    - as_of가 있으면 그 시점까지 replay (데이터 버전·as_of별 캐시)
+    - _category_map(채널 → 카테고리)은 캐시 키에서 제외 (메타는 data_version과 함께 바뀐다고 가정)
+    """
+    if as_of is not None:
+        return _replay_trending_top(path, data_version, as_of, k, _category_map=_category_map)
+
+    holder = _trending_holder(path, k)
+    df = load_processed_data(path, data_version)
+    with holder["lock"]:
+        now = df['timestamp'].iloc[-1] if len(df) else None
+        # df는 timestamp 오름차순 → 마지막 반영 시각 이후 행만 이진 탐색으로 잘라냄
+        start = df['timestamp'].searchsorted(holder["now"], side='right') if holder["now"] is not None else 0
+        rebuild = (
+            holder["state"] is None
+            or start != holder["rows"]  # 이미 반영한 구간의 행 수가 바뀜 (백필·압축)
+            or (now is not None and (holder["slopes_at"] is None or now - holder["slopes_at"] > SLOPE_REFRESH))
+        )
+        if rebuild:
+            holder["state"] = _replay_from(df, _category_map or {}, k)
+            holder["slopes_at"] = now
+        elif start < len(df):
+            update_trending_batch(holder["state"], df.iloc[start:])
+        holder["rows"], holder["now"] = len(df), now
+        # 잠금 안에서 top만 새 DataFrame으로 떠서 반환 (공유 상태는 밖으로 내보내지 않음)
+        return _tops(holder["state"])
+
+
+def merge_trending_tops(tops: dict, categories=None, top_n: int = 5) -> pd.DataFrame:
+    """
+    load_trending_top 결과에서 categories(None이면 전체)의 top을 합쳐 score 상위 top_n개
+    - 카테고리당 K행뿐이라 O(카테고리 수 × K)
+    """
+    frames = [tops[c] for c in (tops.keys() if categories is None else categories) if c in tops]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames).sort_values('score', ascending=False).head(top_n)
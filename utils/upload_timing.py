@@ -0,0 +1,238 @@
+# utils/upload_timing.py
+"""
+업로드 타이밍 큐브 (수집/적재 시점에 미리 계산)
+
+차원: (scope, key, is_short, weekday, hour, day, bin)
+  - scope / key : "channel" / channel_id 또는 "category" / 카테고리명
+  - weekday     : 공개 요일 (0=월 … 6=일, parse_published_at의 Asia/Seoul 기준)
+  - hour        : 공개 시각 (0~23시)
+  - day         : 공개 후 경과일 (1~max_days)
+  - bin         : 그날 조회수의 로그 구간 번호 floor(log10(1 + 조회수) / LOG_BIN_WIDTH)
+측정값: count(영상 수), view_sum(조회수 합)
+
+영상의 N일차 조회수는 avg_view_curves_by_channel과 같은 (영상, 경과일)별 스냅샷 평균이고,
+그 경과일이 다 지난 칸(공개 시각 + N일 <= closed_until)만 넣는다. 한 번 넣은 값은 바뀌지 않으므로
+count·view_sum·구간별 개수는 더하기만 하면 합쳐진다 → 증분 갱신도, 여러 카테고리 합치기도 groupby-sum.
+  - 평균   = view_sum / count
+  - 중앙값 = 로그 구간 히스토그램에서 구간 안을 선형 보간 (상대 오차는 구간 폭 절반 이내, 약 6%)
+
+    python -m utils.upload_timing data/processed_data_v2.csv data/channel_meta.json data/upload_timing_cube.csv
+    python -m utils.upload_timing ... --update   # 기존 큐브의 closed_until 이후에 닫힌 칸만 더함
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.data_loader import load_snapshot_shards, get_data_version
+from utils.metrics import add_day_since_pub
+
+TIMING_CUBE_PATH = "data/upload_timing_cube.csv"
+TIMING_KEYS = ['scope', 'key', 'is_short', 'weekday', 'hour', 'day', 'bin']
+WEEKDAY_LABELS = ["월", "화", "수", "목", "금", "토", "일"]
+# log10(1 + 조회수) 구간 폭: 0.05 → 구간 하나가 약 12%
+LOG_BIN_WIDTH = 0.05
+
+
+def compute_timing_cells(
+    df: pd.DataFrame,
+    channel_meta,
+    max_days: int = 30,
+    since=None,
+    until=None
+) -> pd.DataFrame:
+    """
+    스냅샷 → (영상, 경과일) 칸별 조회수 (since < 칸이 닫힌 시각 <= until 인 칸만)
+    ['channel_id', 'category', 'is_short', 'weekday', 'hour', 'day', 'views']
+    - until이 없으면 df의 마지막 시각, since가 없으면 처음부터
+    """
+    columns = ['channel_id', 'category', 'is_short', 'weekday', 'hour', 'day', 'views']
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    until = pd.Timestamp(until) if until is not None else df['timestamp'].max()
+    if since is not None:
+        # since 이후에 닫히는 칸의 스냅샷은 모두 (since - 1일) 이후에 있음
+        df = df[df['timestamp'] > pd.Timestamp(since) - pd.Timedelta(days=1)]
+    if 'day_since_pub' not in df.columns:
+        df = add_day_since_pub(df)
+    df = df[(df['day_since_pub'] >= 1) & (df['day_since_pub'] <= max_days)]
+
+    cells = (
+        df.groupby(['video_id', 'day_since_pub'])
+          .agg(views=('view_count', 'mean'), channel_id=('channel_id', 'first'),
+               is_short=('is_short', 'first'), published=('published_at_dt', 'first'))
+          .reset_index()
+    )
+    closed_at = cells['published'] + pd.to_timedelta(cells['day_since_pub'], unit='D')
+    keep = closed_at <= until
+    if since is not None:
+        keep &= closed_at > pd.Timestamp(since)
+    cells = cells[keep]
+
+    channel_ids = pd.Series(cells['channel_id'].unique())
+    categories = channel_ids.map(
+        channel_meta.category if hasattr(channel_meta, 'category')
+        else lambda cid: channel_meta.get(cid, {}).get('category', '')
+    )
+    return pd.DataFrame({
+        'channel_id': cells['channel_id'],
+        'category': cells['channel_id'].map(dict(zip(channel_ids, categories))).fillna(''),
+        'is_short': cells['is_short'].astype(bool),
+        'weekday': cells['published'].dt.weekday,
+        'hour': cells['published'].dt.hour,
+        'day': cells['day_since_pub'].astype(int),
+        'views': cells['views'].astype(float),
+    }).reset_index(drop=True)
+
+
+def aggregate_timing_cells(cells: pd.DataFrame) -> pd.DataFrame:
+    """
+    칸별 조회수 → 큐브 행 (TIMING_KEYS + ['count', 'view_sum']), 채널 단위와 카테고리 단위를 함께
+    """
+    if cells.empty:
+        return pd.DataFrame(columns=TIMING_KEYS + ['count', 'view_sum'])
+    cells = cells.assign(bin=np.floor(np.log10(1 + cells['views'].clip(lower=0)) / LOG_BIN_WIDTH).astype(int))
+    dims = ['is_short', 'weekday', 'hour', 'day', 'bin']
+    parts = []
+    for scope, column in (("channel", 'channel_id'), ("category", 'category')):
+        part = (
+            cells.groupby([column, *dims])
+                 .agg(count=('views', 'size'), view_sum=('views', 'sum'))
+                 .reset_index()
+                 .rename(columns={column: 'key'})
+        )
+        part.insert(0, 'scope', scope)
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)[TIMING_KEYS + ['count', 'view_sum']]
+
+
+def merge_timing_cubes(*cubes: pd.DataFrame) -> pd.DataFrame:
+    """
+    큐브(또는 aggregate_timing_cells 결과) 여러 개를 합침 (count·view_sum 합)
+    """
+    frames = [c[TIMING_KEYS + ['count', 'view_sum']] for c in cubes if len(c)]
+    if not frames:
+        return pd.DataFrame(columns=TIMING_KEYS + ['count', 'view_sum'])
+    merged = pd.concat(frames, ignore_index=True).groupby(TIMING_KEYS, as_index=False)[['count', 'view_sum']].sum()
+    merged['count'] = merged['count'].astype(int)
+    return merged
+
+
+def build_timing_cube(df: pd.DataFrame, channel_meta, max_days: int = 30) -> pd.DataFrame:
+    """
+    스냅샷 로그 전체 → 업로드 타이밍 큐브 (closed_until = 로그의 마지막 시각)
+    """
+    until = df['timestamp'].max() if len(df) else pd.NaT
+    cube = merge_timing_cubes(aggregate_timing_cells(compute_timing_cells(df, channel_meta, max_days, until=until)))
+    cube['closed_until'] = until
+    return cube
+
+
+def update_timing_cube(cube: pd.DataFrame, df: pd.DataFrame, channel_meta, max_days: int = 30) -> pd.DataFrame:
+    """
+    기존 큐브에 closed_until 이후 닫힌 칸만 더함 (build_timing_cube를 다시 돌린 것과 같은 결과)
+    - df: 새 스냅샷까지 포함한 로그 (closed_until - 1일 이후 행만 씀)
+    """
+    since = cube['closed_until'].iloc[0] if len(cube) else None
+    if since is None or pd.isna(since):
+        return build_timing_cube(df, channel_meta, max_days)
+    until = df['timestamp'].max()
+    if until <= since:
+        return cube
+    new_cells = compute_timing_cells(df, channel_meta, max_days, since=since, until=until)
+    merged = merge_timing_cubes(cube, aggregate_timing_cells(new_cells))
+    merged['closed_until'] = until
+    return merged
+
+
+def _median_from_bins(rows: pd.DataFrame, by) -> pd.Series:
+    # 로그 구간 히스토그램 → 그룹별 중앙값
+    # 가운데 순위(짝수면 두 개)의 값을 각각 그 순위가 든 구간 안에서 선형 보간해 추정한 뒤 평균
+    hist = rows.groupby([*by, 'bin'])['count'].sum().reset_index().sort_values([*by, 'bin'])
+    cum = hist.groupby(by)['count'].cumsum()
+    total = hist.groupby(by)['count'].transform('sum')
+    hist = hist.assign(before=cum - hist['count'], cum=cum, total=total)
+
+    def value_at(rank):
+        hit = hist[hist['cum'] >= rank(hist['total'])].groupby(by).head(1)
+        fraction = (rank(hit['total']) - hit['before'] - 0.5) / hit['count']
+        return pd.Series((10 ** ((hit['bin'] + fraction) * LOG_BIN_WIDTH) - 1).to_numpy(),
+                         index=pd.MultiIndex.from_frame(hit[by]))
+
+    lower = value_at(lambda n: (n + 1) // 2)
+    upper = value_at(lambda n: n // 2 + 1)
+    return (lower + upper) / 2
+
+
+def upload_timing_grid(
+    cube: pd.DataFrame,
+    scope: str,
+    keys,
+    day: int = 7,
+    is_short=None,
+    stat: str = "median"
+):
+    """
+    큐브 → 요일 × 공개 시각 격자 (values, counts), 둘 다 index=0..6(요일), columns=0..23(시)
+    - keys: 채널 id/카테고리명 하나 또는 여러 개 (여러 개면 히스토그램을 합쳐서 계산)
+    - is_short: None이면 롱폼+숏폼 합침
+    - stat: "median" 또는 "mean", 영상이 없는 칸은 NaN (counts는 0)
+    """
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    mask = (cube['scope'] == scope) & cube['key'].isin(keys) & (cube['day'] == day)
+    if is_short is not None:
+        mask &= cube['is_short'] == bool(is_short)
+    rows = cube[mask]
+
+    grid_index = pd.Index(range(7), name='weekday')
+    grid_columns = pd.Index(range(24), name='hour')
+    by = ['weekday', 'hour']
+    counts = rows.groupby(by)['count'].sum()
+    if stat == "mean":
+        values = rows.groupby(by)['view_sum'].sum() / counts
+    else:
+        values = _median_from_bins(rows, by) if len(rows) else counts.astype(float)
+
+    def to_grid(series, fill):
+        grid = series.unstack('hour') if len(series) else pd.DataFrame()
+        return grid.reindex(index=grid_index, columns=grid_columns).fillna(fill)
+
+    return to_grid(values, np.nan), to_grid(counts, 0).astype(int)
+
+
+def read_timing_cube(path: str = TIMING_CUBE_PATH) -> pd.DataFrame:
+    cube = pd.read_csv(path, encoding='utf-8', dtype={'key': str}, parse_dates=['closed_until'])
+    cube['is_short'] = cube['is_short'].astype(bool)
+    return cube
+
+
+@st.cache_data
+def load_timing_cube(path: str = TIMING_CUBE_PATH, data_version: str = "") -> pd.DataFrame:
+    # data_version: get_data_version(path) (--update로 큐브를 고쳐 쓰면 캐시도 새로 읽음)
+    return read_timing_cube(path)
+
+
+def timing_cube_version(path: str = TIMING_CUBE_PATH) -> str:
+    return get_data_version(path) if os.path.exists(path) else ""
+
+
+if __name__ == "__main__":
+    import json
+
+    parser = argparse.ArgumentParser(description="업로드 타이밍 큐브 생성")
+    parser.add_argument("source", nargs="?", default="data/processed_data_v2.csv")
+    parser.add_argument("channel_meta", nargs="?", default="data/channel_meta.json")
+    parser.add_argument("out", nargs="?", default=TIMING_CUBE_PATH)
+    parser.add_argument("--max-days", type=int, default=30)
+    parser.add_argument("--update", action="store_true", help="기존 큐브에 새로 닫힌 칸만 더함")
+    args = parser.parse_args()
+
+    snapshots, _ = load_snapshot_shards(args.source)
+    with open(args.channel_meta, "r", encoding="utf-8-sig") as f:
+        meta = json.load(f)
+    if args.update and os.path.exists(args.out):
+        cube = update_timing_cube(read_timing_cube(args.out), snapshots, meta, max_days=args.max_days)
+    else:
+        cube = build_timing_cube(snapshots, meta, max_days=args.max_days)
+    cube.to_csv(args.out, index=False, encoding="utf-8")
+    print(f"{len(cube):,}행 → {args.out}")